@@ -3,7 +3,7 @@ from components.data import Data
 from components.drive import Drive
 from components.util import Util
 from components.singleton import Singleton
-from components.network import Network
+from components.network import Network, NetworkFixture
 from components.pinboard import Pinboard
 from components.emote import Emote
 from components.channel import Channel
@@ -13,12 +13,14 @@ from components.ranking import Ranking
 from components.ban import Ban
 from components.gacha import Gacha
 from components.logger import Logger
+from components.members import Members
 import cogs
 
 import disnake
 from disnake.ext import commands
 from typing import Callable, Any
 import asyncio
+import io
 import time
 import signal
 import os
@@ -42,11 +44,13 @@ class DiscordBot(commands.InteractionBot):
         "**v12.11.4** - Updated `/gbf guide defense`.",
         "**v12.11.5** - Restored news posting.",
     ]
+    SEND_CONCURRENCY : int = 8 # maximum number of concurrent messages sent by sendMulti()
+    SEND_RETRY : int = 2 # maximum number of retries of a globally rate limited message in sendMulti()
 
     __slots__ = (
         "running", "debug_mode", "test_mode", "booted", "tasks", "reaction_hooks", "cogn",
         # components
-        "ban", "channel", "data", "drive", "emote", "file", "gacha", "logger", "network",
+        "ban", "channel", "data", "drive", "emote", "file", "gacha", "logger", "members", "network",
         "pinboard", "ranking", "singleton", "sql", "util"
     )
 
@@ -97,6 +101,7 @@ class DiscordBot(commands.InteractionBot):
             self.ranking : Ranking = Ranking(self)
             self.ban : Ban = Ban(self)
             self.gacha : Gacha = Gacha(self)
+            self.members : Members = Members(self)
             self.logger.push("[BOOT] Components loaded", send_to_discord=False)
 
             # initialize important components
@@ -168,6 +173,7 @@ class DiscordBot(commands.InteractionBot):
             self.ranking.init()
             self.ban.init()
             self.gacha.init()
+            self.members.init()
             self.logger.push("[BOOT] Remaining components initialized", send_to_discord=False)
         except Exception as ce:
             try:
@@ -275,6 +281,8 @@ class DiscordBot(commands.InteractionBot):
         # exit
         if self.data.pending:
             self.data.saveData()
+        self.net.save_wiki_cache()
+        self.net.save_fixture()
 
     """run_bot()
     Followup from start_bot().
@@ -326,7 +334,10 @@ class DiscordBot(commands.InteractionBot):
                     )
                     time.sleep(2)
                 count += 1
+        self.net.save_wiki_cache()
+        self.net.save_fixture()
         self.logger.push("[EXIT] Exited gracefully", send_to_discord=False)
+        self.logger.stop() # flush the log files
         os._exit(0)
 
     """isProduction()
@@ -467,9 +478,80 @@ class DiscordBot(commands.InteractionBot):
             # to send error messages with this function
             return None
 
+    """deliver()
+    Send a message to a registered channel, for sendMulti().
+    Disnake already retries the rate limited and server error responses.
+    Only the global rate limits, which it raises, are retried up to SEND_RETRY times.
+
+    Parameters
+    ----------
+    channel_name: Channel name identifier
+    limit: Semaphore, bounding the number of concurrent deliveries
+    msg: Text message
+    embed: Discord Embed
+    file: Tuple (Optional), file name and content. A new Discord File is created for each attempt.
+    components : A list of Modal v2 components
+    publish: Boolean. Try to publish the message if set to True
+
+    Returns
+    --------
+    tuple:
+        - disnake.Message: The sent message or None if error
+        - float: Time taken, in seconds (waiting for the semaphore excluded)
+        - str: The error, None if success
+    """
+    async def deliver(
+        self : DiscordBot,
+        channel_name : str|int,
+        limit : asyncio.Semaphore,
+        *,
+        msg : str = None,
+        embed : disnake.Embed = None,
+        file : tuple[str, bytes]|None = None,
+        components : list[disnake.ui.UIComponent]|None = None,
+        publish : bool = False
+    ) -> tuple[disnake.Message|None, float, str|None]:
+        async with limit:
+            start : float = time.perf_counter()
+            attempt : int = 0
+            while True:
+                try:
+                    c : disnake.Channel = self.channel.get(channel_name) # retrieve channel from component
+                    if c is None:
+                        return None, time.perf_counter() - start, "Unknown channel"
+                    message : disnake.Message = await c.send(
+                        msg,
+                        embed=embed,
+                        file=(disnake.File(io.BytesIO(file[1]), filename=file[0]) if file is not None else None),
+                        components=components
+                    )
+                    try:
+                        if publish is True and c.is_news() and self.channel.can_publish(c.id):
+                            # publish if enabled and possible
+                            await message.publish()
+                    except:
+                        pass
+                    return message, time.perf_counter() - start, None
+                except disnake.HTTPException as e:
+                    # retry if globally rate limited
+                    # Note: not on server errors, the message might have been sent and would be duplicated
+                    if e.status == 429 and attempt < self.SEND_RETRY:
+                        attempt += 1
+                        delay : float = float(attempt)
+                        try:
+                            delay = float(e.response.headers.get('Retry-After', delay))
+                        except:
+                            pass
+                        await asyncio.sleep(min(delay, 30))
+                        continue
+                    return None, time.perf_counter() - start, f"HTTP {e.status} {e.text}"[:200]
+                except Exception as e:
+                    return None, time.perf_counter() - start, (str(e) or e.__class__.__name__)[:200]
+
     """sendMulti()
     Send a message to multiple registered channels.
-    It's send() in a loop, to sum it up.
+    The channels are sent to concurrently, up to SEND_CONCURRENCY at once.
+    The same embed and file content are used for every channel.
 
     Parameters
     ----------
@@ -482,7 +564,11 @@ class DiscordBot(commands.InteractionBot):
 
     Returns
     --------
-    list: A list of the successfully sent messages
+    dict: The delivery report, containing:
+        - 'messages': List of the successfully sent messages
+        - 'failed': Dict of the failed channels and their error
+        - 'timings': Dict of the channels and their delivery time, in seconds
+        - 'time': Total time, in seconds
     """
     async def sendMulti(
         self : DiscordBot,
@@ -493,20 +579,56 @@ class DiscordBot(commands.InteractionBot):
         file : disnake.File = None,
         components : list[disnake.ui.UIComponent]|None = None,
         publish : bool = False
-    ) -> list:
-        r : list[disnake.Message] = [] # resulting message
-        err : list[str] = [] # errors
-        ex : Exception = None # latest exception
+    ) -> dict:
+        start : float = time.perf_counter()
+        # read the file once
+        content : tuple[str, bytes]|None = None
+        if file is not None:
+            content = (file.filename, file.fp.read())
+            file.close()
+        limit : asyncio.Semaphore = asyncio.Semaphore(self.SEND_CONCURRENCY)
+        results : list[tuple[disnake.Message|None, float, str|None]] = await asyncio.gather(
+            *[
+                self.deliver(
+                    c,
+                    limit,
+                    msg=msg,
+                    embed=embed,
+                    file=content,
+                    components=components,
+                    publish=publish
+                )
+                for c in channel_names
+            ]
+        )
+        # make the report
+        report : dict = {'messages':[], 'failed':{}, 'timings':{}, 'time':0.0}
         c : str
-        for c in channel_names:
-            try:
-                r.append(await self.send(c, msg=msg, embed=embed, file=file, components=components, publish=publish))
-            except Exception as e:
-                ex = e
-                err.append(c)
-        if ex is not None:
-            self.logger.pushError(f"[SEND] Failed to send messages to following channels: {err}", ex)
-        return r
+        message : disnake.Message|None
+        elapsed : float
+        error : str|None
+        for c, (message, elapsed, error) in zip(channel_names, results):
+            report['timings'][c] = elapsed
+            if error is None:
+                report['messages'].append(message)
+            else:
+                report['failed'][c] = error
+        report['time'] = time.perf_counter() - start
+        self.logger.push(
+            "[SEND] {}/{} message(s) sent in {:.2f}s".format(
+                len(report['messages']),
+                len(channel_names),
+                report['time']
+            ),
+            send_to_discord=False
+        )
+        if len(report['failed']) > 0:
+            self.logger.pushError(
+                "[SEND] Failed to send messages to following channels:\n" + "\n".join(
+                    f"`{k}`: {v}" for k, v in report['failed'].items()
+                )
+            )
+        return report
 
     """changeAvatar()
     Change the bot avatar with a file present in the assets folder
@@ -1026,6 +1148,61 @@ class DiscordBot(commands.InteractionBot):
             if await coroutine(payload):
                 return
 
+    """on_guild_remove()
+    Event.
+    Remove the guild from the membership index.
+
+    Parameters
+    ----------
+    guild: Discord Guild
+    """
+    async def on_guild_remove(self : DiscordBot, guild : disnake.Guild) -> None:
+        self.members.forget(guild.id)
+
+    """on_member_join()
+    Event. Requires the members intent.
+    Update the membership index.
+
+    Parameters
+    ----------
+    member: Discord Member
+    """
+    async def on_member_join(self : DiscordBot, member : disnake.Member) -> None:
+        self.members.on_member_join(member)
+
+    """on_raw_member_remove()
+    Event. Requires the members intent.
+    Update the membership index.
+
+    Parameters
+    ----------
+    payload: Raw payload
+    """
+    async def on_raw_member_remove(self : DiscordBot, payload : disnake.RawGuildMemberRemoveEvent) -> None:
+        self.members.on_member_remove(payload.guild_id, payload.user.id)
+
+    """on_raw_message_delete()
+    Event.
+    Drop the scheduled cleanup of the message, if any.
+
+    Parameters
+    ----------
+    payload: Raw payload
+    """
+    async def on_raw_message_delete(self : DiscordBot, payload : disnake.RawMessageDeleteEvent) -> None:
+        self.channel.on_message_delete((payload.message_id,))
+
+    """on_raw_bulk_message_delete()
+    Event.
+    Drop the scheduled cleanups of the messages, if any.
+
+    Parameters
+    ----------
+    payload: Raw payload
+    """
+    async def on_raw_bulk_message_delete(self : DiscordBot, payload : disnake.RawBulkMessageDeleteEvent) -> None:
+        self.channel.on_message_delete(payload.message_ids)
+
 
 def generate_google_drive_credentials():
     from pydrive2.auth import GoogleAuth
@@ -1093,6 +1270,21 @@ if __name__ == "__main__":
         help="generate credentials.json (for OAuth clients).",
         action='store_const', const=True, default=False, metavar=''
     )
+    parser.add_argument(
+        '-rec', '--record', nargs='?',
+        help="record the network exchanges in a fixture archive, while running (to use with -r).",
+        const="fixture.xz", metavar='PATH'
+    )
+    parser.add_argument(
+        '-rep', '--replay', nargs='?',
+        help="replay the network exchanges from a fixture archive, instead of using the network (to use with -r).",
+        const="fixture.xz", metavar='PATH'
+    )
+    parser.add_argument(
+        '-lat', '--latency', type=float, default=0,
+        help="simulated latency in milliseconds, when replaying a fixture archive.",
+        metavar='MS'
+    )
     args : argparse.Namespace = parser.parse_args()
     # Check flags/variables
     if args.googledrive:
@@ -1104,6 +1296,11 @@ if __name__ == "__main__":
     elif args.generatehelp is not None:
         cogs.generateHelp(DiscordBot.VERSION, args.generatehelp)
     elif args.run:
-        DiscordBot(debug_mode=args.debug).start_bot()
+        bot : DiscordBot = DiscordBot(debug_mode=args.debug)
+        if args.replay is not None:
+            bot.net.set_fixture(NetworkFixture.Mode.REPLAY, args.replay, args.latency / 1000)
+        elif args.record is not None:
+            bot.net.set_fixture(NetworkFixture.Mode.RECORD, args.record)
+        bot.start_bot()
     else:
         parser.print_help()
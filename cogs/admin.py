@@ -7,7 +7,11 @@ if TYPE_CHECKING:
     from ..bot import DiscordBot
     from components.ranking import GWDB
     from components.network import RequestResult
+    from collections import Counter
 from cogs import DEBUG_SERVER_ID
+from components import codec
+from components import schema
+from components import savestats
 from datetime import datetime, timedelta
 import random
 import os
@@ -42,7 +46,8 @@ class Admin(commands.Cog):
             self.bot.runTask('admin:status', self.status)
 
     """status()
-    Bot Task managing the autosave and update of the bot status
+    Bot Task managing the update of the bot status.
+    The autosave is managed by the 'data:journal' task.
     """
     async def status(self : Admin) -> None:
         await self.bot.change_presence(
@@ -60,9 +65,6 @@ class Admin(commands.Cog):
                         activity=disnake.activity.Game(name=random.choice(self.bot.data.config['games']))
                     )
                     await self.bot.net.refresh_account()
-                # autosave every 30 min
-                if self.bot.data.pending and self.bot.running:
-                    await self.bot.data.autosave()
             except asyncio.CancelledError:
                 self.bot.logger.push("[TASK] 'status' Task Cancelled")
                 return
@@ -92,12 +94,15 @@ class Admin(commands.Cog):
                     )
                     time.sleep(2)
                     count += 1
+        self.bot.net.save_wiki_cache()
+        self.bot.net.save_fixture()
         # disable the bot
         self.bot.running = False
         try:
             self.bot.loop.close()
         except:
             pass
+        self.bot.logger.stop() # flush the log files
         # and quit (with code 0. Will cause a reboot when used with Watchtower or similar setups)
         os._exit(0)
 
@@ -660,7 +665,7 @@ class Admin(commands.Cog):
         """Command to reload the bot save data (Owner Only)"""
         await inter.response.defer(ephemeral=True)
         if drive != 0: # download the save file from the drive.
-            if self.bot.drive.load() is False:
+            if await asyncio.to_thread(self.bot.drive.load) is False:
                 await inter.edit_original_message(
                     embed=self.bot.embed(
                         title="Failed to retrieve save.json on the Google Drive",
@@ -699,6 +704,126 @@ class Admin(commands.Cog):
             )
         )
 
+    @data.sub_command()
+    async def benchmark(self : commands.SubCommand, inter : disnake.GuildCommandInteraction) -> None:
+        """Compare the save compression codecs on the current save data (Owner Only)"""
+        await inter.response.defer(ephemeral=True)
+        data : str = self.bot.data.serializeData()
+        # run in a thread to not block the bot
+        results : list[tuple[str, int, float, float, float]] = await asyncio.to_thread(codec.benchmark, data)
+        current : str = self.bot.data.config.get('save_codec', codec.DEFAULT)
+        await inter.edit_original_message(
+            embed=self.bot.embed(
+                title="Save Codec Benchmark",
+                description="\n".join(
+                    "**{}**{} ▫️ {} ▫️ x{:.3f} ▫️ {:.3f}s / {:.3f}s".format(
+                        name,
+                        " (current)" if name == current else "",
+                        self.bot.util.valToStr(size),
+                        ratio,
+                        ct,
+                        dt
+                    )
+                    for name, size, ratio, ct, dt in results
+                ),
+                footer="Size ▫️ Ratio ▫️ Compression / Decompression times",
+                color=self.COLOR
+            )
+        )
+
+    @data.sub_command()
+    async def decoder(self : commands.SubCommand, inter : disnake.GuildCommandInteraction) -> None:
+        """Compare the save decoder with the legacy datetime hook on the current save data (Owner Only)"""
+        await inter.response.defer(ephemeral=True)
+        data : str = self.bot.data.serializeData()
+        # run in a thread to not block the bot
+        legacy : float
+        typed : float
+        mismatches : list[str]
+        legacy, typed, mismatches = await asyncio.to_thread(
+            schema.benchmark,
+            data,
+            self.bot.data.SAVE_SCHEMA,
+            self.bot.util.json_deserial_dict
+        )
+        await inter.edit_original_message(
+            embed=self.bot.embed(
+                title="Save Decoder Benchmark",
+                description=(
+                    "**Legacy hook** ▫️ {:.3f}s\n**Schema** ▫️ {:.3f}s (x{:.1f})\n"
+                    "**Mismatches** ▫️ {}\n{}".format(
+                        legacy,
+                        typed,
+                        legacy / max(typed, 0.000001),
+                        len(mismatches),
+                        "\n".join(f"`{m}`" for m in mismatches[:10])
+                    )
+                ),
+                footer="Size: " + self.bot.util.valToStr(len(data)),
+                color=self.COLOR
+            )
+        )
+
+    @data.sub_command()
+    async def analytics(
+        self : commands.SubCommand,
+        inter : disnake.GuildCommandInteraction,
+        depth : int = commands.Param(description="Maximum depth of the measured paths", ge=1, le=5, default=3)
+    ) -> None:
+        """Show the size, compression ratio and change count of the save sections (Owner Only)"""
+        await inter.response.defer(ephemeral=True)
+        data : str = self.bot.data.serializeData()
+        c : codec.Codec = codec.CODECS.get(
+            self.bot.data.config.get('save_codec', codec.DEFAULT),
+            codec.CODECS[codec.DEFAULT]
+        )
+        # run in a thread to not block the bot
+        total : int
+        sections : list[tuple[str, int, int]]
+        entries : list[tuple[str, int]]
+        total, sections, entries = await asyncio.to_thread(savestats.analyze, data, c, depth, 10)
+        changes : Counter = self.bot.data.change_count
+        await inter.edit_original_message(
+            embed=self.bot.embed(
+                title="Save Data Analytics",
+                description="**Total** ▫️ {} ▫️ {} section(s)".format(
+                    self.bot.util.valToStr(total),
+                    len(sections)
+                ),
+                fields=[
+                    {
+                        'name':"Sections",
+                        'value':"\n".join(
+                            "`{}` ▫️ {} ▫️ x{:.2f} ▫️ {} change(s)".format(
+                                name,
+                                self.bot.util.valToStr(size),
+                                csize / max(1, size),
+                                changes.get(name, 0)
+                            )
+                            for name, size, csize in sections[:10]
+                        )
+                    },
+                    {
+                        'name':"Largest entries",
+                        'value':"\n".join(
+                            f"`{path[:40]}` ▫️ {self.bot.util.valToStr(size)}"
+                            for path, size in entries
+                        ) or "None"
+                    },
+                    {
+                        'name':"Most changed keys",
+                        'value':"\n".join(
+                            f"`{path[:40]}` ▫️ {count}"
+                            for path, count in [(k, v) for k, v in changes.most_common() if "/" in k][:10]
+                        ) or "None"
+                    }
+                ],
+                footer=f"Size ▫️ {c.NAME} ratio ▫️ Changes since the boot",
+                color=self.COLOR,
+                inline=False
+            )
+        )
+
     """drive_delete_callback()
     CustomModal callback
     """
@@ -722,7 +847,7 @@ class Admin(commands.Cog):
                 )
             )
         try:
-            result = self.bot.drive.delFile(name, self.bot.data.config['tokens'][folder])
+            result = await asyncio.to_thread(self.bot.drive.delFile, name, self.bot.data.config['tokens'][folder])
             match result:
                 case True:
                     await inter.edit_original_message(
@@ -832,7 +957,7 @@ class Admin(commands.Cog):
         else:
             try:
                 del self.bot.data.save['gbfids'][user_id] # unlink the accounts
-                self.bot.data.pending = True
+                self.bot.data.touch('gbfids', user_id)
             except:
                 pass
             await inter.edit_original_message(
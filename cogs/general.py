@@ -364,6 +364,29 @@ class General(commands.Cog):
                     100 * (1 - math.pow(1 - ssrrate * 0.01, count))
                 )
             )
+            # exact outcomes
+            odds : dict|None = self.bot.gacha.allOdds(banner, count)
+            if odds is not None:
+                msgs.append(
+                    "Expected: **{:.1f}** SSR ▫️ **{:.1f}** SR ▫️ **{:.1f}** rate up SSR\n".format(
+                        *odds['expected']
+                    )
+                )
+                k : int
+                chances : list[str] = [
+                    "{} SSR: {:.3f}%".format(k, 100 * odds['ssr'][k])
+                    for k in (2, 3, 5, 10)
+                    if odds['ssr'][k] >= 0.00001
+                ]
+                if len(chances) > 0:
+                    msgs.append("At least " + " ▫️ ".join(chances) + "\n")
+                if len(odds['distinct']) > 2: # several rate up SSRs
+                    msgs.append(
+                        "Different rate up SSRs: " + " ▫️ ".join(
+                            "{}: {:.3f}%".format(k, 100 * odds['distinct'][k])
+                            for k in range(1, len(odds['distinct']))
+                        ) + "\n"
+                    )
             await inter.edit_original_message(
                 embed=self.bot.embed(
                     title="Roll Chance Calculator",
@@ -1156,7 +1156,7 @@ class GranblueFantasy(commands.Cog):
             return
         try:
             del self.bot.data.save['gbfids'][str(inter.author.id)]
-            self.bot.data.pending = True
+            self.bot.data.touch('gbfids', str(inter.author.id))
         except:
             pass
         await inter.edit_original_message(
@@ -1253,7 +1253,7 @@ class GranblueFantasy(commands.Cog):
                         return
             # register linked GBF profile
             self.bot.data.save['gbfids'][str(inter.author.id)] = profile_id
-            self.bot.data.pending = True
+            self.bot.data.touch('gbfids', str(inter.author.id))
             await inter.edit_original_message(
                 embed=self.bot.embed(
                     title="Success",
@@ -1811,7 +1811,8 @@ class GranblueFantasy(commands.Cog):
                     "where":'series LIKE "%grand%"',
                     "format":"json",
                     "limit":"200"
-                }
+                },
+                cache="grand"
             )
             if data is None:
                 return {}
@@ -1894,7 +1895,8 @@ class GranblueFantasy(commands.Cog):
                 await asyncio.sleep(0.2)
                 # make a wiki API request for the page
                 content = await self.bot.net.requestWiki(
-                    f"api.php?action=query&prop=revisions&titles={page}&rvslots=*&rvprop=content&format=json"
+                    f"api.php?action=query&prop=revisions&titles={page}&rvslots=*&rvprop=content&format=json",
+                    cache="interval"
                 )
                 if content is None: # return if error
                     continue
@@ -2,7 +2,9 @@ from __future__ import annotations
 import disnake
 from disnake.ext import commands
 import asyncio
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import time
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ..bot import DiscordBot
@@ -19,6 +21,8 @@ if TYPE_CHECKING:
     type PlayerList = list[PlayerData]
     type CrewParameter = datetime|bool|str|int|float|PlayerList|None
     type CrewData = dict[str, CrewParameter]
+    # time of the request (time.monotonic()), crew data, True if it includes the member list
+    type CrewCacheEntry = list[float|CrewData|bool]
     type GBFGData = dict[str, list[str|int|list[str|int]]]
     type PlayerEntry = tuple[str, str, int|None, str, int|None]
     type PlayerRanking = list[PlayerEntry]
@@ -98,13 +102,22 @@ class GuildWar(commands.Cog):
     # for example, if 100k becomes 120k:
     # TIER_CONVERSION = {"120000":"100000"}
     TIER_CONVERSION : dict[str, str] = {}
+    # Crew cache
+    CREW_CACHE_SIZE : int = 200 # maximum number of cached crews
+    CREW_CACHE_TTL : int = 600 # time, in seconds, a crew data is up to date
+    CREW_CACHE_STALE : int = 3600 # time, in seconds, an outdated crew data can be used while it's refreshed
 
-    __slots__ = ("bot", "day_list", "crewcache")
+    __slots__ = ("bot", "day_list", "crewcache", "crewcache_stats", "crewcache_refresh")
 
     def __init__(self : GuildWar, bot : DiscordBot) -> None:
         self.bot : DiscordBot = bot
         self.day_list : ScheduleList|None = None
-        self.crewcache : CrewData = {}
+        # crew ids and their data (least recently used first)
+        self.crewcache : OrderedDict[int, CrewCacheEntry] = OrderedDict()
+        # cache lookup counters
+        self.crewcache_stats : dict[str, int] = {'hit':0, 'stale':0, 'miss':0}
+        # pending background refreshes, per crew id
+        self.crewcache_refresh : dict[int, asyncio.Task] = {}
 
     """buildDayList()
     Generate the day list used by the gw command
@@ -858,10 +871,161 @@ class GuildWar(commands.Cog):
         return {}
 
     """clearCrewCache()
-    Clear the GBF crew cache
+    Remove the expired entries of the GBF crew cache and log its counters
     """
-    async def clearCrewCache(self : GuildWar) -> None:
-        self.crewcache = {}
+    def clearCrewCache(self : GuildWar) -> None:
+        now : float = time.monotonic()
+        tid : int
+        for tid in [k for k, v in self.crewcache.items() if now - v[0] >= self.CREW_CACHE_STALE]:
+            self.crewcache.pop(tid)
+        self.bot.logger.push(
+            "[GW] Crew cache: {} entries, {} hits, {} stale hits, {} misses".format(
+                len(self.crewcache),
+                self.crewcache_stats['hit'],
+                self.crewcache_stats['stale'],
+                self.crewcache_stats['miss']
+            ),
+            send_to_discord=False
+        )
+        self.crewcache_stats = {'hit':0, 'stale':0, 'miss':0}
+
+    """getCachedCrew()
+    Retrieve a crew data from the cache.
+    Outdated data is returned while a refresh is done in the background.
+
+    Parameters
+    ----------
+    tid: Integer, crew id
+    mode: Integer: 0=all, 1=main page data only, 2=main page and summary
+
+    Returns
+    --------
+    dict: Crew data, None if not cached
+    """
+    def getCachedCrew(self : GuildWar, tid : int, mode : int) -> CrewData|None:
+        entry : CrewCacheEntry|None = self.crewcache.get(tid, None)
+        if entry is None or (mode == 0 and not entry[2]): # the member list is required
+            self.crewcache_stats['miss'] += 1
+            return None
+        age : float = time.monotonic() - entry[0]
+        if age >= self.CREW_CACHE_STALE: # too old
+            self.crewcache.pop(tid)
+            self.crewcache_stats['miss'] += 1
+            return None
+        self.crewcache.move_to_end(tid)
+        if age >= self.CREW_CACHE_TTL:
+            self.crewcache_stats['stale'] += 1
+            if tid not in self.crewcache_refresh:
+                self.crewcache_refresh[tid] = asyncio.create_task(self.refreshCrew(tid, entry[2]))
+        else:
+            self.crewcache_stats['hit'] += 1
+        return entry[1]
+
+    """setCachedCrew()
+    Add a crew data to the cache, remove the least recently used entry if it's full
+
+    Parameters
+    ----------
+    tid: Integer, crew id
+    crew: Crew data
+    complete: Boolean, True if the data includes the member list
+    """
+    def setCachedCrew(self : GuildWar, tid : int, crew : CrewData, complete : bool) -> None:
+        entry : CrewCacheEntry|None = self.crewcache.get(tid, None)
+        if entry is not None and entry[2] and not complete and time.monotonic() - entry[0] < self.CREW_CACHE_TTL:
+            return # don't replace up to date data including the member list
+        self.crewcache[tid] = [time.monotonic(), crew, complete]
+        self.crewcache.move_to_end(tid)
+        while len(self.crewcache) > self.CREW_CACHE_SIZE:
+            self.crewcache.popitem(last=False)
+
+    """refreshCrew()
+    Coroutine to refresh an outdated crew data of the cache
+
+    Parameters
+    ----------
+    tid: Integer, crew id
+    complete: Boolean, True to also request the member list
+    """
+    async def refreshCrew(self : GuildWar, tid : int, complete : bool) -> None:
+        try:
+            crew : CrewData = await self.requestCrewData(tid, 0 if complete else 1)
+            if 'error' not in crew:
+                self.setCachedCrew(tid, crew, complete)
+        except Exception as e:
+            self.bot.logger.pushError(f"[GW] 'refreshCrew' error for crew {tid}:", e)
+        finally:
+            self.crewcache_refresh.pop(tid, None)
+
+    """requestCrewData()
+    Request a GBF crew data, including its player list if public
+
+    Parameters
+    ----------
+    tid: Integer, crew id
+    mode: Integer: 0=all, 1 or 2=main page data only
+
+    Returns
+    --------
+    dict: Crew data, containing an 'error' key if error
+    """
+    async def requestCrewData(self : GuildWar, tid : int, mode : int) -> CrewData:
+        crew : CrewData = {'scores':[], 'id':tid}
+        i : int
+        for i in range(0, 4):
+            # for each page (page 0 being the crew page, 1 to 3 being the crew page
+            if i > 0 and mode > 0:
+                break
+            get : RequestResult = await self.requestCrew(tid, i)
+            if get is None:
+                if i == 0: # if error on page 0, the crew doesn't exist
+                    return {'error':'Crew not found or Service unavailable'}
+                elif i == 1: # if error on page 1, the crew is private
+                    crew['private'] = True
+                break
+            else:
+                # store the data
+                if i == 0:
+                    crew['timestamp'] = self.bot.util.UTC()
+                    crew['footer'] = ""
+                    crew['private'] = False # in preparation
+                    crew['name'] = html.unescape(get['guild_name'])
+                    crew['rank'] = get['guild_rank']
+                    crew['ship'] = (
+                        "https://prd-game-a-granbluefantasy.akamaized.net/"
+                        "assets_en/img/sp/guild/thumb/top/{}.png"
+                    ).format(get['ship_img'])
+                    crew['ship_element'] = {
+                        "10001":"wind",
+                        "20001":"fire",
+                        "30001":"water",
+                        "40001":"earth",
+                        "50001":"light",
+                        "60001":"dark"
+                    }.get(get['ship_img'].split('_', 1)[0], 'gw')
+                    crew['leader'] = html.unescape(get['leader_name'])
+                    crew['leader_id'] = get['leader_user_id']
+                    crew['donator'] = html.unescape(get['most_donated_name'])
+                    crew['donator_id'] = get['most_donated_id']
+                    crew['donator_amount'] = get['most_donated_lupi']
+                    crew['message'] = html.unescape(get['introduction'])
+                    crew['player'] = []
+                else:
+                    p : dict[str, str|int|float|list|dict|None]
+                    for p in get['list']:
+                        crew['player'].append(
+                            {
+                                'id':p['id'],
+                                'name':html.unescape(p['name']),
+                                'level':p['level'],
+                                'is_leader':p['is_leader'],
+                                'member_position':p['member_position'],
+                                'honor':None
+                            }
+                        ) # honor is a placeholder
+        if len(crew['player']) == 0:
+            crew['private'] = True
+        return crew
 
     """getCrewData()
     Get a GBF crew data, including its player list if public
@@ -916,66 +1080,14 @@ class GuildWar(commands.Cog):
         if tid < 0 or tid >= 10000000:
             return {'error':'Out of range ID'}
         # retrieve data
-        crew : CrewData
-        if not disable_cache and tid in self.crewcache: # check if cached
-            crew = self.crewcache[tid]
-        else:
-            crew = {'scores':[], 'id':tid}
-            i : int
-            for i in range(0, 4):
-                # for each page (page 0 being the crew page, 1 to 3 being the crew page
-                if i > 0 and mode > 0:
-                    break
-                get : RequestResult = await self.requestCrew(tid, i)
-                if get is None:
-                    if i == 0: # if error on page 0, the crew doesn't exist
-                        return {'error':'Crew not found or Service unavailable'}
-                    elif i == 1: # if error on page 1, the crew is private
-                        crew['private'] = True
-                    break
-                else:
-                    # store the data
-                    if i == 0:
-                        crew['timestamp'] = self.bot.util.UTC()
-                        crew['footer'] = ""
-                        crew['private'] = False # in preparation
-                        crew['name'] = html.unescape(get['guild_name'])
-                        crew['rank'] = get['guild_rank']
-                        crew['ship'] = (
-                            "https://prd-game-a-granbluefantasy.akamaized.net/"
-                            "assets_en/img/sp/guild/thumb/top/{}.png"
-                        ).format(get['ship_img'])
-                        crew['ship_element'] = {
-                            "10001":"wind",
-                            "20001":"fire",
-                            "30001":"water",
-                            "40001":"earth",
-                            "50001":"light",
-                            "60001":"dark"
-                        }.get(get['ship_img'].split('_', 1)[0], 'gw')
-                        crew['leader'] = html.unescape(get['leader_name'])
-                        crew['leader_id'] = get['leader_user_id']
-                        crew['donator'] = html.unescape(get['most_donated_name'])
-                        crew['donator_id'] = get['most_donated_id']
-                        crew['donator_amount'] = get['most_donated_lupi']
-                        crew['message'] = html.unescape(get['introduction'])
-                        crew['player'] = []
-                    else:
-                        p : dict[str, str|int|float|list|dict|None]
-                        for p in get['list']:
-                            crew['player'].append(
-                                {
-                                    'id':p['id'],
-                                    'name':html.unescape(p['name']),
-                                    'level':p['level'],
-                                    'is_leader':p['is_leader'],
-                                    'member_position':p['member_position'],
-                                    'honor':None
-                                }
-                            ) # honor is a placeholder
-            if len(crew['player']) == 0:
-                crew['private'] = True
-            self.crewcache[tid] = crew
+        crew : CrewData|None = None
+        if not disable_cache:
+            crew = self.getCachedCrew(tid, mode) # check if cached
+        if crew is None:
+            crew = await self.requestCrewData(tid, mode)
+            if 'error' in crew:
+                return crew
+            self.setCachedCrew(tid, crew, mode == 0)
         if mode == 1: # main page data only, simply return
             return crew
         # get summary
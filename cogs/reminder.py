@@ -2,6 +2,8 @@
 import disnake
 from disnake.ext import commands
 import asyncio
+import heapq
+from itertools import count
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -9,6 +11,7 @@ if TYPE_CHECKING:
     # Type Aliases
     type ReminderData = list[datetime|str]
     type ReminderList = list[ReminderData]
+    type ReminderEntry = tuple[datetime, int, str, ReminderData]
 
 # ----------------------------------------------------------------------
 # Reminder Cog
@@ -21,94 +24,166 @@ class Reminder(commands.Cog):
     """Set Reminders."""
     COLOR : int = 0x5e17e3
     REMINDER_LIMIT : int = 8
+    DELIVERY_LIMIT : int = 5 # maximum number of users being sent their reminders at once
+    MAX_SLEEP : int = 3600 # maximum time, in seconds, between two checks
 
-    __slots__ = ("bot")
+    __slots__ = ("bot", "heap", "heap_source", "counter", "wakeup")
 
     def __init__(self : Reminder, bot : DiscordBot) -> None:
         self.bot : DiscordBot = bot
+        # min-heap of (due date, insertion counter, user id, reminder)
+        # deleted reminders are left in the heap and skipped once due
+        self.heap : list[ReminderEntry] = []
+        # reminder data the heap was built from
+        self.heap_source : dict|None = None
+        # insertion counter, to not compare the reminders when two have the same date
+        self.counter : count = count()
+        # set to wake up the task when a reminder is added
+        self.wakeup : asyncio.Event = asyncio.Event()
 
     def startTasks(self : Reminder) -> None:
         if self.bot.isProduction():
             self.bot.runTask('reminder:task', self.remindertask)
 
+    """buildHeap()
+    Rebuild the reminder heap from the save data, if the save data reminders have been replaced (or at boot)
+    """
+    def buildHeap(self : Reminder) -> None:
+        if self.heap_source is self.bot.data.save['reminders']:
+            return
+        self.heap_source = self.bot.data.save['reminders']
+        self.heap = [
+            (r[0], next(self.counter), k, r)
+            for k, v in self.heap_source.items()
+            for r in v
+        ]
+        heapq.heapify(self.heap)
+
+    """schedule()
+    Add a reminder to the heap and wake up the task
+
+    Parameters
+    --------
+    uid: String, user id
+    reminder: The reminder (as stored in the save data)
+    """
+    def schedule(self : Reminder, uid : str, reminder : ReminderData) -> None:
+        if self.heap_source is self.bot.data.save['reminders']: # else, it will be in the heap when rebuilt
+            heapq.heappush(self.heap, (reminder[0], next(self.counter), uid, reminder))
+        self.wakeup.set()
+
     """checkReminders()
-    Check the reminders ready to send.
-    Update the save datas if the reminders are set in the old format.
+    Pop the reminders ready to send from the heap, and remove them from the save data.
 
     Returns
     --------
     dict: Reminders to send
     """
-    async def checkReminders(self : Reminder) -> dict[str, str]:
+    async def checkReminders(self : Reminder) -> dict[str, list[str]]:
         try:
-            send : dict[str, str] = {}
-            # current time, half a minute ahead to account for network delays and such
-            c : datetime = self.bot.util.JST() + timedelta(seconds=30)
-            k : str
-            v : list[ReminderList]
-            for k, v in list(self.bot.data.save['reminders'].items()): # iterate over (user , reminder) pairs
+            self.buildHeap()
+            send : dict[str, list[str]] = {}
+            c : datetime = self.bot.util.JST(delay=False) # current time
+            while len(self.heap) > 0 and c >= self.heap[0][0]: # the next reminder is due
+                k : str
+                r : ReminderData
+                _unused_ : datetime
+                _unused_, _unused_, k, r = heapq.heappop(self.heap)
+                v : ReminderList = self.bot.data.save['reminders'].get(k, [])
                 i : int
-                r : ReminderList
-                for i, r in enumerate(v): # iterate over the reminders
-                    if c >= r[0]: # check if c (current time) is greater or equal than the r[0] (targeted date)
+                for i in range(len(v)):
+                    if v[i] is r: # still in the save data (i.e. not deleted)
                         if k not in send: # create array of message to send for that user if not created
-                            send[k] = []
+                            send[k] = []
                         # add reminder to list of messages to send (limited to 1900 characters)
                         send[k].append(r[1][:1900])
-                        self.bot.data.save['reminders'][k].pop(i) # remove reminder
-                        self.bot.data.pending = True
-                        await asyncio.sleep(0)
-                if len(v) == 0: # if reminder list of that user is empty
-                    self.bot.data.save['reminders'].pop(k) # remove
-                    self.bot.data.pending = True
-                    await asyncio.sleep(0)
+                        v.pop(i) # remove reminder
+                        if len(v) == 0: # if reminder list of that user is empty
+                            self.bot.data.save['reminders'].pop(k) # remove
+                        self.bot.data.touch('reminders', k)
+                        break
             return send # return dict of reminders to send
         except:
             return {}
 
+    """deliver()
+    Send the reminders of an user.
+    remindertask() subroutine.
+
+    Parameters
+    --------
+    limit: Semaphore, bounding the number of concurrent deliveries
+    mid: String, user id
+    messages: List of reminder messages
+    """
+    async def deliver(self : Reminder, limit : asyncio.Semaphore, mid : str, messages : list[str]) -> None:
+        async with limit:
+            m : str = "" # in case the user can't be retrieved
+            if int(mid) == self.bot.user.id: # this is the bot, so we're dealing with bot reminders
+                for m in messages: # send each reminders to every announcement channels
+                    await self.bot.sendMulti(
+                        self.bot.channel.announcements,
+                        embed=self.bot.embed(
+                            title="Reminder",
+                            description=m,
+                            timestamp=self.bot.util.UTC(),
+                            thumbnail=(
+                                "https://prd-game-a-granbluefantasy.akamaized.net"
+                                "/assets_en/img/sp/touch_icon.png"
+                            ),
+                            color=self.COLOR
+                        ),
+                        publish=True
+                    )
+            else: # this is a normal user
+                u : disnake.User|None = None
+                try:
+                    u = await self.bot.get_or_fetch_user(int(mid)) # retrieve it
+                    for m in messages: # send each message to their dm
+                        await u.send(embed=self.bot.embed(title="Reminder", description=m))
+                except Exception as e:
+                    self.bot.logger.pushError(
+                        "[TASK] 'reminder:task' Task Error:\nUser: {}\nReminder: {}".format(
+                            (u.name if u is not None else mid),
+                            m
+                        ),
+                        e
+                    )
+
     """remindertask()
-    Bot Task managing the reminders set by the users
+    Bot Task managing the reminders set by the users.
+    It sleeps until the next reminder is due, or until a reminder is added.
     """
     async def remindertask(self : Reminder) -> None:
+        limit : asyncio.Semaphore = asyncio.Semaphore(self.DELIVERY_LIMIT)
         while True:
             if not self.bot.running:
                 return
             try:
-                messages : dict[str, str] = await self.checkReminders() # obtain the messages to send, if any
-                mid : str
-                for mid in messages: # for each user id
-                    if int(mid) == self.bot.user.id: # this is the bot, so we're dealing with bot reminders
-                        for m in messages[mid]: # send each reminders to every announcement channels
-                            await self.bot.sendMulti(
-                                self.bot.channel.announcements,
-                                embed=self.bot.embed(
-                                    title="Reminder",
-                                    description=m,
-                                    timestamp=self.bot.util.UTC(),
-                                    thumbnail=(
-                                        "https://prd-game-a-granbluefantasy.akamaized.net"
-                                        "/assets_en/img/sp/touch_icon.png"
-                                    ),
-                                    color=self.COLOR
-                                ),
-                                publish=True
-                            )
-                    else: # this is a normal user
-                        u : disnake.User|None = await self.bot.get_or_fetch_user(int(mid)) # retrieve it
-                        m : str
-                        for m in messages[mid]: # send each message to their dm
-                            try:
-                                await u.send(embed=self.bot.embed(title="Reminder", description=m))
-                            except Exception as e:
-                                self.bot.logger.pushError(
-                                    "[TASK] 'reminder:task' Task Error:\nUser: {}\nReminder: {}".format(
-                                        u.name,
-                                        m
-                                    ),
-                                    e
-                                )
-                                break
-                await asyncio.sleep(50) # wait 50s before checking again
+                self.wakeup.clear()
+                messages : dict[str, list[str]] = await self.checkReminders() # obtain the messages to send, if any
+                if len(messages) > 0:
+                    # one failed delivery mustn't cancel the others
+                    r : BaseException|None
+                    for r in await asyncio.gather(
+                        *[self.deliver(limit, mid, m) for mid, m in messages.items()],
+                        return_exceptions=True
+                    ):
+                        if isinstance(r, asyncio.CancelledError):
+                            raise r
+                        elif isinstance(r, Exception):
+                            self.bot.logger.pushError("[TASK] 'reminder:task' Task Error:", r)
+                # wait until the next reminder
+                delay : float = self.MAX_SLEEP
+                if len(self.heap) > 0:
+                    delay = min(
+                        delay,
+                        max(0, (self.heap[0][0] - self.bot.util.JST(delay=False)).total_seconds())
+                    )
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
             except asyncio.CancelledError:
                 self.bot.logger.push("[TASK] 'reminder:task' Task Cancelled")
                 return
@@ -131,8 +206,10 @@ class Reminder(commands.Cog):
             # check if the message already exists (to not add a dupe)
             if m[0] == date and m[1] == msg:
                 return
-        self.bot.data.save['reminders'][str(self.bot.user.id)].append([date, msg]) # add it
-        self.bot.data.pending = True
+        reminder : ReminderData = [date, msg]
+        self.bot.data.save['reminders'][str(self.bot.user.id)].append(reminder) # add it
+        self.bot.data.touch('reminders', str(self.bot.user.id))
+        self.schedule(str(self.bot.user.id), reminder)
 
     """render()
     Display the interaction author's reminder list
@@ -238,8 +315,10 @@ class Reminder(commands.Cog):
                 description = "Error, reminder messages are limited to 400 characters"
             else:
                 try:
-                    self.bot.data.save['reminders'][aid].append([target, msg])
-                    self.bot.data.pending = True
+                    reminder : ReminderData = [target, msg]
+                    self.bot.data.save['reminders'][aid].append(reminder)
+                    self.bot.data.touch('reminders', aid)
+                    self.schedule(aid, reminder)
                     description = "The Reminder has been added"
                 except:
                     description = "An unexpected error occured"
@@ -358,9 +437,10 @@ class Reminder(commands.Cog):
             if rid < 0 or rid >= len(self.bot.data.save['reminders'][aid]): # check if given reminder index is valid
                 description = f"Error, Invalid id `{rid}`"
             else:
-                self.bot.data.save['reminders'][aid].pop(rid) # remove the reminder
+                # remove the reminder (its heap entry will be skipped)
+                self.bot.data.save['reminders'][aid].pop(rid)
                 if len(self.bot.data.save['reminders'][aid]) == 0: # remove user list if empty
                     self.bot.data.save['reminders'].pop(aid)
-                self.bot.data.pending = True
+                self.bot.data.touch('reminders', aid)
                 description = "The Reminder has been deleted"
         await self.render(inter, description)
@@ -29,12 +29,11 @@ class Roles(commands.Cog):
     Coroutine to clear role data from the save data
     """
     async def clean_data(self : Roles) -> None:
-        guild_ids : list[str] = {str(g.id) for g in self.bot.guilds}
         count : int = 0
         await asyncio.sleep(1)
         # Self Assignable Roles
         for gid in list(self.bot.data.save['assignablerole'].keys()): # the bot left the guild
-            if gid not in guild_ids:
+            if not self.bot.members.hasGuild(gid):
                 self.bot.data.save['assignablerole'].pop(gid)
                 count += 1
         if count > 0:
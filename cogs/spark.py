@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 import math
 from operator import itemgetter
 import re
+import time
 
 # ----------------------------------------------------------------------
 # Spark Cog
@@ -31,11 +32,17 @@ class Sparking(commands.Cog):
     MONTHLY_MIN : list[int] = [80, 70, 110, 80, 60, 75, 90, 150, 80, 50, 70, 110]
     # Days per month (as floats)
     MONTHLY_DAY : list[float] = [31.0, 28.25, 31.0, 30.0, 31.0, 30.0, 31.0, 31.0, 30.0, 31.0, 30.0, 31.0]
+    # Ranking cache
+    # The member events require the members intent, so the guild membership is also refreshed periodically
+    RANKING_TTL : int = 3600 # in seconds
 
-    __slots__ = ("bot")
+    __slots__ = ("bot", "rankings", "rankings_source")
 
     def __init__(self : Sparking, bot : DiscordBot) -> None:
         self.bot : DiscordBot = bot
+        # per guild id, the ranking of its members. See getRanking()
+        self.rankings : dict[int, dict] = {}
+        self.rankings_source : dict|None = None # the spark data the rankings were built from
 
     """clean_data()
     Coroutine to clear user spark data from the save data
@@ -51,9 +58,16 @@ class Sparking(commands.Cog):
             d : timedelta = current_time - self.bot.data.save['spark'][rid][4]
             if d.days >= 30: # older than 30 days
                 del self.bot.data.save['spark'][rid] # we remove
+                self.bot.data.touch('spark', rid)
+                self.updateRanking(rid)
                 count += 1
         if count > 0:
             self.bot.data.pending = True
+        # remove the rankings of the guilds the bot left
+        gid : int
+        for gid in list(self.rankings.keys()):
+            if not self.bot.members.hasGuild(gid):
+                self.rankings.pop(gid)
 
     @commands.slash_command()
     @commands.default_member_permissions(send_messages=True, read_messages=True)
@@ -191,7 +205,8 @@ class Sparking(commands.Cog):
                     self.bot.data.save['spark'].pop(aid)
             else: # else, add data for this user
                 self.bot.data.save['spark'][aid] = [crystal, single, ten, shrimp, self.bot.util.UTC()]
-            self.bot.data.pending = True
+            self.bot.data.touch('spark', aid)
+            self.updateRanking(aid, inter.author if isinstance(inter.author, disnake.Member) else None)
             # Call see roll to display the result
             await self._seeroll(inter, inter.author)
         except Exception as e:
@@ -438,6 +453,139 @@ class Sparking(commands.Cog):
                 )
             )
 
+    """score()
+    Return the roll count of a spark data, as used in the rankings
+
+    Parameters
+    ----------
+    s: The spark data, can be None
+
+    Returns
+    --------
+    float: The roll count, None if the data isn't valid for the rankings
+    """
+    def score(self : Sparking, s : SparkData|None) -> float|None:
+        if s is None or s[0] < 0 or s[1] < 0 or s[2] < 0 or s[3] < 0: # check for negative numbers
+            return None
+        r : float = (s[0] / 300) + s[1] + s[2] * 10 + s[3] # calculate roll
+        if r > 1800: # skip user if over 6 sparks
+            return None
+        return r
+
+    """updateRanking()
+    Update the cached rankings after a change of an user spark data.
+    Must be called after each modification of save['spark'].
+
+    Parameters
+    ----------
+    uid: String, the user id
+    member: disnake.Member (Optional), the user as a member of a guild, if known
+    """
+    def updateRanking(self : Sparking, uid : str, member : disnake.Member|None = None) -> None:
+        if self.rankings_source is not self.bot.data.save['spark']: # the save data changed, the rankings will be rebuilt
+            return
+        score : float|None = self.score(self.bot.data.save['spark'].get(uid, None))
+        gid : int
+        ranking : dict
+        for gid, ranking in self.rankings.items():
+            if score is None: # the user isn't ranked anymore
+                ranking['names'].pop(uid, None)
+                ranking['scores'].pop(uid, None)
+                ranking['pending'].discard(uid)
+            elif uid in ranking['names']: # known member of this guild
+                ranking['scores'][uid] = score
+            elif member is not None and member.guild.id == gid:
+                ranking['names'][uid] = member.display_name
+                ranking['scores'][uid] = score
+            else: # membership unknown, will be checked on the next use of the ranking
+                ranking['pending'].add(uid)
+
+    """getRanking()
+    Retrieve the cached ranking of a guild, build it or complete it if needed.
+
+    Parameters
+    ----------
+    guild: Target guild
+
+    Returns
+    --------
+    dict: Containing:
+        - time: Float, time of the last membership refresh (time.monotonic())
+        - names: Dict, ids (in string format) and display names of the ranked members
+        - scores: Dict, ids (in string format) and roll counts of the ranked members
+        - pending: Set, ids of users whose membership is unknown
+        - lock: asyncio.Lock, held while resolving the pending users
+    """
+    async def getRanking(self : Sparking, guild : disnake.Guild) -> dict:
+        if self.rankings_source is not self.bot.data.save['spark']: # the save data changed
+            self.rankings = {}
+            self.rankings_source = self.bot.data.save['spark']
+        ranking : dict|None = self.rankings.get(guild.id, None)
+        if ranking is None or time.monotonic() - ranking['time'] >= self.RANKING_TTL:
+            ranking = {
+                'time':time.monotonic(),
+                'names':{},
+                'scores':{},
+                'pending':set(
+                    uid for uid, s in self.bot.data.save['spark'].items()
+                    if self.score(s) is not None
+                ),
+                'lock':asyncio.Lock()
+            }
+            self.rankings[guild.id] = ranking
+        async with ranking['lock']:
+            if len(ranking['pending']) > 0:
+                pending : list[str] = list(ranking['pending'])
+                ranking['pending'].clear() # updates during the request will be added again
+                members : dict[int, disnake.Member]
+                try:
+                    members = await self.bot.members.fetch(guild, pending)
+                except:
+                    ranking['pending'].update(pending)
+                    raise
+                uid : str
+                for uid in pending:
+                    score : float|None = self.score(self.bot.data.save['spark'].get(uid, None))
+                    if int(uid) in members and score is not None:
+                        ranking['names'][uid] = members[int(uid)].display_name
+                        ranking['scores'][uid] = score
+        return ranking
+
+    """on_member_join()
+    Event. Requires the members intent.
+    Add the new member to the ranking of the guild.
+
+    Parameters
+    ----------
+    member: disnake.Member
+    """
+    @commands.Cog.listener()
+    async def on_member_join(self : Sparking, member : disnake.Member) -> None:
+        ranking : dict|None = self.rankings.get(member.guild.id, None)
+        if ranking is not None and self.rankings_source is self.bot.data.save['spark']:
+            uid : str = str(member.id)
+            score : float|None = self.score(self.bot.data.save['spark'].get(uid, None))
+            if score is not None:
+                ranking['names'][uid] = member.display_name
+                ranking['scores'][uid] = score
+
+    """on_raw_member_remove()
+    Event. Requires the members intent.
+    Remove the member from the ranking of the guild.
+
+    Parameters
+    ----------
+    payload: disnake.RawGuildMemberRemoveEvent
+    """
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self : Sparking, payload : disnake.RawGuildMemberRemoveEvent) -> None:
+        ranking : dict|None = self.rankings.get(payload.guild_id, None)
+        if ranking is not None:
+            uid : str = str(payload.user.id)
+            ranking['names'].pop(uid, None)
+            ranking['scores'].pop(uid, None)
+            ranking['pending'].discard(uid)
+
     """_ranking()
     Retrieve the spark data of this server users and rank them
 
@@ -457,21 +605,12 @@ class Sparking(commands.Cog):
         inter : disnake.ApplicationCommandInteraction,
         guild : disnake.Guild
     ) -> tuple[str|None, int|None]:
-        ranking : dict[str, float] = {}
-        iid : str
-        s : SparkData
-        for iid, s in self.bot.data.save['spark'].items(): # go over the spark data
-            if self.bot.ban.check(str(iid), self.bot.ban.SPARK): # if user is banned, skip
-                continue
-            m : disnake.Member|None = await guild.get_or_fetch_member(int(iid)) # try to fetch user in given guild
-            if m is not None: # user IS in the guild
-                if s[0] < 0 or s[1] < 0 or s[2] < 0 or s[3] < 0: # check for negative numbers
-                    continue
-                r : float = (s[0] / 300) + s[1] + s[2] * 10 + s[3] # calculate roll
-                if r > 1800: # skip user if over 6 sparks
-                    continue
-                ranking[iid] = r # add user to ranking
-        if len(ranking) == 0: # no one in the ranking, skip
+        ranking : dict = await self.getRanking(guild)
+        scores : dict[str, float] = {
+            iid:r for iid, r in ranking['scores'].items()
+            if not self.bot.ban.check(iid, self.bot.ban.SPARK) # if user is banned, skip
+        }
+        if len(scores) == 0: # no one in the ranking, skip
             return None, None
         ar : int = -1 # author position in the ranking
         i : int = 0
@@ -484,14 +623,14 @@ class Sparking(commands.Cog):
         # go over sorted ranking (in reverse order by roll count
         key : str
         value : float
-        for key, value in sorted(ranking.items(), key=itemgetter(1), reverse=True):
+        for key, value in sorted(scores.items(), key=itemgetter(1), reverse=True):
             if i < self.TOP_LIMIT: # add to list if under top limit constant
                 fr : int = math.floor(value) # round value
                 msgs.append(
                     "**#{:<2}{} {}** with {} roll".format(
                         i + 1,
                         emotes.pop(i, "▫️"),
-                        (await guild.get_or_fetch_member(int(key))).display_name,
+                        ranking['names'][key],
                         fr
                     )
                 )
@@ -39,7 +39,7 @@ class Ban():
         if not self.check(uid, flag): # if not banned for that flag
             # set ban flag
             self.bot.data.save['ban'][uid] = self.bot.data.save['ban'].get(uid, 0) ^ flag
-            self.bot.data.pending = True
+            self.bot.data.touch('ban', uid)
 
     """unset()
     Unban an user
@@ -59,7 +59,7 @@ class Ban():
                 self.bot.data.save['ban'][uid] -= flag
             if self.bot.data.save['ban'][uid] == 0: # if user is totally unbanned, remove from list
                 self.bot.data.save['ban'].pop(uid)
-            self.bot.data.pending = True
+            self.bot.data.touch('ban', uid)
 
     """check()
     Return if the user is banned or not
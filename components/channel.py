@@ -2,12 +2,18 @@ from __future__ import annotations
 import disnake
 from disnake.ext import commands
 import asyncio
-from typing import TYPE_CHECKING
+import itertools
+import heapq
+import time
+from typing import Iterable, TYPE_CHECKING
 if TYPE_CHECKING:
     from ..bot import DiscordBot
     # Type Aliases
     type CleanupSetting = list[bool|list[int]]
     type AnnouncementSetting = list[int|bool]
+    type CleanupTarget = disnake.Message|disnake.ApplicationCommandInteraction|disnake.ModalInteraction
+    # due time (time.monotonic()), order, target, False if the message got deleted
+    type CleanupEntry = list[float|int|CleanupTarget|bool]
 
 # ----------------------------------------------------------------------
 # Channel Component
@@ -18,18 +24,34 @@ if TYPE_CHECKING:
 
 
 class Channel():
-    __slots__ = ("bot", "cache", "announcements", "auto_publish")
+    CLEANUP_LIMIT : int = 10 # maximum number of concurrent cleanup edits
+    MAX_SLEEP : int = 3600 # maximum time, in seconds, the cleanup task sleeps
+
+    __slots__ = (
+        "bot", "cache", "announcements", "auto_publish",
+        "cleanups", "cleanup_messages", "cleanup_dropped", "cleanup_counter", "cleanup_wakeup"
+    )
 
     def __init__(self : Channel, bot : DiscordBot) -> None:
         self.bot : DiscordBot = bot
         self.cache : dict[str, disnake.abc.Messageable] = {}
         self.announcements : list[int] = [] # channels to send announcement to
         self.auto_publish : list[int] = [] # channels to auto publish
+        # scheduled cleanups (min-heap, earliest first), see clean()
+        self.cleanups : list[CleanupEntry] = []
+        # message ids of the message targets and their entry, to drop them if the message is deleted
+        self.cleanup_messages : dict[int, CleanupEntry] = {}
+        self.cleanup_dropped : int = 0 # number of dropped entries still in the heap
+        self.cleanup_counter : itertools.count = itertools.count() # order of the entries with the same due time
+        self.cleanup_wakeup : asyncio.Event = asyncio.Event() # set when an earlier cleanup is scheduled
 
     def init(self : Channel) -> None:
         self.cache = {}
         self.update_announcement_channels()
 
+    def startTasks(self : Channel) -> None:
+        self.bot.runTask('channel:cleanup', self.cleanuptask)
+
     """update_announcement_channels()
     Update announcement channel lists
     """
@@ -171,6 +193,7 @@ class Channel():
     """clean()
     Delete a bot command message after X amount of time depending on the
     The lyria emote will be used to replace the message.
+    If a delay is set, the cleanup is scheduled and done later by cleanuptask().
 
     Parameters
     ----------
@@ -181,45 +204,157 @@ class Channel():
     """
     async def clean(
         self : Channel,
-        target : disnake.Message|disnake.ApplicationCommandInteraction,
+        target : CleanupTarget,
         delay : int|float|None = None,
         all : bool = False
     ) -> None:
         try:
             match target:
                 case disnake.ApplicationCommandInteraction()|disnake.ModalInteraction(): # interactions
-                    if all or self.interaction_must_be_cleaned(target): # cleanup check
-                        if delay is not None:
-                            await asyncio.sleep(delay) # delete message after delay
-                        # edit message with lyria emote
-                        await target.edit_original_message(
+                    if not all and not self.interaction_must_be_cleaned(target): # cleanup check
+                        return
+                case disnake.Message(): # message
+                    if not all and self.interaction_must_be_cleaned(target): # cleanup check
+                        return
+                case _:
+                    return
+        except Exception as e:
+            self.bot.logger.pushError("[UTIL] 'clean' error:", e)
+            return
+        if delay is None or delay <= 0:
+            await self.cleanup(target)
+        else:
+            self.schedule_cleanup(target, delay)
+
+    """schedule_cleanup()
+    Add a cleanup to the schedule
+
+    Parameters
+    ----------
+    target: A Disnake Message OR a Disnake Interaction
+    delay: Time in second before deletion
+    """
+    def schedule_cleanup(self : Channel, target : CleanupTarget, delay : int|float) -> None:
+        entry : CleanupEntry = [time.monotonic() + delay, next(self.cleanup_counter), target, True]
+        if isinstance(target, disnake.Message):
+            previous : CleanupEntry|None = self.cleanup_messages.get(target.id, None)
+            if previous is not None and previous[3]: # already scheduled, keep the latest
+                previous[3] = False
+                self.cleanup_dropped += 1
+            self.cleanup_messages[target.id] = entry
+        heapq.heappush(self.cleanups, entry)
+        if self.cleanups[0] is entry: # the task must wake up earlier
+            self.cleanup_wakeup.set()
+
+    """pending_cleanups()
+    Return the number of scheduled cleanups
+
+    Returns
+    ----------
+    int: The count
+    """
+    def pending_cleanups(self : Channel) -> int:
+        return len(self.cleanups) - self.cleanup_dropped
+
+    """on_message_delete()
+    Event.
+    Drop the scheduled cleanups of the deleted messages.
+
+    Parameters
+    ----------
+    message_ids: Iterable of message ids
+    """
+    def on_message_delete(self : Channel, message_ids : Iterable[int]) -> None:
+        mid : int
+        for mid in message_ids:
+            entry : CleanupEntry|None = self.cleanup_messages.pop(mid, None)
+            if entry is not None and entry[3]:
+                entry[3] = False
+                self.cleanup_dropped += 1
+
+    """cleanuptask()
+    Bot Task managing the scheduled cleanups
+    """
+    async def cleanuptask(self : Channel) -> None:
+        limit : asyncio.Semaphore = asyncio.Semaphore(self.CLEANUP_LIMIT)
+        while True:
+            if not self.bot.running:
+                return
+            try:
+                self.cleanup_wakeup.clear()
+                # pop the due entries
+                now : float = time.monotonic()
+                targets : list[CleanupTarget] = []
+                while len(self.cleanups) > 0 and self.cleanups[0][0] <= now:
+                    entry : CleanupEntry = heapq.heappop(self.cleanups)
+                    if not entry[3]: # dropped
+                        self.cleanup_dropped -= 1
+                        continue
+                    if isinstance(entry[2], disnake.Message):
+                        self.cleanup_messages.pop(entry[2].id, None)
+                    targets.append(entry[2])
+                if len(targets) > 0:
+                    await asyncio.gather(*[self.cleanup(target, limit) for target in targets])
+                # wait until the next cleanup
+                delay : float = self.MAX_SLEEP
+                if len(self.cleanups) > 0:
+                    delay = min(delay, max(0, self.cleanups[0][0] - time.monotonic()))
+                try:
+                    await asyncio.wait_for(self.cleanup_wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                self.bot.logger.push("[TASK] 'channel:cleanup' Task Cancelled")
+                return
+            except Exception as e:
+                self.bot.logger.pushError("[TASK] 'channel:cleanup' Task Error:", e)
+                await asyncio.sleep(10)
+
+    """cleanup()
+    Replace a message with the lyria emote
+
+    Parameters
+    ----------
+    target: A Disnake Message OR a Disnake Interaction
+    limit: asyncio.Semaphore (Optional), to limit the number of concurrent edits
+    """
+    async def cleanup(
+        self : Channel,
+        target : CleanupTarget,
+        limit : asyncio.Semaphore|None = None
+    ) -> None:
+        try:
+            if limit is not None:
+                async with limit:
+                    await self.cleanup(target)
+                return
+            match target:
+                case disnake.ApplicationCommandInteraction()|disnake.ModalInteraction(): # interactions
+                    # edit message with lyria emote
+                    await target.edit_original_message(
+                        content=str(self.bot.emote.get('lyria')),
+                        embed=None,
+                        view=None,
+                        attachments=[]
+                    )
+                case disnake.Message(): # message
+                    # edit message with lyria emote
+                    if target.flags.is_components_v2:
+                        await target.edit(
+                            components=[
+                                disnake.ui.TextDisplay(str(self.bot.emote.get('lyria')))
+                            ]
+                        )
+                    else:
+                        await target.edit(
                             content=str(self.bot.emote.get('lyria')),
                             embed=None,
                             view=None,
                             attachments=[]
                         )
-                case disnake.Message(): # message
-                    if all or not self.interaction_must_be_cleaned(target): # cleanup check
-                        if delay is not None:
-                            await asyncio.sleep(delay) # delete message after delay
-                        # edit message with lyria emote
-                        if target.flags.is_components_v2:
-                            await target.edit(
-                                components=[
-                                    disnake.ui.TextDisplay(str(self.bot.emote.get('lyria')))
-                                ]
-                            )
-                        else:
-                            await target.edit(
-                                content=str(self.bot.emote.get('lyria')),
-                                embed=None,
-                                view=None,
-                                attachments=[]
-                            )
         except Exception as e:
             if "Unknown Message" not in str(e):
                 self.bot.logger.pushError("[UTIL] 'clean' error:", e)
-            return False
 
     """interaction_must_be_cleaned()
     Take an interaction (or similar) and determine if cleanup must be invoked based on server settings.
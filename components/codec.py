@@ -0,0 +1,250 @@
+from __future__ import annotations
+from typing import BinaryIO, ContextManager
+from contextlib import nullcontext
+import lzma
+import gzip
+import io
+import shutil
+import time
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# ----------------------------------------------------------------------
+# Codec Module
+# ----------------------------------------------------------------------
+# Compression codecs used for the save files.
+# The codec of a file is recorded in its extension.
+# Not a bot component: it doesn't depend on the bot and can be used by the tools.
+# ----------------------------------------------------------------------
+
+CHUNK : int = 65536 # streaming buffer size
+
+
+# Base class, without compression
+class Codec():
+    NAME : str = "none"
+    EXTENSION : str = "json"
+    MIME : str = "application/json"
+
+    __slots__ = ()
+
+    """reader()
+    Wrap a binary stream to read decompressed data from it.
+    Closing the wrapper doesn't close the stream.
+
+    Parameters
+    ----------
+    fileobj: Binary stream
+
+    Returns
+    --------
+    ContextManager: The readable stream
+    """
+    def reader(self : Codec, fileobj : BinaryIO) -> ContextManager[BinaryIO]:
+        return nullcontext(fileobj)
+
+    """writer()
+    Wrap a binary stream to write compressed data to it.
+    Closing the wrapper doesn't close the stream.
+
+    Parameters
+    ----------
+    fileobj: Binary stream
+
+    Returns
+    --------
+    ContextManager: The writable stream
+    """
+    def writer(self : Codec, fileobj : BinaryIO) -> ContextManager[BinaryIO]:
+        return nullcontext(fileobj)
+
+
+class LZMACodec(Codec):
+    NAME : str = "lzma"
+    EXTENSION : str = "lzma"
+    MIME : str = "application/x-lzma"
+
+    __slots__ = ()
+
+    def reader(self : LZMACodec, fileobj : BinaryIO) -> ContextManager[BinaryIO]:
+        return lzma.LZMAFile(fileobj, mode="rb")
+
+    def writer(self : LZMACodec, fileobj : BinaryIO) -> ContextManager[BinaryIO]:
+        return lzma.LZMAFile(fileobj, mode="wb")
+
+
+class GzipCodec(Codec):
+    NAME : str = "gzip"
+    EXTENSION : str = "gzip"
+    MIME : str = "application/gzip"
+
+    __slots__ = ()
+
+    def reader(self : GzipCodec, fileobj : BinaryIO) -> ContextManager[BinaryIO]:
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+
+    def writer(self : GzipCodec, fileobj : BinaryIO) -> ContextManager[BinaryIO]:
+        return gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6)
+
+
+# Requires the zstandard module
+class ZstdCodec(Codec):
+    NAME : str = "zstd"
+    EXTENSION : str = "zst"
+    MIME : str = "application/zstd"
+
+    __slots__ = ()
+
+    def reader(self : ZstdCodec, fileobj : BinaryIO) -> ContextManager[BinaryIO]:
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+
+    def writer(self : ZstdCodec, fileobj : BinaryIO) -> ContextManager[BinaryIO]:
+        return zstandard.ZstdCompressor(level=10).stream_writer(fileobj, closefd=False)
+
+
+# Registry of the available codecs, per name
+CODECS : dict[str, Codec] = {
+    c.NAME : c for c in (
+        [LZMACodec(), GzipCodec(), Codec()]
+        + ([ZstdCodec()] if zstandard is not None else [])
+    )
+}
+DEFAULT : str = "lzma"
+
+"""get()
+Return a codec by name
+
+Parameters
+----------
+name: String, codec name
+
+Raises
+------
+KeyError: Unknown or unavailable codec
+
+Returns
+--------
+Codec: The codec
+"""
+def get(name : str) -> Codec:
+    return CODECS[name]
+
+"""from_filename()
+Return the codec of a file, according to its extension
+
+Parameters
+----------
+filename: String, file name
+
+Returns
+--------
+Codec: The codec, None if unknown or unavailable
+"""
+def from_filename(filename : str) -> Codec|None:
+    ext : str = filename.split(".")[-1]
+    c : Codec
+    for c in CODECS.values():
+        if c.EXTENSION == ext:
+            return c
+    return None
+
+"""compress()
+Encode a string in utf-8 and compress it, chunk by chunk
+
+Parameters
+----------
+codec: Codec to use
+data: String to compress
+
+Returns
+--------
+bytes: The compressed data
+"""
+def compress(codec : Codec, data : str) -> bytes:
+    with io.BytesIO() as bio:
+        with codec.writer(bio) as stream:
+            i : int
+            for i in range(0, len(data), CHUNK):
+                stream.write(data[i:i + CHUNK].encode("utf-8"))
+        return bio.getvalue()
+
+"""decompress()
+Decompress data and decode it in utf-8
+
+Parameters
+----------
+codec: Codec to use
+data: Bytes to decompress
+
+Returns
+--------
+str: The decompressed string
+"""
+def decompress(codec : Codec, data : bytes) -> str:
+    with io.BytesIO(data) as bio:
+        with codec.reader(bio) as stream:
+            return stream.read().decode("utf-8")
+
+"""compress_file()
+Compress a file, in a streaming fashion
+
+Parameters
+----------
+codec: Codec to use
+source: String, path of the file to compress
+destination: String, path of the compressed file
+"""
+def compress_file(codec : Codec, source : str, destination : str) -> None:
+    with open(source, mode="rb") as fin:
+        with open(destination, mode="wb") as fout:
+            with codec.writer(fout) as stream:
+                shutil.copyfileobj(fin, stream, CHUNK)
+
+"""decompress_file()
+Decompress a file, in a streaming fashion.
+The codec is determined by the file extension.
+
+Parameters
+----------
+source: String, path of the compressed file
+destination: String, path of the decompressed file
+
+Raises
+------
+Exception: Unknown codec
+"""
+def decompress_file(source : str, destination : str) -> None:
+    codec : Codec|None = from_filename(source)
+    if codec is None:
+        raise Exception(f"Unknown or unavailable codec for `{source}`")
+    with open(source, mode="rb") as fin:
+        with codec.reader(fin) as stream:
+            with open(destination, mode="wb") as fout:
+                shutil.copyfileobj(stream, fout, CHUNK)
+
+"""benchmark()
+Measure the compression ratio and speed of each available codec
+
+Parameters
+----------
+data: String, data to compress (usually the serialized save data)
+
+Returns
+--------
+list: Tuples of codec name, compressed size, ratio, compression time and decompression time (in seconds)
+"""
+def benchmark(data : str) -> list[tuple[str, int, float, float, float]]:
+    results : list[tuple[str, int, float, float, float]] = []
+    size : int = len(data.encode("utf-8"))
+    c : Codec
+    for c in CODECS.values():
+        t : float = time.perf_counter()
+        cdata : bytes = compress(c, data)
+        ct : float = time.perf_counter() - t
+        t = time.perf_counter()
+        decompress(c, cdata)
+        dt : float = time.perf_counter() - t
+        results.append((c.NAME, len(cdata), len(cdata) / max(1, size), ct, dt))
+    return results
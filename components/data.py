@@ -1,12 +1,17 @@
 ﻿from __future__ import annotations
 import asyncio
 from typing import TYPE_CHECKING
+from collections import Counter
 if TYPE_CHECKING:
     from ..bot import DiscordBot
     from components.util import JSON
     from components.network import RequestResult
     from cogs.reminder import Reminder
+from components import schema
+from components.store import Store
 import json
+import os
+import time
 from io import BytesIO
 from datetime import datetime, timedelta
 import html
@@ -20,6 +25,66 @@ import html
 # ----------------------------------------------------------------------
 
 
+# Dict of a tracked save section (see Data.TRACKED_SECTIONS), recording the keys set or deleted
+# Modifications inside the values aren't seen, Data.touch() must be used for those
+class TrackedDict(dict):
+    __slots__ = ("touched",)
+
+    def __init__(self : TrackedDict, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.touched : set[str]|None = set() # None if the whole section changed
+
+    """touch()
+    Flag a key as modified
+
+    Parameters
+    --------
+    key: Key, None if the whole section changed
+    """
+    def touch(self : TrackedDict, key : str|int|None) -> None:
+        if key is None:
+            self.touched = None
+        elif self.touched is not None:
+            self.touched.add(str(key))
+
+    def __setitem__(self : TrackedDict, key : str, value : JSON) -> None:
+        super().__setitem__(key, value)
+        self.touch(key)
+
+    def __delitem__(self : TrackedDict, key : str) -> None:
+        super().__delitem__(key)
+        self.touch(key)
+
+    def pop(self : TrackedDict, key : str, *args) -> JSON:
+        self.touch(key)
+        return super().pop(key, *args)
+
+    def popitem(self : TrackedDict) -> tuple[str, JSON]:
+        item : tuple[str, JSON] = super().popitem()
+        self.touch(item[0])
+        return item
+
+    def setdefault(self : TrackedDict, key : str, default : JSON = None) -> JSON:
+        if key not in self:
+            self.touch(key)
+        return super().setdefault(key, default)
+
+    def update(self : TrackedDict, *args, **kwargs) -> None:
+        other : dict = dict(*args, **kwargs)
+        super().update(other)
+        key : str
+        for key in other:
+            self.touch(key)
+
+    def __ior__(self : TrackedDict, other : dict) -> TrackedDict:
+        self.update(other)
+        return self
+
+    def clear(self : TrackedDict) -> None:
+        super().clear()
+        self.touch(None)
+
+
 class Data():
     SAVEVERSION : int = 20
     BASE_SAVE : JSON = {
@@ -44,7 +109,31 @@ class Data():
         'matchtracker': None,
         'pinboard': {},
         'ban': {},
-        'announcement': {}
+        'announcement': {},
+        'journal': 0
+    }
+    # Datetime locations in the save data, see components/schema.py
+    SAVE_SCHEMA : dict = {
+        'gbfaccount': {'last':schema.DATETIME},
+        'gbfdata': schema.ANY, # free-form cache
+        'maintenance': {'time':schema.DATETIME},
+        'stream': {'time':schema.DATETIME},
+        'spark': {schema.WILDCARD:{4:schema.DATETIME}}, # user id: [crystal, single, ten, shrimp, date]
+        'gw': {
+            'ranking': {4:schema.DATETIME}, # [crew, player, crew speed, player speed, date]
+            'dates': {schema.WILDCARD:schema.DATETIME},
+            'buffs': {schema.WILDCARD:{0:schema.DATETIME}} # [date, flags...]
+        },
+        'dread': {
+            'dates': {schema.WILDCARD:schema.DATETIME},
+            'buffs': {schema.WILDCARD:{0:schema.DATETIME}}
+        },
+        'reminders': {schema.WILDCARD:{schema.WILDCARD:{0:schema.DATETIME}}}, # user id: [[date, message], ...]
+        'extra': schema.ANY, # free-form
+        'matchtracker': {
+            'last': schema.DATETIME,
+            'plot': {schema.WILDCARD:{0:schema.DATETIME}} # [date, speed, speed]
+        }
     }
     BASE_CONFIG : list[str] = [
         'tokens',
@@ -59,8 +148,27 @@ class Data():
         "christmas stream",
         "anniversary stream"
     )
+    # Change journal
+    JOURNAL_FILE : str = "save.journal"
+    JOURNAL_INTERVAL : int = 300 # seconds between each journal flush
+    JOURNAL_LIMIT : int = 2000 # number of journal entries forcing a snapshot
+    SNAPSHOT_INTERVAL : int = 10800 # seconds between each full snapshot
+    # Save shards
+    SAVE_FOLDER : str = "save" # each save section is stored in its own file in this folder
+    MANIFEST_FILE : str = "save/manifest.json"
+    META_KEYS : set[str] = {'version', 'journal'} # save keys stored in the manifest and not tracked by the journal
+    # Optional SQLite store for the per-user sections (enabled by the "save_store" config key)
+    STORE_FILE : str = "save/store.db"
+    STORE_SECTIONS : tuple[str, ...] = ('spark', 'gbfids', 'reminders', 'ban')
+    # Per-user sections not compared by the journal, their modified keys are recorded by TrackedDict or set with touch()
+    TRACKED_SECTIONS : tuple[str, ...] = STORE_SECTIONS
 
-    __slots__ = ("bot", "debug", "config", "save", "pending", "autosaving")
+    __slots__ = (
+        "bot", "debug", "config", "save", "pending", "autosaving",
+        "journal", "journal_written", "journal_state", "touched", "last_snapshot", "dirty",
+        "store", "store_changes", "store_resets", "store_entries", "store_journal", "last_store_upload",
+        "change_count"
+    )
 
     def __init__(self : Data, bot : DiscordBot) -> None:
         self.bot : DiscordBot = bot
@@ -69,6 +177,30 @@ class Data():
         self.save : JSON = self.BASE_SAVE
         self.pending : bool = False
         self.autosaving : bool = False
+        # journal entries since the last snapshot
+        self.journal : list[str] = []
+        # number of those entries written to the journal file
+        self.journal_written : int = 0
+        # hash of each save section (or of each key of dict sections, True for tracked sections), as of the last journal entry
+        self.journal_state : dict[str, int|dict[str, int]|bool] = {}
+        # keys of the tracked sections modified since the last journal entry (None if the whole section changed)
+        self.touched : dict[str, set[str]|None] = {}
+        self.last_snapshot : float = time.monotonic()
+        # sections modified since the last snapshot
+        self.dirty : set[str] = set()
+        # SQLite store, None if disabled
+        self.store : Store|None = None
+        # store rows modified since the last snapshot, per section (None values are deleted keys)
+        self.store_changes : dict[str, dict[str, str|None]] = {}
+        # store sections to rewrite entirely
+        self.store_resets : set[str] = set()
+        # journal entries of the store sections since the last store upload, kept in the journal until the next one
+        self.store_entries : list[str] = []
+        # journal sequence number of the loaded store, the store sections entries after it are replayed
+        self.store_journal : int = 0
+        self.last_store_upload : float = time.monotonic()
+        # number of journal entries since the boot, per section and per section/key path
+        self.change_count : Counter = Counter()
 
     def init(self : Data) -> None:
         pass
@@ -76,6 +208,7 @@ class Data():
     def startTasks(self : Data) -> None:
         if self.bot.isProduction():
             self.bot.runTask('data:maintenance', self.maintenance)
+            self.bot.runTask('data:journal', self.journaling)
 
     """loadConfig()
     Read config.json. Only called once during boot
@@ -281,8 +414,46 @@ class Data():
                 data['gbfdata'].pop("totalplayer")
         return data
 
+    """loadShards()
+    Read the save shards listed in the manifest, and the sections kept in the SQLite store
+
+    Raises
+    ------
+    Exception: The store file is missing
+
+    Returns
+    --------
+    dict: The save data
+    """
+    def loadShards(self : Data) -> JSON:
+        with open(self.MANIFEST_FILE, mode="r", encoding="utf-8") as f:
+            manifest : JSON = json.load(f)
+        data : JSON = {k : manifest[k] for k in self.META_KEYS}
+        section : str
+        for section in manifest['sections']:
+            # a shard is a JSON object with a single key, the section name
+            with open(os.path.join(self.SAVE_FOLDER, section + ".json"), mode="r", encoding="utf-8") as f:
+                data.update(json.load(f))
+        if len(manifest.get('store', [])) > 0:
+            if not os.path.isfile(self.STORE_FILE):
+                raise Exception(f"'{self.STORE_FILE}' not found")
+            # the store is read even if it has been disabled since
+            db : Store = self.store if self.store is not None else Store(self.STORE_FILE)
+            db.open()
+            # the store might be older than the shards, see needStoreUpload()
+            self.store_journal = manifest.get('store_journal', manifest['journal'])
+            for section in manifest['store']:
+                k : str
+                v : str
+                data[section] = {k : json.loads(v) for k, v in db.load(section).items()}
+                self.store_resets.discard(section)
+            if db is not self.store:
+                db.close()
+        return data
+
     """loadData()
-    Read save.json.
+    Read the save shards, or save.json for legacy saves.
+    Datetimes are decoded using SAVE_SCHEMA.
     Assure the retrocompatibility with older save files.
 
     Returns
@@ -291,60 +462,622 @@ class Data():
     """
     def loadData(self : Data) -> bool:
         try:
-            with open('save.json', mode="r", encoding="utf-8") as f:
-                data : JSON = json.load(f, object_pairs_hook=self.bot.util.json_deserial_dict)
-                ver : int|None
-                if any(data): # check if it contains something
-                    ver = data.get('version', None)
-                else: # fresh save file
-                    ver = self.SAVEVERSION
-                # Version check and retrocompatibility
-                if ver is None:
-                    raise Exception("This save file isn't compatible")
-                elif ver < self.SAVEVERSION: # Old save
-                    data = self.convertData(data, ver)
-                    # Update the version
-                    data['version'] = self.SAVEVERSION
-                elif ver > self.SAVEVERSION: # Version is more recent??
-                    raise Exception("Save file version higher than the expected version")
-                # Do an extra conversions in checkData
-                self.save = self.checkData(data)
-                self.pending = False
-                return True
+            t : float = time.perf_counter()
+            if self.config.get('save_store', False):
+                self.store = Store(self.STORE_FILE)
+            # store sections not loaded from the store must be written entirely
+            self.store_changes = {}
+            self.store_resets = set(self.STORE_SECTIONS)
+            self.store_entries = []
+            self.last_store_upload = time.monotonic()
+            data : JSON
+            if os.path.isfile(self.MANIFEST_FILE):
+                data = self.loadShards()
+            else: # legacy single file
+                with open('save.json', mode="r", encoding="utf-8") as f:
+                    data = json.load(f)
+            ver : int|None
+            if any(data): # check if it contains something
+                ver = data.get('version', None)
+            else: # fresh save file
+                ver = self.SAVEVERSION
+            if ver == self.SAVEVERSION:
+                schema.decode(data, self.SAVE_SCHEMA)
+            else: # the layout of older versions is unknown, every string is tried
+                schema.sniff(data)
+            self.bot.logger.push(
+                "[DATA] Save data decoded in {:.3f}s".format(time.perf_counter() - t),
+                send_to_discord=False
+            )
+            # Version check and retrocompatibility
+            if ver is None:
+                raise Exception("This save file isn't compatible")
+            elif ver < self.SAVEVERSION: # Old save
+                data = self.convertData(data, ver)
+                # Update the version
+                data['version'] = self.SAVEVERSION
+                self.store_resets = set(self.STORE_SECTIONS)
+            elif ver > self.SAVEVERSION: # Version is more recent??
+                raise Exception("Save file version higher than the expected version")
+            # Do an extra conversions in checkData
+            data = self.checkData(data)
+            # Note: sections missing from the Drive are always considered dirty, see serializeShards()
+            self.dirty = set()
+            # Replay the changes made since this snapshot
+            self.replayJournal(data)
+            if self.store is not None:
+                os.makedirs(self.SAVE_FOLDER, exist_ok=True)
+                self.store.open()
+            self.save = data
+            self.computeJournal(record=False)
+            self.pending = False
+            return True
         except Exception as e:
             self.bot.logger.pushError("[DATA] In `loadData`:", e)
             return False
 
-    """saveData()
-    Write save.json.
+    """replayJournal()
+    Apply the entries of the journal file more recent than the given save data.
+    For the sections loaded from the store, the entries more recent than the store are applied.
+    An incomplete entry (after a crash for example) stops the replay.
+
+    Parameters
+    --------
+    data: Dict, the save data to update
+    """
+    def replayJournal(self : Data, data : JSON) -> None:
+        self.journal = []
+        self.journal_written = 0
+        if not os.path.isfile(self.JOURNAL_FILE):
+            return
+        count : int = 0
+        with open(self.JOURNAL_FILE, mode="r", encoding="utf-8") as f:
+            line : str
+            for line in f:
+                try:
+                    entry : JSON = json.loads(line)
+                except Exception:
+                    break
+                if entry['s'] not in self.BASE_SAVE:
+                    continue # deprecated section
+                stored : bool = entry['s'] in self.STORE_SECTIONS and entry['s'] not in self.store_resets
+                if entry['i'] <= (self.store_journal if stored else data['journal']):
+                    continue # already in the snapshot
+                node : str|dict|None = schema.child(self.SAVE_SCHEMA, entry['s'])
+                if 'k' in entry:
+                    key : str = entry['k']
+                    if not isinstance(data[entry['s']], dict):
+                        data[entry['s']] = {}
+                    if 'v' in entry:
+                        self.trackStoreChange(
+                            entry['s'],
+                            key,
+                            json.dumps(entry['v'], separators=(',', ':'))
+                        )
+                        data[entry['s']][key] = schema.decode(entry['v'], schema.child(node, key))
+                    else:
+                        self.trackStoreChange(entry['s'], key, None)
+                        data[entry['s']].pop(key, None)
+                else:
+                    self.trackStoreChange(entry['s'], None, None)
+                    data[entry['s']] = schema.decode(entry['v'], node)
+                data['journal'] = max(data['journal'], entry['i'])
+                self.dirty.add(entry['s'])
+                self.journal.append(line.rstrip('\n'))
+                if self.store is not None and entry['s'] in self.STORE_SECTIONS:
+                    self.store_entries.append(self.journal[-1])
+                count += 1
+        self.journal_written = len(self.journal)
+        if count > 0:
+            self.bot.logger.push(f"[DATA] {count} journal entries replayed", send_to_discord=False)
+
+    """touch()
+    Flag a key of a tracked section as modified.
+    Must be called after each modification inside the values of the TRACKED_SECTIONS, instead of setting pending.
+    Keys set or deleted directly are recorded by TrackedDict, this only sets pending for those.
+
+    Parameters
+    --------
+    section: String, save section
+    key: String (Optional), modified or deleted key. None if the whole section changed.
+    """
+    def touch(self : Data, section : str, key : str|None = None) -> None:
+        if key is None:
+            self.touched[section] = None
+        elif section not in self.touched:
+            self.touched[section] = {key}
+        elif self.touched[section] is not None:
+            self.touched[section].add(key)
+        self.pending = True
+
+    """computeJournal()
+    Compare the save data with its state as of the last journal entry.
+    Changes are added to the journal, per section or per key for dict sections.
+    The TRACKED_SECTIONS aren't compared, only their keys recorded by TrackedDict or set by touch() are added.
+    Must be called from the event loop thread.
+
+    Parameters
+    --------
+    record: Boolean, set to False to only update the reference state
+    serialized: Dict (Optional), the serialized sections will be set in it, to be reused by serializeShards()
+
+    Returns
+    --------
+    int: Number of new entries
+    """
+    def computeJournal(self : Data, record : bool = True, serialized : dict[str, str]|None = None) -> int:
+        state : dict[str, int|dict[str, int]|bool] = {}
+        count : int = 0
+        section : str
+        value : JSON
+        ser : str
+        touched : dict[str, set[str]|None] = self.touched
+        self.touched = {}
+        for section, value in self.save.items():
+            if section in self.META_KEYS:
+                continue
+            if section in self.TRACKED_SECTIONS and isinstance(value, dict):
+                state[section] = True
+                keys : set[str]|None = touched.get(section, set())
+                if not isinstance(value, TrackedDict): # new or replaced section
+                    value = TrackedDict(value)
+                    self.save[section] = value
+                    keys = None
+                elif value.touched is None:
+                    keys = None
+                elif keys is not None:
+                    keys.update(value.touched)
+                value.touched = set()
+                if not record:
+                    continue
+                if keys is None or self.journal_state.get(section, None) is not True: # the whole section is added
+                    ser = json.dumps(value, separators=(',', ':'), default=self.bot.util.json_serial)
+                    count += self.addJournalEntry(section, None, ser)
+                    if serialized is not None:
+                        serialized[section] = ser
+                else:
+                    key : str
+                    for key in keys:
+                        if key in value:
+                            count += self.addJournalEntry(
+                                section,
+                                key,
+                                json.dumps(value[key], separators=(',', ':'), default=self.bot.util.json_serial)
+                            )
+                        else: # deleted key
+                            count += self.addJournalEntry(section, key, None)
+                continue
+            if isinstance(value, dict):
+                prev : int|dict[str, int]|None = self.journal_state.get(section, None)
+                current : dict[str, int] = {}
+                parts : list[str] = []
+                k : str|int
+                v : JSON
+                for k, v in value.items():
+                    if not isinstance(k, str):
+                        k = str(k)
+                    ser = json.dumps(v, separators=(',', ':'), default=self.bot.util.json_serial)
+                    parts.append(json.dumps(k) + ':' + ser)
+                    current[k] = hash(ser)
+                    if record and isinstance(prev, dict) and prev.get(k, None) != current[k]:
+                        count += self.addJournalEntry(section, k, ser)
+                ser = '{' + ','.join(parts) + '}' # same as json.dumps() of the whole section
+                if not isinstance(prev, dict): # new section or type change, the whole section is added
+                    if record:
+                        count += self.addJournalEntry(section, None, ser)
+                elif record:
+                    for k in prev:
+                        if k not in current: # deleted key
+                            count += self.addJournalEntry(section, k, None)
+                state[section] = current
+            else:
+                ser = json.dumps(value, separators=(',', ':'), default=self.bot.util.json_serial)
+                state[section] = hash(ser)
+                if record and self.journal_state.get(section, None) != state[section]:
+                    count += self.addJournalEntry(section, None, ser)
+            if serialized is not None:
+                serialized[section] = ser
+        self.journal_state = state
+        return count
+
+    """addJournalEntry()
+    Add an entry to the journal
+
+    Parameters
+    --------
+    section: String, save section
+    key: String (Optional), key of a dict section
+    ser: String (Optional), serialized value. None to delete the key.
+
+    Returns
+    --------
+    int: 1
+    """
+    def addJournalEntry(self : Data, section : str, key : str|None, ser : str|None) -> int:
+        self.save['journal'] += 1
+        self.dirty.add(section)
+        self.change_count[section] += 1
+        if key is not None:
+            self.change_count[section + "/" + key] += 1
+        entry : str = '{"i":' + str(self.save['journal']) + ',"s":' + json.dumps(section)
+        if key is not None:
+            entry += ',"k":' + json.dumps(key)
+        if ser is not None:
+            entry += ',"v":' + ser
+        entry += '}'
+        self.journal.append(entry)
+        if self.store is not None and section in self.STORE_SECTIONS:
+            self.store_entries.append(entry)
+        self.trackStoreChange(section, key, ser)
+        return 1
+
+    """trackStoreChange()
+    Record a change to write to the SQLite store, if enabled
+
+    Parameters
+    --------
+    section: String, save section
+    key: String (Optional), modified key. None if the whole section changed.
+    ser: String (Optional), serialized value. None to delete the key.
+    """
+    def trackStoreChange(self : Data, section : str, key : str|None, ser : str|None) -> None:
+        if self.store is None or section not in self.STORE_SECTIONS:
+            return
+        if key is None:
+            self.store_resets.add(section)
+        else:
+            self.store_changes.setdefault(section, {})[key] = ser
+
+    """writeJournal()
+    Append entries to the journal file and upload it to the Google Drive.
+    Can run in a worker thread.
+
+    Parameters
+    --------
+    entries: List of entries to write
 
     Returns
     --------
     bool: True on success, False on failure
     """
-    def saveData(self : Data) -> bool: # saving (lock isn't used, use it outside!)
-        if self.debug: # don't save in debug mode
+    def writeJournal(self : Data, entries : list[str]) -> bool:
+        try:
+            with open(self.JOURNAL_FILE, mode="a", encoding="utf-8") as f:
+                f.write("\n".join(entries) + "\n")
+            # Note: entries can be written twice on upload failure, which is harmless
+            if self.bot.drive.overwriteFile(
+                self.JOURNAL_FILE,
+                "text/plain",
+                self.JOURNAL_FILE,
+                self.config['tokens']['drive']
+            ) is not True:
+                raise Exception("Couldn't upload the journal to google drive")
+            return True
+        except Exception as e:
+            self.bot.logger.pushError("[DATA] An error occured while writing the journal:", e, send_to_discord=False)
+            return False
+
+    """clearJournal()
+    Empty the journal, after a successful snapshot.
+    Can run in a worker thread.
+
+    Parameters
+    --------
+    entries: List of entries to keep, those of the store sections if the store hasn't been uploaded
+
+    Returns
+    --------
+    bool: True on success, False on failure
+    """
+    def clearJournal(self : Data, entries : list[str]) -> bool:
+        try:
+            if len(entries) > 0:
+                if os.path.isfile(self.JOURNAL_FILE):
+                    os.remove(self.JOURNAL_FILE)
+                return self.writeJournal(entries)
+            if os.path.isfile(self.JOURNAL_FILE):
+                os.remove(self.JOURNAL_FILE)
+            # Note: if it fails, the remaining entries are ignored on load anyway
+            self.bot.drive.delFile(self.JOURNAL_FILE, self.config['tokens']['drive'])
             return True
+        except Exception as e:
+            self.bot.logger.pushError("[DATA] An error occured while clearing the journal:", e, send_to_discord=False)
+            return False
+
+    """flushJournal()
+    Coroutine adding the latest changes to the journal and writing them.
+    Much lighter than a full save.
+    """
+    async def flushJournal(self : Data) -> None:
+        if self.autosaving or self.debug:
+            return
+        self.autosaving = True
+        try:
+            t : float = time.perf_counter()
+            count : int = self.computeJournal()
+            self.pending = False
+            if len(self.journal) > self.journal_written:
+                size : int = len(self.journal)
+                if await asyncio.to_thread(self.writeJournal, self.journal[self.journal_written:size]):
+                    self.journal_written = size
+                    self.bot.logger.push(
+                        f"[DATA] {count} journal entries flushed in {time.perf_counter() - t:.3f}s",
+                        send_to_discord=False
+                    )
+                else: # the entries might be lost, so a snapshot is required on exit
+                    self.pending = True
+        except Exception as e:
+            self.pending = True
+            self.bot.logger.pushError("[DATA] 'flushJournal' Error:", e)
+        self.autosaving = False
+
+    """serializeData()
+    Serialize the save data to a JSON string.
+    Must be called from the event loop thread, as the data can be modified by any coroutine.
+
+    Returns
+    --------
+    str: The serialized data
+    """
+    def serializeData(self : Data) -> str:
+        return json.dumps(self.save, separators=(',', ':'), default=self.bot.util.json_serial)
+
+    """serializeShards()
+    Serialize the sections modified since the last snapshot.
+    Sections missing from the Google Drive are included too.
+    Must be called from the event loop thread.
+
+    Parameters
+    --------
+    serialized: Dict (Optional), sections already serialized by computeJournal(), since the last modification
+
+    Returns
+    --------
+    tuple:
+        dict: Section names and their serialized shard
+        dict: The manifest
+    """
+    def serializeShards(self : Data, serialized : dict[str, str]|None = None) -> tuple[dict[str, str], JSON]:
+        shards : dict[str, str] = {}
+        manifest : JSON = {k : self.save[k] for k in self.META_KEYS}
+        manifest['sections'] = []
+        if self.store is not None:
+            manifest['store'] = []
+        section : str
+        value : JSON
+        for section, value in self.save.items():
+            if section in self.META_KEYS:
+                continue
+            if self.store is not None and section in self.STORE_SECTIONS and isinstance(value, dict):
+                manifest['store'].append(section)
+                continue
+            manifest['sections'].append(section)
+            if section in self.dirty or section not in self.bot.drive.shards:
+                shards[section] = (
+                    '{' + json.dumps(section) + ':'
+                    + (
+                        serialized[section] if serialized is not None and section in serialized
+                        else json.dumps(value, separators=(',', ':'), default=self.bot.util.json_serial)
+                    )
+                    + '}'
+                )
+        return shards, manifest
+
+    """serializeStore()
+    Serialize the store rows modified since the last snapshot.
+    The pending changes are cleared, see restoreStore().
+    Must be called from the event loop thread.
+
+    Returns
+    --------
+    tuple:
+        dict: Per section, keys and their serialized value (None values are deleted keys)
+        set: Sections to rewrite entirely
+    """
+    def serializeStore(self : Data) -> tuple[dict[str, dict[str, str|None]], set[str]]:
+        if self.store is None:
+            return {}, set()
+        changes : dict[str, dict[str, str|None]] = self.store_changes
+        resets : set[str] = self.store_resets
+        self.store_changes = {}
+        self.store_resets = set()
+        section : str
+        for section in resets:
+            value : JSON = self.save.get(section, None)
+            if isinstance(value, dict):
+                k : str|int
+                v : JSON
+                changes[section] = {
+                    str(k) : json.dumps(v, separators=(',', ':'), default=self.bot.util.json_serial)
+                    for k, v in value.items()
+                }
+            else: # not stored, see serializeShards()
+                changes[section] = {}
+        return changes, resets
+
+    """needStoreUpload()
+    Check if the store must be uploaded with the next snapshot.
+    It's uploaded every SNAPSHOT_INTERVAL, its changes are kept in the journal in between.
+
+    Parameters
+    --------
+    resets: Set, sections returned by serializeStore()
+
+    Returns
+    --------
+    bool: True if it must be uploaded
+    """
+    def needStoreUpload(self : Data, resets : set[str]) -> bool:
+        if self.store is None:
+            return False
+        elif len(resets) > 0 or self.bot.drive.store is None: # rows missing from the Google Drive
+            return True
+        return len(self.store_entries) > 0 and (
+            time.monotonic() - self.last_store_upload >= self.SNAPSHOT_INTERVAL
+            or len(self.store_entries) >= self.JOURNAL_LIMIT // 2 # to not fill the journal
+        )
+
+    """restoreStore()
+    Put back store changes which failed to be saved.
+    Changes made since then take precedence.
+
+    Parameters
+    --------
+    changes: Dict, changes returned by serializeStore()
+    resets: Set, sections returned by serializeStore()
+    """
+    def restoreStore(self : Data, changes : dict[str, dict[str, str|None]], resets : set[str]) -> None:
+        self.store_resets.update(resets)
+        section : str
+        rows : dict[str, str|None]
+        for section, rows in changes.items():
+            if section in resets:
+                continue # will be serialized again
+            current : dict[str, str|None] = self.store_changes.setdefault(section, {})
+            k : str
+            v : str|None
+            for k, v in rows.items():
+                current.setdefault(k, v)
+
+    """writeData()
+    Write the modified save shards, the store rows and the manifest locally, then upload them to the Google Drive.
+    The local files are written atomically, the manifest last.
+    The store is uploaded as a compacted copy, if requested (see needStoreUpload()).
+    Doesn't access self.save, so it can run in a worker thread.
+
+    Parameters
+    --------
+    shards: Dict, the serialized shards to write
+    manifest: Dict, the manifest
+    timings: Dict, the duration of each step will be set in it
+    changes: Dict (Optional), the store rows to write
+    resets: Set (Optional), the store sections to rewrite entirely
+    upload_store: Boolean, True to upload the store
+
+    Returns
+    --------
+    bool: True on success, False on failure
+    """
+    def writeData(
+        self : Data,
+        shards : dict[str, str],
+        manifest : JSON,
+        timings : dict[str, float],
+        changes : dict[str, dict[str, str|None]]|None = None,
+        resets : set[str]|None = None,
+        upload_store : bool = False
+    ) -> bool:
+        t : float = time.perf_counter()
+        compacted : str|None = None
         try:
-            with open('save.json', mode='w', encoding="utf-8") as outfile: # save to json locally first
-                json.dump(self.save, outfile, separators=(',', ':'), default=self.bot.util.json_serial)
+            # save locally first, in temporary files to not corrupt the existing ones
+            os.makedirs(self.SAVE_FOLDER, exist_ok=True)
+            path : str
+            section : str
+            data : str
+            for section, data in shards.items():
+                path = os.path.join(self.SAVE_FOLDER, section + ".json")
+                with open(path + ".tmp", mode='w', encoding="utf-8") as outfile:
+                    outfile.write(data)
+                os.replace(path + ".tmp", path)
+            # then the store rows, in a single transaction
+            if 'store' in manifest:
+                if changes or resets:
+                    self.store.write(changes or {}, resets or set())
+                if upload_store:
+                    compacted = self.STORE_FILE + ".compact"
+                    self.store.compact(compacted)
+            # the manifest is written last
+            with open(self.MANIFEST_FILE + ".tmp", mode='w', encoding="utf-8") as outfile:
+                json.dump(manifest, outfile)
+            os.replace(self.MANIFEST_FILE + ".tmp", self.MANIFEST_FILE)
+            timings['write'] = time.perf_counter() - t
         except Exception as e:
             self.bot.logger.pushError("[DATA] An error occured with the local save data:", e)
             return False # return to not upload a corrupt file
         # Now save remotely
         try:
-            if self.bot.drive.save(
-                json.dumps(
-                    self.save, separators=(',', ':'),
-                    default=self.bot.util.json_serial
-                )
-            ) is not True: # sending to the google drive
+            # sending to the google drive
+            if self.bot.drive.saveShards(shards, manifest, timings, compacted) is not True:
                 raise Exception("Couldn't save to google drive")
             return True
         except Exception as e:
             if str(e) != "Couldn't save to google drive":
                 self.bot.logger.pushError("[DATA] An error occured while saving the data:", e)
             return False
+        finally:
+            if compacted is not None and os.path.isfile(compacted):
+                os.remove(compacted)
+
+    """logSaveTimings()
+    Log the duration of each step of a save
+
+    Parameters
+    --------
+    shards: Dict, the written shards
+    timings: Dict, durations set during the save
+    changes: Dict (Optional), the written store rows
+    """
+    def logSaveTimings(
+        self : Data,
+        shards : dict[str, str],
+        timings : dict[str, float],
+        changes : dict[str, dict[str, str|None]]|None = None
+    ) -> None:
+        self.bot.logger.push(
+            "[DATA] Saved {} shard(s) ({}) and {} store row(s). Timings: {}".format(
+                len(shards),
+                ", ".join(shards.keys()),
+                sum(len(rows) for rows in (changes or {}).values()),
+                ", ".join(f"{k} {v:.3f}s" for k, v in timings.items())
+            ),
+            send_to_discord=False
+        )
+
+    """saveData()
+    Write the save shards and upload them, synchronously.
+    Used when exiting, autosave() should be used otherwise.
+
+    Returns
+    --------
+    bool: True on success, False on failure
+    """
+    def saveData(self : Data) -> bool: # saving (lock isn't used, use it outside!)
+        if self.debug: # don't save in debug mode
+            return True
+        timings : dict[str, float] = {}
+        t : float = time.perf_counter()
+        shards : dict[str, str]
+        manifest : JSON
+        changes : dict[str, dict[str, str|None]]
+        resets : set[str]
+        try:
+            serialized : dict[str, str] = {}
+            self.computeJournal(serialized=serialized) # to keep the journal sequence and dirty sections up to date
+            shards, manifest = self.serializeShards(serialized)
+            changes, resets = self.serializeStore()
+            upload_store : bool = self.needStoreUpload(resets)
+            timings['serialize'] = time.perf_counter() - t
+        except Exception as e:
+            self.bot.logger.pushError("[DATA] An error occured while serializing the data:", e)
+            return False
+        result : bool = self.writeData(shards, manifest, timings, changes, resets, upload_store)
+        self.logSaveTimings(shards, timings, changes)
+        if not result:
+            self.restoreStore(changes, resets)
+        else:
+            self.dirty.difference_update(shards.keys())
+            self.dirty.difference_update(manifest.get('store', []))
+            if upload_store:
+                self.store_entries = []
+                self.last_store_upload = time.monotonic()
+            # the entries of the store sections are kept until the store is uploaded
+            self.journal = self.store_entries.copy()
+            self.journal_written = 0
+            self.last_snapshot = time.monotonic()
+            if self.clearJournal(self.journal):
+                self.journal_written = len(self.journal)
+        return result
 
     """checkData()
     Fill the save data with missing keys, if any
@@ -368,8 +1101,9 @@ class Data():
         return data
 
     """autosave()
-    Write save.json. Called periodically by statustask()
-    The file is also sent to the google drive or to discord if it failed
+    Make a snapshot of the save data. Called periodically by journaling()
+    Only the modified shards are written and sent to the google drive.
+    A copy is sent to discord if it failed
 
     Parameters
     --------
@@ -380,31 +1114,80 @@ class Data():
             return
         self.autosaving = True # raise flag
         result : bool = False
-        i : int
-        for i in range(0, 3): # try a few times to save the data
-            if self.saveData():
-                self.pending = False # unraise pending flag
-                result = True # success
-                break
-            await asyncio.sleep(0)
+        timings : dict[str, float] = {}
+        try:
+            # serialize once, in the event loop
+            t : float = time.perf_counter()
+            serialized : dict[str, str] = {}
+            self.computeJournal(serialized=serialized) # to keep the journal sequence and dirty sections up to date
+            shards : dict[str, str]
+            manifest : JSON
+            shards, manifest = self.serializeShards(serialized)
+            changes : dict[str, dict[str, str|None]]
+            resets : set[str]
+            changes, resets = self.serializeStore()
+            upload_store : bool = self.needStoreUpload(resets)
+            timings['serialize'] = time.perf_counter() - t
+            # unraise pending flag now, so changes made during the upload will be caught by the next save
+            self.pending = False
+            i : int
+            for i in range(0, 3): # try a few times to save the data
+                # write, compress and upload in a worker thread
+                if await asyncio.to_thread(self.writeData, shards, manifest, timings, changes, resets, upload_store):
+                    result = True # success
+                    break
+            self.logSaveTimings(shards, timings, changes)
+            if not result:
+                self.restoreStore(changes, resets)
+            else: # the snapshot contains all the journal entries
+                self.dirty.difference_update(shards.keys())
+                self.dirty.difference_update(manifest.get('store', []))
+                if upload_store:
+                    self.store_entries = []
+                    self.last_store_upload = time.monotonic()
+                # the entries of the store sections are kept until the store is uploaded
+                self.journal = self.store_entries.copy()
+                self.journal_written = 0
+                self.last_snapshot = time.monotonic()
+                if await asyncio.to_thread(self.clearJournal, self.journal):
+                    self.journal_written = len(self.journal)
+        except Exception as e:
+            self.bot.logger.pushError("[DATA] 'autosave' Error:", e)
         if not result: # no success
+            self.pending = True
             await self.bot.send('debug', embed=self.bot.embed(title="Failed Save", timestamp=self.bot.util.UTC()))
             discordDump = True
         if discordDump: # if this is raised, we send a copy of the save file to discord, in the debug channel
             try:
-                with BytesIO(
-                    json.dumps(
-                        self.save,
-                        separators=(',', ':'),
-                        default=self.bot.util.json_serial
-                    ).encode('utf-8')
-                ) as infile:
+                with BytesIO(self.serializeData().encode('utf-8')) as infile:
                     with self.bot.file.discord(infile, filename="save.json") as df:
                         await self.bot.send('debug', file=df)
             except Exception as e:
                 self.bot.logger.pushError("[DATA] 'autosave' Dump Error:", e)
         self.autosaving = False
 
+    """journaling()
+    Bot Task managing the autosave.
+    Changes are flushed to the journal frequently and a full snapshot is made at a slower pace.
+    """
+    async def journaling(self : Data) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.JOURNAL_INTERVAL)
+                if not self.bot.running:
+                    continue
+                if ((self.pending or len(self.journal) > 0)
+                        and (len(self.journal) >= self.JOURNAL_LIMIT
+                        or time.monotonic() - self.last_snapshot >= self.SNAPSHOT_INTERVAL)):
+                    await self.autosave()
+                elif self.pending or len(self.journal) > self.journal_written:
+                    await self.flushJournal()
+            except asyncio.CancelledError:
+                self.bot.logger.push("[TASK] 'data:journal' Task Cancelled")
+                return
+            except Exception as e:
+                self.bot.logger.pushError("[TASK] 'data:journal' Task Error:", e)
+
     """maintenance()
     Bot Task managing the autocleanup of the save data and other routines
     """
@@ -434,7 +1217,7 @@ class Data():
                     continue
                 target_time += timedelta(days=1) # move target_time to next day
                 self.bot.logger.push("[TASK] 'data:maintenance': Daily cleanup started", send_to_discord=False)
-                # empty GW crew cache
+                # clean up the GW crew cache
                 if not first_loop:
                     try:
                         self.bot.get_cog('GuildWar').clearCrewCache()
@@ -555,7 +1338,8 @@ class Data():
                     "where":"time_start > CURRENT_TIMESTAMP OR time_end > CURRENT_TIMESTAMP",
                     "format":"json",
                     "order by":"time_start"
-                }
+                },
+                cache="schedule"
             )
             if data is not None:
                 new_events : JSON = {}
@@ -648,17 +1432,15 @@ class Data():
         count : int = 0
         await asyncio.sleep(1)
         keys : list[str] = list(self.save['gbfids'].keys())
+        # check the membership of the registered users in every guild the bot is present in
+        await self.bot.members.update(keys)
         # go over registered profiles
         uid : str
         for uid in keys:
-            found : bool = False
-            for g in self.bot.guilds: # check if the user is in any guild the bot is present in
-                if await g.get_or_fetch_member(int(uid)) is not None:
-                    found = True
-                    break
-            if not found: # if the user hasn't been found
+            if not self.bot.members.isMember(uid): # if the user hasn't been found
                 count += 1
                 self.save['gbfids'].pop(uid) # remove
+                self.touch('gbfids', uid)
         if count > 0:
             self.pending = True
 
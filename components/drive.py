@@ -6,10 +6,12 @@ from pydrive2.auth import GoogleAuth
 from pydrive2.drive import GoogleDrive
 from pydrive2.files import GoogleDriveFile
 from datetime import datetime
+from components import codec
 import io
 import os
-import gzip
-import lzma
+import json
+import time
+import threading
 from enum import IntEnum
 
 
@@ -26,9 +28,16 @@ class AuthType(IntEnum):
 
 
 class Drive():
-    ZIP_CHUNK : int = 8192
+    MANIFEST_FILE : str = "save.manifest"
+    SHARD_PREFIX : str = "save_" # save shards are named save_<section>_<timestamp>.<codec extension>
+    STORE_PREFIX : str = "store_" # compacted save stores are named store_<timestamp>.<codec extension>
+    BACKUP_PREFIX : str = "backup_" # previous manifests are kept as backup_<date>.manifest, with the files they use
+    BACKUP_LIMIT : int = 10 # number of backups kept in the save folder
 
-    __slots__ = ("bot", "debug", "gauth", "gdrive", "auth_type")
+    __slots__ = (
+        "bot", "debug", "gauth", "gdrive", "auth_type", "lock",
+        "shards", "store", "store_journal", "manifest", "backups", "index"
+    )
 
     def __init__(self : Drive, bot : DiscordBot) -> None:
         self.bot : DiscordBot = bot
@@ -36,6 +45,21 @@ class Drive():
         self.gauth : GoogleAuth|None = None
         self.gdrive : GoogleDrive|None = None
         self.auth_type : AuthType
+        # pydrive2 objects aren't thread safe and the save file is uploaded from a worker thread
+        # so every Drive access goes through this lock
+        self.lock : threading.RLock = threading.RLock()
+        # save shard file names on the drive, per section, as of the last manifest
+        self.shards : dict[str, str] = {}
+        # save store file name on the drive, as of the last manifest
+        self.store : str|None = None
+        # journal sequence number of this save store, it's uploaded less often than the shards
+        self.store_journal : int = 0
+        # content of the manifest on the drive, None if the save isn't sharded yet
+        self.manifest : str|None = None
+        # file names used by each backup, see backupFiles()
+        self.backups : dict[str, set[str]] = {}
+        # cached file list of each folder: folder id -> file title -> file
+        self.index : dict[str, dict[str, GoogleDriveFile]] = {}
         if os.path.isfile("service-secrets.json"):
             self.bot.logger.push(
                 (
@@ -127,180 +151,358 @@ class Drive():
                 send_to_discord=False
             )
 
-    """decompressJSON_gzip()
-    Decompress the given byte array (which must be valid compressed gzip data) and return the decoded text (utf-8).
-    Legacy code for compatibility with very old MizaBOT saves. It shoudn't be needed anymore.
+    """listFolder()
+    Return the files of a folder, per title.
+    The result is cached and kept up to date by the other methods,
+    so the folder is only queried on the first call, after an error or if refresh is set.
+    The lock must be held.
 
     Parameters
+    ----------
+    folder: Google Drive Folder ID
+    refresh: Boolean, set to True to force a query
+
+    Returns
     --------
-    inputBytes: data to decompress
+    dict: File titles and their GoogleDriveFile
+    """
+    def listFolder(self : Drive, folder : str, refresh : bool = False) -> dict[str, GoogleDriveFile]:
+        if refresh or folder not in self.index:
+            self.index[folder] = {
+                f['title'] : f
+                for f in self.gdrive.ListFile({'q': "'" + folder + "' in parents and trashed=false"}).GetList()
+            }
+        return self.index[folder]
+
+    """createFile()
+    Upload a new file to a folder and add it to the folder index.
+    The lock must be held.
+
+    Parameters
+    ----------
+    stream: Binary stream, the file content
+    mime: File mime type
+    name: File name
+    folder: Google Drive Folder ID
 
     Returns
     --------
-    str: Decompressed string
+    GoogleDriveFile: The uploaded file
     """
-    def decompressJSON_gzip(self : Drive, inputBytes : bytes|str) -> str|None:
-        with io.BytesIO() as bio:
-            with io.BytesIO(inputBytes) as stream:
-                decompressor = gzip.GzipFile(fileobj=stream, mode='r')
-                while True:
-                    chunk : bytes = decompressor.read(self.ZIP_CHUNK) # decompress the next chunk
-                    if not chunk: # we reached EOF
-                        decompressor.close()
-                        bio.seek(0) # go back to BytesIO beginning
-                        return bio.read().decode("utf-8") # read its content, decode and return
-                    # write decompressed chunk to BytesIO
-                    bio.write(chunk)
-                return None
+    def createFile(self : Drive, stream : io.IOBase, mime : str, name : str, folder : str) -> GoogleDriveFile:
+        s : GoogleDriveFile = self.gdrive.CreateFile(
+            {'title':name, 'mimeType':mime, "parents": [{"kind": "drive#file", "id": folder}]}
+        )
+        s.content = stream
+        s.Upload()
+        self.listFolder(folder)[name] = s
+        return s
+
+    """renameFile()
+    Rename a file and update the folder index.
+    The lock must be held.
+
+    Parameters
+    ----------
+    s: The file to rename
+    folder: Google Drive Folder ID
+    new: New file name
+    """
+    def renameFile(self : Drive, s : GoogleDriveFile, folder : str, new : str) -> None:
+        files : dict[str, GoogleDriveFile] = self.listFolder(folder)
+        files.pop(s['title'], None)
+        s['title'] = new
+        s.Upload()
+        files[new] = s
 
-    """decompressJSON()
-    Decompress the given byte array (which must be valid compressed lzma data) and return the decoded text (utf-8).
+    """deleteFile()
+    Delete a file and remove it from the folder index.
+    The lock must be held.
 
     Parameters
-    --------
-    inputBytes: data to decompress
+    ----------
+    s: The file to delete
+    folder: Google Drive Folder ID
+    """
+    def deleteFile(self : Drive, s : GoogleDriveFile, folder : str) -> None:
+        s.Delete()
+        self.listFolder(folder).pop(s['title'], None)
+
+    """manifestFiles()
+    Return the file names used by a manifest
+
+    Parameters
+    ----------
+    remote: Dict, the manifest (as stored on the drive)
 
     Returns
     --------
-    str: Decompressed string
+    set: The shard and store file names
     """
-    def decompressJSON(self : Drive, inputBytes : bytes|str) -> str|None:
-        with io.BytesIO() as bio:
-            with io.BytesIO(inputBytes) as stream:
-                decompressor = lzma.LZMADecompressor()
-                while not decompressor.eof:
-                    chunk : bytes = decompressor.decompress(
-                        stream.read(self.ZIP_CHUNK),
-                        max_length=self.ZIP_CHUNK
-                    ) # decompress the next chunk
-                    if decompressor.eof: # we reached EOF
-                        if len(chunk) > 0:
-                            bio.write(chunk)
-                        bio.seek(0) # go back to BytesIO beginning
-                        return bio.read().decode("utf-8") # read its content, decode and return
-                    # write decompressed chunk to BytesIO
-                    bio.write(chunk)
-                return None
+    def manifestFiles(self : Drive, remote : dict) -> set[str]:
+        names : set[str] = set(remote['shards'].values())
+        if 'store' in remote:
+            names.add(remote['store']['file'])
+        return names
 
-    """compressJSON()
-    Read the given string, encode it in utf-8, compress the data and return it as a byte array.
-    json.dumps() must have been used before this function.
+    """backupFiles()
+    Return the file names used by a backup.
+    The backup manifest is downloaded the first time.
+    The lock must be held.
 
     Parameters
+    ----------
+    files: The save folder files, per title
+    name: The backup file name
+
+    Returns
     --------
-    inputString: data to compress
+    set: The shard and store file names. Empty for legacy single file backups.
+    """
+    def backupFiles(self : Drive, files : dict[str, GoogleDriveFile], name : str) -> set[str]:
+        if name not in self.backups:
+            if name.endswith(".manifest"):
+                self.backups[name] = self.manifestFiles(json.loads(files[name].GetContentString()))
+            else:
+                self.backups[name] = set()
+        return self.backups[name]
+
+    """rotateBackups()
+    Delete the oldest backups of a folder, to keep only the BACKUP_LIMIT newest ones.
+    The lock must be held.
+
+    Parameters
+    ----------
+    folder: Google Drive Folder ID
 
     Returns
     --------
-    bytes: Compressed string
+    list: The names of the kept backups
     """
-    def compressJSON(self : Drive, inputString : str) -> bytes:
-        with io.BytesIO() as bio:
-            bio.write(inputString.encode("utf-8")) # set binary content
-            bio.seek(0) # go to beginning
-            buffers : list[bytes] = []
-            compressor = lzma.LZMACompressor()
-            while True:
-                chunk : bytes = bio.read(self.ZIP_CHUNK) # read a chunk
-                if not chunk: # EOF
-                    buffers.append(compressor.flush()) # flush to finish
-                    return b"".join(buffers) # return joined compressed result
-                buffers.append(compressor.compress(chunk)) # add compressed chunk
+    def rotateBackups(self : Drive, folder : str) -> list[str]:
+        # backup names contain their date, so they can be sorted by name
+        backups : list[str] = sorted(
+            (name for name in self.listFolder(folder) if name.startswith(self.BACKUP_PREFIX)),
+            reverse=True
+        )
+        name : str
+        for name in backups[self.BACKUP_LIMIT:]:
+            self.deleteFile(self.index[folder][name], folder)
+            self.backups.pop(name, None)
+        return backups[:self.BACKUP_LIMIT]
 
     """load()
-    Download save.json
+    Download the save data and its change journal.
+    The save shards listed in the manifest are decompressed in the save folder.
+    Legacy single file saves are decompressed to save.json.
 
     --------
     bool: True if success, False if failure
     """
     def load(self : Drive) -> bool:
-        try:
-            self.refresh_token()
-            file_list : list[GoogleDriveFile] = self.gdrive.ListFile(
-                {'q': "'" + self.bot.data.config['tokens']['drive'] + "' in parents and trashed=false"}
-            ).GetList() # get the file list in our folder
-            # search the save file
-            s : GoogleDriveFile
-            for s in file_list: # iterate until we find a compressed save
-                match s['title']:
-                    case "save.gzip": # legacy compatibility for .gzip
-                        s.GetContentFile(s['title']) # download
-                        with open("save.gzip", "rb") as stream: # read file
-                            with open("save.json", "w") as out: # and uncompress
-                                out.write(self.decompressJSON_gzip(stream.read()))
-                        os.remove("save.gzip") # delete compressed version
+        with self.lock:
+            folder : str = self.bot.data.config['tokens']['drive']
+            try:
+                self.refresh_token()
+                # always refresh the index of the save folder when loading
+                files : dict[str, GoogleDriveFile] = self.listFolder(folder, refresh=True)
+                # retrieve the change journal, it will be replayed in Data.loadData()
+                if os.path.isfile(self.bot.data.JOURNAL_FILE):
+                    os.remove(self.bot.data.JOURNAL_FILE)
+                if self.bot.data.JOURNAL_FILE in files:
+                    files[self.bot.data.JOURNAL_FILE].GetContentFile(self.bot.data.JOURNAL_FILE)
+                # remove the local manifest, it will be replaced if the save is sharded
+                if os.path.isfile(self.bot.data.MANIFEST_FILE):
+                    os.remove(self.bot.data.MANIFEST_FILE)
+                # search the manifest
+                if self.MANIFEST_FILE in files:
+                    return self.loadShards(files)
+                self.shards = {}
+                self.store = None
+                self.manifest = None
+                # search the save file
+                name : str
+                for name in ("save.gzip", "save.lzma"): # legacy single file saves
+                    if name in files:
+                        files[name].GetContentFile(name) # download
+                        codec.decompress_file(name, "save.json") # and uncompress
+                        os.remove(name) # delete compressed version
                         return True
-                    case "save.lzma":
-                        s.GetContentFile(s['title']) # download
-                        with open("save.lzma", "rb") as stream: # read file
-                            with open("save.json", "w") as out: # and uncompress
-                                out.write(self.decompressJSON(stream.read()))
-                        os.remove("save.lzma") # delete compressed version
-                        return True
-            # fallback, legacy compatibility for uncompressed.json
-            for s in file_list:
-                if s['title'] == "save.json":
-                    s.GetContentFile(s['title']) # download
+                # fallback, legacy compatibility for uncompressed.json
+                if "save.json" in files:
+                    files["save.json"].GetContentFile("save.json") # download
                     return True
-            # not found
-            return False
-        except Exception as e:
-            self.bot.logger.pushError("[DRIVE] Failed to load 'save.json':", e, send_to_discord=False)
-            return False
+                # not found
+                return False
+            except Exception as e:
+                self.index.pop(folder, None)
+                self.bot.logger.pushError("[DRIVE] Failed to load 'save.json':", e, send_to_discord=False)
+                return False
+
+    """loadShards()
+    Download the save shards listed in the manifest, and the save store if any. Used by load()
+
+    Parameters
+    ----------
+    files: The save folder files, per title
 
-    """save()
-    Upload save.json to a specified folder
+    Returns
+    --------
+    bool: True if success
+    """
+    def loadShards(self : Drive, files : dict[str, GoogleDriveFile]) -> bool:
+        content : str = files[self.MANIFEST_FILE].GetContentString()
+        manifest : dict = json.loads(content)
+        os.makedirs(self.bot.data.SAVE_FOLDER, exist_ok=True)
+        section : str
+        name : str
+        for section, name in manifest['shards'].items():
+            files[name].GetContentFile(name) # download
+            # and uncompress, the codec is given by the extension
+            codec.decompress_file(name, os.path.join(self.bot.data.SAVE_FOLDER, section + ".json"))
+            os.remove(name) # delete compressed version
+        local : dict = {
+            "version":manifest['version'],
+            "journal":manifest['journal'],
+            "sections":list(manifest['shards'].keys())
+        }
+        self.store = None
+        if 'store' in manifest:
+            name = manifest['store']['file']
+            files[name].GetContentFile(name) # download
+            ext : str
+            for ext in ("", "-wal", "-shm"): # remove the previous database
+                if os.path.isfile(self.bot.data.STORE_FILE + ext):
+                    os.remove(self.bot.data.STORE_FILE + ext)
+            codec.decompress_file(name, self.bot.data.STORE_FILE)
+            os.remove(name)
+            local['store'] = manifest['store']['sections']
+            # the store journal sequence number is missing from older manifests
+            local['store_journal'] = manifest['store'].get('journal', manifest['journal'])
+            self.store = name
+            self.store_journal = local['store_journal']
+        # write the manifest last
+        with open(self.bot.data.MANIFEST_FILE, "w", encoding="utf-8") as out:
+            json.dump(local, out)
+        self.shards = manifest['shards']
+        self.manifest = content
+        return True
+
+    """saveShards()
+    Upload save shards to the save folder, along with the manifest.
+    The shards are uploaded under new names, so the previous ones stay valid until the manifest is updated.
+    The previous manifest is kept as a backup, and the BACKUP_LIMIT newest backups are kept with the files they use.
+    The other shards and store files are then removed, and the legacy save files are renamed to backups.
+    Can be called from a worker thread.
 
     Parameters
     ----------
-    data: Save data
+    shards: Dict, section names and their serialized shard
+    manifest: Dict, the save manifest (see Data.serializeShards())
+    timings: Dict (Optional), the compression and upload durations will be set in it
+    store: String (Optional), path of the compacted save store to upload. If None, the previous one is kept.
 
     Returns
     --------
     bool: True if success, False if failure, None if debug
     """
-    def save(self : Drive, data : dict) -> bool|None: # write data as save.json to the folder id in tokens
+    def saveShards(
+        self : Drive,
+        shards : dict[str, str],
+        manifest : dict,
+        timings : dict[str, float]|None = None,
+        store : str|None = None
+    ) -> bool|None:
         if self.debug:
             return None
-        try:
-            self.refresh_token()
-            # get file list
-            file_list : list[GoogleDriveFile] = self.gdrive.ListFile(
-                {'q': "'" + self.bot.data.config['tokens']['drive'] + "' in parents and trashed=false"}
-            ).GetList()
-            f : GoogleDriveFile
-            if len(file_list) > 9: # delete if we have too many backups
-                for f in file_list:
-                    if f['title'].startswith('backup'):
-                        f.Delete()
-            # list the previous save(s)
-            prev : list[GoogleDriveFile] = [
-                f for f in file_list
-                if f['title'] in ("save.json", "save.gzip", "save.lzma")
-            ]
-            # compress the one passed as a parameter
-            cdata : bytes = self.compressJSON(data)
-            # create file
-            s : GoogleDriveFile = self.gdrive.CreateFile(
-                {
-                    'title':'save.lzma',
-                    'mimeType':'application/x-lzma',
-                    "parents": [
-                        {"kind": "drive#file", "id": self.bot.data.config['tokens']['drive']}
-                    ]
+        with self.lock:
+            folder : str = self.bot.data.config['tokens']['drive']
+            try:
+                self.refresh_token()
+                # compress the shards
+                t : float = time.perf_counter()
+                c : codec.Codec = codec.CODECS.get(
+                    self.bot.data.config.get('save_codec', codec.DEFAULT),
+                    codec.CODECS[codec.DEFAULT]
+                )
+                section : str
+                data : str
+                compressed : dict[str, bytes] = {
+                    section : codec.compress(c, data)
+                    for section, data in shards.items()
                 }
-            )
-            with io.BytesIO(cdata) as stream:
-                s.content = stream
-                s.Upload() # upload
-            # rename the previous save(s) to backup
-            for f in prev:
-                f['title'] = "backup_" + datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + "." + f['title'].split(".")[-1]
-                f.Upload()
-            return True
-        except Exception as e:
-            self.bot.logger.pushError("[DRIVE] Failed to upload 'save.json':", e, send_to_discord=False)
-            return False
+                if timings is not None:
+                    timings['compress'] = time.perf_counter() - t
+                    t = time.perf_counter()
+                # upload them
+                mapping : dict[str, str] = self.shards.copy()
+                suffix : str = datetime.now().strftime("%Y%m%d%H%M%S%f")
+                cdata : bytes
+                for section, cdata in compressed.items():
+                    mapping[section] = self.SHARD_PREFIX + section + "_" + suffix + "." + c.EXTENSION
+                    with io.BytesIO(cdata) as stream:
+                        self.createFile(stream, c.MIME, mapping[section], folder)
+                store_name : str|None = None
+                store_journal : int = self.store_journal
+                if 'store' in manifest:
+                    store_name = self.store
+                    if store is not None:
+                        store_name = self.STORE_PREFIX + suffix + "." + c.EXTENSION
+                        store_journal = manifest['journal']
+                        codec.compress_file(c, store, store + "." + c.EXTENSION)
+                        try:
+                            with open(store + "." + c.EXTENSION, "rb") as stream:
+                                self.createFile(stream, c.MIME, store_name, folder)
+                        finally:
+                            os.remove(store + "." + c.EXTENSION)
+                    elif store_name is None:
+                        raise Exception("No save store to reference in the manifest")
+                # commit by updating the manifest
+                mapping = {section : mapping[section] for section in manifest['sections']}
+                remote : dict = {"version":manifest['version'], "journal":manifest['journal'], "shards":mapping}
+                if store_name is not None:
+                    remote['store'] = {"file":store_name, "sections":manifest['store'], "journal":store_journal}
+                content : str = json.dumps(remote)
+                files : dict[str, GoogleDriveFile] = self.listFolder(folder)
+                if self.manifest is not None: # keep the previous manifest as a backup
+                    backup : str = self.BACKUP_PREFIX + datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f") + ".manifest"
+                    with io.BytesIO(self.manifest.encode('utf-8')) as stream:
+                        self.createFile(stream, 'application/json', backup, folder)
+                    self.backups[backup] = self.manifestFiles(json.loads(self.manifest))
+                if self.MANIFEST_FILE in files: # updated by id
+                    files[self.MANIFEST_FILE].SetContentString(content)
+                    files[self.MANIFEST_FILE].Upload()
+                else:
+                    with io.BytesIO(content.encode('utf-8')) as stream:
+                        self.createFile(stream, 'application/json', self.MANIFEST_FILE, folder)
+                self.shards = mapping
+                self.store = store_name
+                self.store_journal = store_journal
+                self.manifest = content
+                # clean up
+                name : str
+                for name in list(files.keys()):
+                    if name in ("save.json", "save.gzip", "save.lzma"):
+                        # rename the legacy save to backup
+                        self.renameFile(
+                            files[name],
+                            folder,
+                            self.BACKUP_PREFIX + datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + "." + name.split(".")[-1]
+                        )
+                # files used by the manifest and the kept backups
+                names : set[str] = self.manifestFiles(remote)
+                for name in self.rotateBackups(folder):
+                    names.update(self.backupFiles(files, name))
+                for name in list(files.keys()):
+                    if name.startswith((self.SHARD_PREFIX, self.STORE_PREFIX)) and name not in names:
+                        self.deleteFile(files[name], folder) # orphaned shard or save store
+                if timings is not None:
+                    timings['upload'] = time.perf_counter() - t
+                return True
+            except Exception as e:
+                self.index.pop(folder, None)
+                self.bot.logger.pushError("[DRIVE] Failed to upload the save shards:", e, send_to_discord=False)
+                return False
 
     """saveDiskFile()
     Upload a file to a specified folder
@@ -319,18 +521,16 @@ class Drive():
     def saveDiskFile(self : Drive, target : str, mime : str, name : str, folder : str) -> bool|None:
         if self.debug:
             return None
-        try:
-            self.refresh_token()
-            s : GoogleDriveFile = self.gdrive.CreateFile(
-                {'title':name, 'mimeType':mime, "parents": [{"kind": "drive#file", "id": folder}]}
-            )
-            with open(target, "rb") as stream: # open file
-                s.content = stream
-                s.Upload() # and upload
-            return True
-        except Exception as e:
-            self.bot.logger.pushError(f"[DRIVE] Failed to upload file '{name}':", e, send_to_discord=False)
-            return False
+        with self.lock:
+            try:
+                self.refresh_token()
+                with open(target, "rb") as stream: # open file
+                    self.createFile(stream, mime, name, folder) # and upload
+                return True
+            except Exception as e:
+                self.index.pop(folder, None)
+                self.bot.logger.pushError(f"[DRIVE] Failed to upload file '{name}':", e, send_to_discord=False)
+                return False
 
     """overwriteFile()
     Upload a file to a specified folder, overwrite an existing file if it exists
@@ -349,24 +549,21 @@ class Drive():
     def overwriteFile(self : Drive, target : str, mime : str, name : str, folder : str) -> bool|None:
         if self.debug:
             return None
-        try:
-            self.refresh_token()
-            # get file list
-            file_list : list[GoogleDriveFile] = self.gdrive.ListFile(
-                {'q': "'" + folder + "' in parents and trashed=false"}
-            ).GetList()
-            s : GoogleDriveFile
-            for s in file_list:
-                if s['title'] == name: # if our file is found
+        with self.lock:
+            try:
+                self.refresh_token()
+                s : GoogleDriveFile|None = self.listFolder(folder).get(name, None)
+                if s is not None: # if our file is found
                     with open(target, "rb") as stream: # update it with our local file content
                         s.content = stream
                         s.Upload()
                     return True
-        except Exception as e:
-            self.bot.logger.pushError(f"[DRIVE] Failed to overwrite file '{name}':", e, send_to_discord=False)
-            return False
-        # not found, we do a normal upload
-        return self.saveDiskFile(target, mime, name, folder)
+            except Exception as e:
+                self.index.pop(folder, None)
+                self.bot.logger.pushError(f"[DRIVE] Failed to overwrite file '{name}':", e, send_to_discord=False)
+                return False
+            # not found, we do a normal upload
+            return self.saveDiskFile(target, mime, name, folder)
 
     """mvFile()
     Rename a file in a folder
@@ -384,22 +581,18 @@ class Drive():
     def mvFile(self : Drive, name : str, folder : str, new : str) -> bool|None:
         if self.debug:
             return None
-        try:
-            self.refresh_token()
-            # get file list
-            file_list : list[GoogleDriveFile] = self.gdrive.ListFile(
-                {'q': "'" + folder + "' in parents and trashed=false"}
-            ).GetList()
-            s : GoogleDriveFile
-            for s in file_list:
-                if s['title'] == name: # the file is found
-                    s['title'] = new # change the name
-                    s.Upload() # and update
+        with self.lock:
+            try:
+                self.refresh_token()
+                s : GoogleDriveFile|None = self.listFolder(folder).get(name, None)
+                if s is not None: # the file is found
+                    self.renameFile(s, folder, new)
                     return True
-            return False
-        except Exception as e:
-            self.bot.logger.pushError(f"[DRIVE] Failed to move file '{name}':", e, send_to_discord=False)
-            return False
+                return False
+            except Exception as e:
+                self.index.pop(folder, None)
+                self.bot.logger.pushError(f"[DRIVE] Failed to move file '{name}':", e, send_to_discord=False)
+                return False
 
     """dlFile()
     Download a file from a folder
@@ -413,21 +606,18 @@ class Drive():
     bool: True if success, False if failure, None if doesn't exist
     """
     def dlFile(self : Drive, name : str, folder : str, destination : str|None = None) -> bool|None:
-        try:
-            self.refresh_token()
-            # get file list
-            file_list : list[GoogleDriveFile] = self.gdrive.ListFile(
-                {'q': "'" + folder + "' in parents and trashed=false"}
-            ).GetList() # get the file list in our folder
-            s : GoogleDriveFile
-            for s in file_list:
-                if s['title'] == name: # our file is found
-                    s.GetContentFile(s['title'] if destination is None else destination) # download it
+        with self.lock:
+            try:
+                self.refresh_token()
+                s : GoogleDriveFile|None = self.listFolder(folder).get(name, None)
+                if s is not None: # our file is found
+                    s.GetContentFile(name if destination is None else destination) # download it
                     return True
-            return None
-        except Exception as e:
-            self.bot.logger.pushError(f"[DRIVE] Failed to download file '{name}':", e, send_to_discord=False)
-            return False
+                return None
+            except Exception as e:
+                self.index.pop(folder, None)
+                self.bot.logger.pushError(f"[DRIVE] Failed to download file '{name}':", e, send_to_discord=False)
+                return False
 
     """delFile()
     Delete a file from a folder
@@ -440,18 +630,15 @@ class Drive():
     bool: True if success, False if failure, None if doesn't exist
     """
     def delFile(self : Drive, name : str, folder : str) -> bool|None:
-        try:
-            self.refresh_token()
-            # get file list
-            file_list : list[GoogleDriveFile] = self.gdrive.ListFile(
-                {'q': "'" + folder + "' in parents and trashed=false"}
-            ).GetList() # get the file list in our folder
-            s : GoogleDriveFile
-            for s in file_list:
-                if s['title'] == name: # our file is found
-                    s.Delete()
+        with self.lock:
+            try:
+                self.refresh_token()
+                s : GoogleDriveFile|None = self.listFolder(folder).get(name, None)
+                if s is not None: # our file is found
+                    self.deleteFile(s, folder)
                     return True
-            return None
-        except Exception as e:
-            self.bot.logger.pushError(f"[DRIVE] Failed to delete file '{name}':", e, send_to_discord=False)
-            return False
+                return None
+            except Exception as e:
+                self.index.pop(folder, None)
+                self.bot.logger.pushError(f"[DRIVE] Failed to delete file '{name}':", e, send_to_discord=False)
+                return False
@@ -2,17 +2,24 @@
 import disnake
 import asyncio
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import Any, Coroutine, TYPE_CHECKING
 if TYPE_CHECKING:
     from ..bot import DiscordBot
     from components.util import JSON
     from components.network import RequestResult
     # Type Aliases
     type CurrentGacha = list[timedelta|JSON]
-    type CurrentBanner = tuple[int, JSON, list[str], int, bool, dict[str, int]|None, int]
+    type CurrentBanner = tuple[int, JSON, list[str], int, bool, dict[str, int]|None, int, CompiledBanner|None]
 from enum import IntEnum, StrEnum
+from types import MappingProxyType
 import random
 import time
+from components.sampler import Sampler
+from components.odds import Odds
+try:
+    import numpy
+except ImportError:
+    numpy = None
 from views.roll_tap import Tap
 
 
@@ -66,11 +73,21 @@ class Gacha():
         'Soul Berry x300':4000
     }
     GACHA_IMG_URL : str = "https://prd-game-a-granbluefantasy.akamaized.net/assets_en/img/sp/gacha/{}"
+    MAX_TASK : int = 4 # maximum number of concurrent requests during an update
+    WIKI_BATCH : int = 50 # number of item names per wiki request, when warming the id cache
 
-    __slots__ = ("bot")
+    __slots__ = ("bot", "compiled", "compiled_source", "updating", "lookups")
 
     def __init__(self : Gacha, bot : DiscordBot) -> None:
         self.bot : DiscordBot = bot
+        # compiled banners, per (type, index) key
+        self.compiled : dict[tuple[str, int], CompiledBanner] = {}
+        # gacha data the compiled banners were built from
+        self.compiled_source : JSON = None
+        # update in progress, if any
+        self.updating : asyncio.Task|None = None
+        # wiki id lookups in progress, per gacha item
+        self.lookups : dict[str, asyncio.Task] = {}
 
     def init(self) -> None:
         pass
@@ -245,13 +262,109 @@ class Gacha():
         return d, NY
 
     """update()
-    Request and update the GBF gacha in the save data
+    Request and update the GBF gacha in the save data.
+    If an update is already in progress, wait for its result instead.
 
     Returns
     --------
     bool: True if success, False if error
     """
     async def update(self : Gacha) -> bool:
+        if self.updating is None or self.updating.done():
+            self.updating = asyncio.create_task(self._update())
+        # shielded: a cancelled caller doesn't cancel the update for the others
+        return await asyncio.shield(self.updating)
+
+    """limited()
+    Run a coroutine once a slot of the given semaphore is available.
+    Used to bound the number of concurrent requests during update().
+
+    Parameters
+    --------
+    limit: Semaphore
+    coroutine: Coroutine to run
+
+    Returns
+    --------
+    unknown: The coroutine result
+    """
+    async def limited(self : Gacha, limit : asyncio.Semaphore, coroutine : Coroutine) -> Any:
+        async with limit:
+            return await coroutine
+
+    """fetchClassic()
+    Request the details of a classic banner.
+    update() subroutine.
+
+    Parameters
+    --------
+    cid: Integer, classic series id
+
+    Returns
+    --------
+    dict: The banner data, None if it's not available
+    """
+    async def fetchClassic(self : Gacha, cid : int) -> JSON|None:
+        data : RequestResult = await self.bot.net.requestGBF(
+            f"rest/gacha/classic/toppage_data_by_classic_series_id/{cid}",
+            expect_JSON=True
+        )
+        if data is not None and 'appearance_gacha_id' in data:
+            gratio : JSON
+            glist : JSON
+            grateup : JSON
+            gratio, glist, grateup = await self.process('classic', data['appearance_gacha_id'], 1)
+            if gratio is not None:
+                return {'ratio':gratio, 'list':glist, 'rateup':grateup}
+        return None
+
+    """fetchCollaboration()
+    Request the details of the collaboration banner.
+    update() subroutine.
+
+    Parameters
+    --------
+    c: Datetime, current time
+
+    Returns
+    --------
+    tuple: The collaboration end time and the banner data (None if unavailable). None if there is no collaboration.
+    """
+    async def fetchCollaboration(self : Gacha, c : datetime) -> tuple[datetime, JSON|None]|None:
+        data : RequestResult = await self.bot.net.requestGBF(
+            "rest/gacha/collaboration/toppage_data",
+            expect_JSON=True
+        )
+        if data is not None and "collaboration" in data and "collaboration_ceiling" in data:
+            # the collaboration end time
+            end : datetime = datetime.strptime(
+                data['collaboration_ceiling']['end'],
+                '%Y/%m/%d %H:%M'
+            ).replace(microsecond=0)
+            end = self.fix_time_newyear(c, end)[0]
+            gratio : JSON
+            glist : JSON
+            grateup : JSON
+            gratio, glist, grateup = await self.process(
+                'collaboration',
+                data["collaboration"]["lineup"][-1]["id"],
+                1
+            )
+            if gratio is not None:
+                return end, {'ratio':gratio, 'list':glist, 'rateup':grateup}
+            return end, None
+        return None
+
+    """_update()
+    update() subroutine.
+    The banner details are requested concurrently, up to MAX_TASK requests at once,
+    and assembled in the same order as the gacha page.
+
+    Returns
+    --------
+    bool: True if success, False if error
+    """
+    async def _update(self : Gacha) -> bool:
         # check if GBF can be accessed
         if not self.bot.net.has_account() or not await self.bot.net.gbf_available():
             return False
@@ -303,21 +416,48 @@ class Gacha():
             }.get(data.get('logo_image', ''), data.get('logo_image', '').replace('logo_', ''))
             # get normal banner id (single draw)
             gid : int|str = data['legend']['lineup'][index]['id']
+            # image candidates
+            gachas : list[str] = [
+                f'{random_key}/tips/description_gacha.jpg',
+                f'{random_key}/tips/description_gacha_{logo}.jpg',
+                f'{random_key}/tips/description_{header_images[0]}.jpg',
+                f'header/{header_images[0]}.png'
+            ]
 
+            # request everything at once
+            limit : asyncio.Semaphore = asyncio.Semaphore(self.MAX_TASK)
+            coroutines : list[Coroutine] = [self.process('legend', gid, 1)] # main banner
+            sid : int|str
+            for sid in scam_ids: # scam details (if they exist)
+                coroutines.append(self.process('legend', sid, 3))
+                coroutines.append(self.getScamRate('legend', sid))
+            for i in self.CLASSIC_ID: # classic gacha, id has to be set manually (for now)
+                coroutines.append(self.fetchClassic(i))
+            coroutines.append(self.fetchCollaboration(c)) # collab gacha
+            for g in gachas: # check which image exists
+                coroutines.append(self.bot.net.request(self.GACHA_IMG_URL.format(g)))
+            results : list = await asyncio.gather(
+                *[self.limited(limit, coroutine) for coroutine in coroutines],
+                return_exceptions=True
+            )
+            r : Any
+            for r in results: # raise the first error, if any
+                if isinstance(r, BaseException):
+                    raise r
+
+            # assemble the results, in order
             gratio : JSON
             glist : JSON
             grateup : JSON
-            # request main banner details
-            gratio, glist, grateup = await self.process('legend', gid, 1)
+            # main banner details
+            gratio, glist, grateup = results[0]
             if gratio is None:
                 raise Exception("Couldn't retrieve main gacha banner")
-            # append to data
             gacha_data['banners'].append({'ratio':gratio, 'list':glist, 'rateup':grateup})
-
-            # request scam details (if they exist)
-            sid : int|str
+            pos : int = 1
+            # scam details
             for sid in scam_ids:
-                gratio, glist, grateup = await self.process('legend', sid, 3)
+                gratio, glist, grateup = results[pos]
                 if gratio is not None:
                     if 'scam' not in gacha_data: # add scam data list if not set
                         gacha_data['scam'] = []
@@ -326,60 +466,35 @@ class Gacha():
                             'ratio':gratio,
                             'list':glist,
                             'rateup':grateup,
-                            'items': (await self.getScamRate('legend', sid))
+                            'items': results[pos + 1]
                         }
                     )
-
+                pos += 2
             # additional banners
-            # it works like the main banner request
             # # classic gacha
-            i : int
-            for i in self.CLASSIC_ID: # id has to be set manually (for now)
-                data : RequestResult = await self.bot.net.requestGBF(
-                    f"rest/gacha/classic/toppage_data_by_classic_series_id/{i}",
-                    expect_JSON=True
-                )
-                if data is not None and 'appearance_gacha_id' in data:
-                    gratio, glist, grateup = await self.process('classic', data['appearance_gacha_id'], 1)
-                    if gratio is not None:
-                        gacha_data['banners'].append({'ratio':gratio, 'list':glist, 'rateup':grateup})
+            for i in range(len(self.CLASSIC_ID)):
+                if results[pos] is not None:
+                    gacha_data['banners'].append(results[pos])
+                pos += 1
             # # collab gacha
-            data : RequestResult = await self.bot.net.requestGBF(
-                "rest/gacha/collaboration/toppage_data",
-                expect_JSON=True
-            )
-            if data is not None and "collaboration" in data and "collaboration_ceiling" in data:
+            if results[pos] is not None:
                 # store the collaboration end time
-                gacha_data['collaboration'] = datetime.strptime(
-                    data['collaboration_ceiling']['end'],
-                    '%Y/%m/%d %H:%M'
-                ).replace(microsecond=0)
-                gacha_data['collaboration'], NY = self.fix_time_newyear(c, gacha_data['collaboration'])
-                gratio, glist, grateup = await self.process(
-                    'collaboration',
-                    data["collaboration"]["lineup"][-1]["id"],
-                    1
-                )
-                if gratio is not None:
-                    gacha_data['banners'].append({'ratio':gratio, 'list':glist, 'rateup':grateup})
-
+                gacha_data['collaboration'] = results[pos][0]
+                if results[pos][1] is not None:
+                    gacha_data['banners'].append(results[pos][1])
+            pos += 1
             # add image
-            gachas : list[str] = [
-                f'{random_key}/tips/description_gacha.jpg',
-                f'{random_key}/tips/description_gacha_{logo}.jpg',
-                f'{random_key}/tips/description_{header_images[0]}.jpg',
-                f'header/{header_images[0]}.png'
-            ]
-            g : str
-            for g in gachas: # check which one exists
-                data : RequestResult = await self.bot.net.request(self.GACHA_IMG_URL.format(g))
-                if data is not None:
-                    gacha_data['image'] = g # store the  first one to be found and stop here
+            for g in gachas:
+                if results[pos] is not None:
+                    gacha_data['image'] = g # store the first one to be found
                     break
+                pos += 1
 
             # save the data
             self.bot.data.save['gbfdata']['gacha'] = gacha_data
             self.bot.data.pending = True
+            # look up the ids of the new items in the background
+            self.bot.runTask('gacha:ids', self.warmIds)
             return True
         except Exception as e:
             self.bot.logger.pushError("[GACHA] Update failed, exception:", e)
@@ -387,6 +502,168 @@ class Gacha():
             self.bot.data.pending = True # save anyway
             return False
 
+    """parseItem()
+    Extract the wiki search parameters of a gacha item
+
+    Parameters
+    --------
+    raw: String, gacha item (see process())
+
+    Returns
+    --------
+    tuple: Item name, wiki table, element and proficiency (None for summons). None if the item can't be searched.
+    """
+    def parseItem(self : Gacha, raw : str) -> tuple[str, str, str, str|None]|None:
+        if len(raw) < 3 or raw[0] not in "123456":
+            return None
+        element : str = GachaSimulator.ELEM_EMOTE[int(raw[0]) - 1]
+        if raw[1] == self.SUMMON_KIND:
+            return raw[2:], "summons", element, None
+        elif raw[1].isdigit():
+            return raw[2:], "weapons", element, GachaSimulator.PROF_EMOTE[int(raw[1])]
+        return None
+
+    """getItemId()
+    Return the id of a gacha item from the id cache.
+    Never waits on the wiki: if the item isn't in the cache, it's looked up in the background.
+
+    Parameters
+    --------
+    raw: String, gacha item (see process())
+
+    Returns
+    --------
+    str: The item id, None if unknown or not found
+    """
+    def getItemId(self : Gacha, raw : str) -> str|None:
+        ids : JSON = self.bot.data.save['gbfdata'].get('gacha_ids', {})
+        if raw in ids:
+            return ids[raw] # None if not found on the wiki (negative cache)
+        if raw not in self.lookups and self.parseItem(raw) is not None:
+            self.lookups[raw] = asyncio.create_task(self.lookupItemId(raw))
+        return None
+
+    """lookupItemId()
+    Search the wiki for the id of a single gacha item and store it in the id cache.
+    Used by getItemId() on a cache miss.
+
+    Parameters
+    --------
+    raw: String, gacha item (see process())
+    """
+    async def lookupItemId(self : Gacha, raw : str) -> None:
+        try:
+            name : str
+            category : str
+            element : str
+            prof : str|None
+            name, category, element, prof = self.parseItem(raw)
+            rid : str|None = await self.bot.util.search_wiki_for_id(
+                name,
+                category,
+                from_gacha=True,
+                element=element,
+                proficiency=prof
+            )
+            self.bot.data.save['gbfdata'].setdefault('gacha_ids', {})[raw] = rid
+            self.bot.data.pending = True
+        except Exception as e:
+            self.bot.logger.pushError(f"[GACHA] Couldn't look up the id of `{raw}`:", e, send_to_discord=False)
+        finally:
+            self.lookups.pop(raw, None)
+
+    """warmIds()
+    Bot Task, started after an update.
+    Look up the ids of every item of the current banners, with bulk wiki requests, and store them in the id cache.
+    Items not found are stored as None, and searched again after the next update.
+    The items not in the current banners are removed from the id cache.
+    """
+    async def warmIds(self : Gacha) -> None:
+        try:
+            data : JSON|None = self.bot.data.save['gbfdata'].get('gacha', None)
+            if data is None:
+                return
+            # list the items of the current banners
+            current : set[str] = set()
+            banner : JSON
+            rarity : JSON
+            items : list[str]
+            for banner in data['banners'] + data.get('scam', []):
+                for rarity in banner['list']:
+                    for items in rarity['list'].values():
+                        current.update(items)
+            # keep only their ids in the cache
+            raw : str
+            ids : JSON = {
+                raw : rid
+                for raw, rid in self.bot.data.save['gbfdata'].get('gacha_ids', {}).items()
+                if raw in current
+            }
+            self.bot.data.save['gbfdata']['gacha_ids'] = ids
+            # list the items to search, per wiki table
+            queries : dict[str, dict[tuple[str, str, str|None], list[str]]] = {"weapons":{}, "summons":{}}
+            for raw in current:
+                if ids.get(raw, None) is not None:
+                    continue # already known
+                parsed : tuple[str, str, str, str|None]|None = self.parseItem(raw)
+                if parsed is None or '"' in parsed[0]:
+                    continue
+                queries[parsed[1]].setdefault(
+                    (parsed[0].lower(), parsed[2], parsed[3]),
+                    []
+                ).append(raw)
+            # request them in batches
+            found : int = 0
+            total : int = 0
+            category : str
+            keys : dict[tuple[str, str, str|None], list[str]]
+            for category, keys in queries.items():
+                # sorted, for the requests to match the wiki cache entries
+                names : list[str] = sorted({raw[2:] for entries in keys.values() for raw in entries})
+                total += len(keys)
+                i : int
+                for i in range(0, len(names), self.WIKI_BATCH):
+                    rows : RequestResult = await self.bot.net.requestWiki(
+                        "index.php",
+                        params={
+                            "title":"Special:CargoExport",
+                            "tables":category,
+                            "where":(
+                                "name IN ({}) "
+                                'AND (obtain LIKE "%normal%" OR obtain LIKE "%premium%" OR obtain LIKE "%gala%")'
+                            ).format(",".join(f'"{n}"' for n in names[i:i + self.WIKI_BATCH])),
+                            "fields":"name,id,element" + (",type" if category == "weapons" else ""),
+                            "format":"json",
+                            "limit":"500"
+                        },
+                        allow_redirects=True,
+                        cache="search"
+                    )
+                    if rows is None:
+                        raise Exception("Wiki request failed")
+                    row : JSON
+                    for row in rows:
+                        key : tuple[str, str, str|None] = (
+                            str(row.get('name', '')).lower(),
+                            str(row.get('element', '')).lower(),
+                            str(row.get('type', '')).lower() if category == "weapons" else None
+                        )
+                        if key in keys:
+                            for raw in keys.pop(key):
+                                ids[raw] = str(row['id'])
+                            found += 1
+                # not found, negative cache
+                entries : list[str]
+                for entries in keys.values():
+                    for raw in entries:
+                        ids[raw] = None
+            self.bot.data.pending = True
+            self.bot.logger.push(f"[GACHA] {found}/{total} item id(s) found on the wiki", send_to_discord=False)
+        except asyncio.CancelledError:
+            self.bot.logger.push("[TASK] 'gacha:ids' Task Cancelled")
+        except Exception as e:
+            self.bot.logger.pushError("[TASK] 'gacha:ids' Task Error:", e)
+
     """summary_subroutine()
     summary() subroutine.
 
@@ -527,6 +804,28 @@ class Gacha():
         except Exception as e:
             raise e
 
+    """compile()
+    Return the compiled version of a banner, build it if needed.
+    The compiled banners are discarded when the gacha data is replaced, i.e. after update().
+
+    Parameters
+    --------
+    key: Tuple, banner type ('banners' or 'scam') and index
+    banner: Dict, the banner data
+
+    Returns
+    --------
+    CompiledBanner: The compiled banner
+    """
+    def compile(self : Gacha, key : tuple[str, int], banner : JSON) -> CompiledBanner:
+        source : JSON = self.bot.data.save['gbfdata'].get('gacha', None)
+        if source is not self.compiled_source: # the gacha data changed
+            self.compiled = {}
+            self.compiled_source = source
+        if key not in self.compiled:
+            self.compiled[key] = CompiledBanner(self, banner)
+        return self.compiled[key]
+
     """retrieve()
     Return the current real gacha from GBF, if it exists in the bot memory.
     If not, a dummy/limited one is generated.
@@ -546,42 +845,29 @@ class Gacha():
         - Boolean indicating if the gacha is the real one
         - (OPTIONAL): Dict, item list
         - (OPTIONAL): Integer, star premium gacha index
+        - CompiledBanner, None if the gacha isn't the real one
     """
     async def retrieve(self : Gacha, scam : int|None = None, banner : int = 0) -> CurrentBanner:
         try:
             data : JSON = (await self.get())[1] # retrieve the rate
-            gacha_data : JSON
+            compiled : CompiledBanner
             if scam is None: # not asking for scam
-                if 0 <= banner < len(data['banners']): # access asked banner
-                    gacha_data = data['banners'][banner]
-                else: # or first banner if invalid index
-                    gacha_data = data['banners'][0]
+                if not (0 <= banner < len(data['banners'])): # first banner if invalid index
                     banner = 0
+                compiled = self.compile(('banners', banner), data['banners'][banner])
             else:
                 if 'scam' not in data or scam < 0 or scam >= len(data['scam']): # raise error if couldn't get scam
                     raise Exception()
-                gacha_data = data['scam'][scam]
+                compiled = self.compile(('scam', scam), data['scam'][scam])
             # final check
-            if len(gacha_data['list']) == 0:
+            if len(compiled.data) == 0:
                 raise Exception()
-            # gacha_data is now the data to the banner we're interested in
-            data = gacha_data['list']
-            rateups : list[str] = []
-            # build a list of rate up for this banner
-            k : str
-            for k in gacha_data['rateup']:
-                if k == "zodiac":
-                    continue # ignore zodiac category
-                elif len(gacha_data['rateup'][k]) > 0:
-                    r : str
-                    for r in gacha_data['rateup'][k]:
-                        if r not in rateups:
-                            rateups.append(r)
-            # get SSR rate
-            ssrrate : int = int(gacha_data['ratio'][0])
+            data = compiled.data
+            rateups : list[str] = list(compiled.rateups)
+            ssrrate : int = compiled.ssrrate
             complete : bool = True
             if scam is not None: # return scam data on top
-                return banner, data, rateups, ssrrate, complete, gacha_data['items'], scam
+                return banner, data, rateups, ssrrate, complete, compiled.items, scam, compiled
         except:
             # legacy mode, dummy data
             data = [
@@ -593,7 +879,8 @@ class Gacha():
             ssrrate = 3
             complete = False
             banner = 0
-        return banner, data, rateups, ssrrate, complete, None, None
+            compiled = None
+        return banner, data, rateups, ssrrate, complete, None, None, compiled
 
     """isLegfest()
     Check the provided parameter and the real gacha to determine if we will be using a 6 or 3% SSR rate
@@ -635,19 +922,37 @@ class Gacha():
     """
     def allRates(self : Gacha, index : int) -> tuple[float, list[float]]:
         try:
-            r : list[float] = []
-            rate : str
-            # SSR list
-            for rate in list(self.bot.data.save['gbfdata']['gacha']['banners'][index]['list'][-1]['list'].keys()):
-                if float(rate) not in r:
-                    r.append(float(rate))
-            return (
-                float(self.bot.data.save['gbfdata']['gacha']['banners'][index]['ratio'][:-1]),
-                sorted(r, reverse=True)
+            compiled : CompiledBanner = self.compile(
+                ('banners', index),
+                self.bot.data.save['gbfdata']['gacha']['banners'][index]
             )
+            return compiled.ratio, list(compiled.ssr_rates)
         except:
             return None, None
 
+    """allOdds()
+    Return the exact outcomes of a number of rolls in the current gacha.
+    Results are memoized per banner.
+    Doesn't support scam banners
+
+    Parameters
+    --------
+    index: Integer, banner index (0 default, 1-2 classic, 3 collab...)
+    count: Integer, number of rolls
+
+    Returns
+    --------
+    dict: See Odds.compute(), return None if error
+    """
+    def allOdds(self : Gacha, index : int, count : int) -> dict|None:
+        try:
+            return self.compile(
+                ('banners', index),
+                self.bot.data.save['gbfdata']['gacha']['banners'][index]
+            ).odds.compute(count)
+        except:
+            return None
+
     """formatGachaItem()
     Format the item string used by the gacha simulator to add an element emoji
 
@@ -725,8 +1030,81 @@ class Gacha():
         return GachaSimulator(self.bot, gachadata, simtype, scamdata, color)
 
 
+# Immutable, preprocessed version of a banner, see Gacha.compile()
+class CompiledBanner():
+    __slots__ = (
+        "data", "ratio", "ssrrate", "rateups", "rateup_set", "items",
+        "advertised", "proba", "samplers", "names", "ssr_rates", "odds"
+    )
+
+    """constructor
+
+    Parameters
+    --------
+    gacha: The Gacha component
+    banner: Dict, banner data from the save data
+    """
+    def __init__(self : CompiledBanner, gacha : Gacha, banner : JSON) -> None:
+        # rarity list (R, SR, SSR), as in the save data. Must not be modified.
+        self.data : JSON = banner['list']
+        # SSR rate
+        self.ratio : float = float(banner['ratio'][:-1])
+        self.ssrrate : int = int(banner['ratio'][0])
+        # rate up rates, in order of appearance (zodiac category ignored)
+        rateups : list[str] = []
+        k : str
+        r : str
+        for k in banner['rateup']:
+            if k != "zodiac":
+                for r in banner['rateup'][k]:
+                    if r not in rateups:
+                        rateups.append(r)
+        self.rateups : tuple[str, ...] = tuple(rateups)
+        self.rateup_set : frozenset[str] = frozenset(rateups)
+        # scam items and their rates, if any
+        self.items : MappingProxyType|None = (
+            MappingProxyType(banner['items']) if banner.get('items', None) is not None else None
+        )
+        # advertised rate and rate sum (rate x items) of each rarity
+        self.advertised : tuple[float, ...] = tuple(float(r['rate']) for r in self.data)
+        self.proba : tuple[float, ...] = tuple(
+            sum(float(rate) * len(items) for rate, items in r['list'].items())
+            for r in self.data
+        )
+        # item sampler of each rarity
+        self.samplers : tuple[Sampler, ...] = tuple(Sampler(r['list'], self.rateup_set) for r in self.data)
+        # item display names
+        names : dict[str, str] = {}
+        rarity : JSON
+        items : list[str]
+        item : str
+        for rarity in self.data:
+            for items in rarity['list'].values():
+                for item in items:
+                    if item not in names:
+                        names[item] = gacha.formatGachaItem(item)
+        self.names : MappingProxyType = MappingProxyType(names)
+        # distinct SSR rates, highest first
+        self.ssr_rates : tuple[float, ...] = (
+            tuple(sorted({float(rate) for rate in self.data[-1]['list']}, reverse=True))
+            if len(self.data) > 0 else ()
+        )
+        # exact roll outcomes, using the advertised rates and the rate up SSRs
+        self.odds : Odds|None = Odds(
+            self.advertised[Rarity.SSR] * 0.01,
+            self.advertised[Rarity.SR] * 0.01,
+            [
+                (float(rate) * 0.01, len(items))
+                for rate, items in self.data[Rarity.SSR]['list'].items()
+                if rate in self.rateup_set
+            ]
+        ) if len(self.data) > Rarity.SSR else None
+
+
 # Type Aliases
 GachaRoll = tuple[int, str, bool]
+# Random generator used for the batched rolls, if numpy is available
+RNG : numpy.random.Generator|None = numpy.random.default_rng() if numpy is not None else None
 
 
 class GachaSimulator():
@@ -772,7 +1150,7 @@ class GachaSimulator():
     __slots__ = (
         "bot", "bannerid", "data", "rateups", "ssrrate", "complete",
         "scamdata", "iscollab", "color", "mode", "result",
-        "thumbnail", "best", "exception"
+        "thumbnail", "best", "exception", "compiled"
     )
 
     """constructor
@@ -810,6 +1188,7 @@ class GachaSimulator():
         self.thumbnail : str|None = None # thumbnail of self.best
         self.best : GachaRoll = [-1, "", False] # best roll
         self.exception : Exception|None = None # contains the last exception
+        self.compiled : CompiledBanner|None = gachadata[7] # None if not complete
 
     """changeMode()
     update self.mode with a new value
@@ -847,13 +1226,17 @@ class GachaSimulator():
     """
     def check_rate(self : GachaSimulator, ssrrate : int) -> tuple[list[float], list[float]]:
         # calcul R,SR,SSR & total
-        proba : list[float] = [] # store the % of R, SR and SSR
+        proba : list[float] # store the % of R, SR and SSR
         mods : list[float] = [1.0, 1.0, 1.0] # modifiers vs advertised rates, 1 by default
-        for r in self.data:
-            proba.append(0.0)
-            rate : str
-            for rate in r['list']:
-                proba[-1] += float(rate) * len(r['list'][rate]) # sum of rates x items
+        if self.compiled is not None: # precomputed sum of rates x items
+            proba = list(self.compiled.proba)
+        else:
+            proba = []
+            for r in self.data:
+                proba.append(0.0)
+                rate : str
+                for rate in r['list']:
+                    proba[-1] += float(rate) * len(r['list'][rate]) # sum of rates x items
         if ssrrate != self.data[Rarity.SSR]['rate']: # if wanted ssr rate different from advertised one
             mods[Rarity.SSR] = ssrrate / proba[Rarity.SSR] # calculate mod
             tmp : float = proba[Rarity.SSR] * mods[Rarity.SSR] # get new proba
@@ -906,56 +1289,36 @@ class GachaSimulator():
                         ssrrate = self.SSRRate.NORMAL
         return ssrrate, *self.check_rate(ssrrate)
 
-    """retrieve_single_roll_item()
-    Use the generated roll to retrieve an item.
-    Called by generate_single_roll.
+    """add_roll_item()
+    Add a roll and its item to a result.
+    Called by generate.
     If no real gacha data exists in memory, we create a dummy item.
 
     Parameters
     --------
     result: Dict, temporary output container
     rarity: Integer, item rarity
-    dice: Float, rolled value
+    pick: Tuple, item and rate up flag, from the sampler of the rarity (None if no real gacha data)
 
     Returns
     --------
     bool: Stop boolean, True if we must stop generating items, False if not
     """
-    def retrieve_single_roll_item(self : GachaSimulator, result: dict, rarity : int, dice : float) -> bool:
+    def add_roll_item(self : GachaSimulator, result: dict, rarity : int, pick : tuple[str, bool]|None) -> bool:
         if self.complete: # if we have a real gacha in memory
-            roll : GachaRoll|None = None # will contain our rolled item
-            # find which item we rolled
-            rate : str
-            rarity : int
             item : str
-            rateupitem : bool
-            for rate in self.data[rarity]['list']: # go over each rate category
-                floatrate : float = float(rate)
-                item : str
-                for item in self.data[rarity]['list'][rate]: # and each item
-                    rateupitem = False
-                    if rarity == Rarity.SSR and rate in self.rateups: # if this is a rate up SSR
-                        rateupitem = True # raise the flag
-                    # if our dice value is under the item rate
-                    if dice <= floatrate: # this is the one
-                        roll = [rarity, item, rateupitem]
-                        break
-                    # else substract the item rate
-                    dice -= floatrate
-                if roll is not None: # we stop the loop if we got a roll
-                    break
-            # fallback if the roll is still empty, we put the last item encountered
-            if roll is None:
-                roll = (rarity, item, rateupitem)
+            rateup : bool
+            item, rateup = pick
+            roll : GachaRoll = [rarity, item, rarity == Rarity.SSR and rateup]
             # add item to list
             if roll[2]: # bold if rate up
-                result['list'].append([roll[0], "**" + self.bot.gacha.formatGachaItem(roll[1]) + "**"])
+                result['list'].append([roll[0], "**" + self.compiled.names[roll[1]] + "**"])
             else:
-                result['list'].append([roll[0], self.bot.gacha.formatGachaItem(roll[1])])
+                result['list'].append([roll[0], self.compiled.names[roll[1]]])
             # increase rarity counter by 1
             result['detail'][rarity] += 1
             # update best item obtained so far
-            if rate in self.rateups and rarity + 1 > self.best[0]: # rate up SSR
+            if rateup and rarity + 1 > self.best[0]: # rate up SSR
                 self.best = roll.copy()
                 self.best[0] += 1 # set rate up ssr to SSR+1 to ensure they aren't superseeded by normal SSR
             elif rarity > self.best[0]:
@@ -965,7 +1328,7 @@ class GachaSimulator():
                 # the loop must stop if we fulfilled the memeroll types
                 if self.mode == self.Mode.MEMEA:
                     return True # memeroll mode A
-                elif self.mode == self.Mode.MEMEB and result['list'][-1][1].startswith("**"):
+                elif self.mode == self.Mode.MEMEB and roll[2]:
                     return True # memeroll mode B
         else: # using dummy gacha
             result['list'].append([rarity, '']) # '' because no item names
@@ -975,59 +1338,84 @@ class GachaSimulator():
                     return True  # memeroll mode A and B
         return False
 
-    """generate_single_roll()
-    Generate a single roll.
+    """generate_dices()
+    Generate the rarity and the item dice of a batch of rolls, all at once.
+    Vectorized if numpy is available.
+    The SR guarantee of ten rolls (and the SR/SSR mode) is applied.
     Used by generate()
 
     Parameters
     --------
-    result: Dict, temporary output container
-    index: Integer, current roll in a 10 rolls series (Goes from 0 to 9)
-    tenrollsr: Flag indicating we got a SR in the current ten roll
+    count: Integer, number of rolls
     mods: List, of 3 elements (rate modifiers for each rarity)
     proba: List, of 3 elements (% rates of each rarity)
 
     Returns
     --------
-    tuple: Containes updated tenrollsr boolean and stop boolean
+    tuple:
+        - list: Rarity of each roll
+        - list: Dice of each roll, to use with the sampler of its rarity
     """
-    def generate_single_roll(
-        self : GachaSimulator,
-        result: dict,
-        index : int,
-        tenrollsr : bool,
-        mods : list,
-        proba : list
-    ) -> tuple[bool, bool]:
-        # our "dice" roll
-        dice : int = random.randint(1, int(sum(proba) * 1000)) / 1000
-        # Check if we must force a SR
-        if self.mode == self.Mode.SRSSR or (self.mode >= self.Mode.TEN and index == 9 and not tenrollsr):
-            # if SRSSR mode OR (we're doing a ten draw type of roll and we're on the 10th roll without SR/SSR)
-            sr_mode = True
-        else:
-            sr_mode = False
-        # determine what rarity we got
-        rarity : int
-        if dice <= proba[Rarity.SSR]: # SSR CASE
-            rarity = Rarity.SSR
-            tenrollsr = True # raise got sr flag
-            dice /= mods[Rarity.SSR] # apply modifier
-        elif (not sr_mode and dice <= proba[Rarity.SR] + proba[Rarity.SSR]) or sr_mode: # SR CASE
-            rarity = Rarity.SR
-            dice -= proba[Rarity.SSR]
-            while dice >= proba[Rarity.SR]: # in case we forced a SR and we're above the rate
-                dice -= proba[Rarity.SR]
-            tenrollsr = True # raise got sr flag
-            dice /= mods[Rarity.SR] # apply modifier
-        else: # R CASE
-            rarity = Rarity.R
-            dice -= proba[Rarity.SSR] + proba[Rarity.SR]
-            dice /= mods[Rarity.R] # apply modifier
-        return tenrollsr, self.retrieve_single_roll_item(result, rarity, dice)
+    def generate_dices(self : GachaSimulator, count : int, mods : list, proba : list) -> tuple[list[int], list[float]]:
+        # our "dice" rolls
+        total : int = int(sum(proba) * 1000)
+        ssr : float = proba[Rarity.SSR]
+        sr : float = proba[Rarity.SR]
+        # Check where we must force a SR
+        # SRSSR mode OR (we're doing a ten draw type of roll and we're on the 10th roll without SR/SSR)
+        srssr : bool = (self.mode == self.Mode.SRSSR)
+        tenroll : bool = (self.mode >= self.Mode.TEN)
+        if numpy is not None:
+            dices : numpy.ndarray = RNG.integers(1, total, size=count, endpoint=True) / 1000
+            rarities : numpy.ndarray = numpy.where(
+                dices <= ssr,
+                Rarity.SSR,
+                numpy.where(dices <= ssr + sr, Rarity.SR, Rarity.R)
+            )
+            forced : numpy.ndarray = numpy.full(count, srssr)
+            blocks : int = count // 10
+            if tenroll and blocks > 0: # 10th roll of each complete ten roll without SR/SSR
+                forced[9:blocks * 10:10] = ~(rarities[:blocks * 10].reshape(blocks, 10)[:, :9] >= Rarity.SR).any(axis=1)
+            forced &= (rarities == Rarity.R)
+            adjusted : numpy.ndarray = numpy.zeros(count)
+            mask : numpy.ndarray = (rarities == Rarity.SSR)
+            adjusted[mask] = dices[mask] / mods[Rarity.SSR]
+            mask = (rarities == Rarity.SR)
+            adjusted[mask] = (dices[mask] - ssr) / mods[Rarity.SR]
+            mask = forced # in case we forced a SR and we're above the rate
+            adjusted[mask] = numpy.fmod(dices[mask] - ssr, sr) / mods[Rarity.SR]
+            rarities[mask] = Rarity.SR
+            mask = (rarities == Rarity.R)
+            adjusted[mask] = (dices[mask] - ssr - sr) / mods[Rarity.R]
+            return [Rarity(r) for r in rarities.tolist()], adjusted.tolist()
+        rarity_list : list[int] = []
+        dice_list : list[float] = []
+        tenrollsr : bool = False # flag for guaranted SR in ten rolls
+        i : int
+        k : int
+        for i, k in enumerate(random.choices(range(1, total + 1), k=count)):
+            dice : float = k / 1000
+            if dice <= ssr: # SSR CASE
+                rarity_list.append(Rarity.SSR)
+                dice_list.append(dice / mods[Rarity.SSR])
+                tenrollsr = True
+            elif dice <= ssr + sr or srssr or (tenroll and i % 10 == 9 and not tenrollsr): # SR CASE
+                dice -= ssr
+                while dice >= sr: # in case we forced a SR and we're above the rate
+                    dice -= sr
+                rarity_list.append(Rarity.SR)
+                dice_list.append(dice / mods[Rarity.SR])
+                tenrollsr = True
+            else: # R CASE
+                rarity_list.append(Rarity.R)
+                dice_list.append((dice - ssr - sr) / mods[Rarity.R])
+            if i % 10 == 9:
+                tenrollsr = False # unset SR flag if we did 10 rolls
+        return rarity_list, dice_list
 
     """generate()
     Generate X amount of rolls and update self.result
+    The dices are generated in a single batch, see generate_dices()
 
     Parameters
     --------
@@ -1042,20 +1430,30 @@ class GachaSimulator():
             ssrrate, mods, proba = self.get_generation_rate_and_modifiers(legfest) # get ssr rate
             self.result = {} # reset the output
             result : JSON = {'list':[], 'detail':[0, 0, 0], 'rate':ssrrate} # temp output
-            tenrollsr : bool = False # flag for guaranted SR in ten rolls
             if self.mode == self.Mode.MEMEB and len(self.rateups) == 0:
                 self.mode = self.Mode.MEMEA # revert memerollB to A if no rate ups
-            # rolling loop
+            rarities : list[int]
+            dices : list[float]
+            rarities, dices = self.generate_dices(count, mods, proba)
+            # retrieve the items, rarity by rarity
+            picks : list[tuple[str, bool]|None] = [None] * count
+            if self.complete:
+                rarity : int
+                for rarity in (Rarity.R, Rarity.SR, Rarity.SSR):
+                    indexes : list[int] = [i for i in range(count) if rarities[i] == rarity]
+                    pick : tuple[str, bool]
+                    for i, pick in zip(
+                        indexes,
+                        self.compiled.samplers[rarity].pick_many([dices[i] for i in indexes])
+                    ):
+                        picks[i] = pick
+            # build the result
             i : int
             for i in range(0, count):
-                modulo_i : int = i % 10 # get index in current ten roll
-                stop : bool
-                tenrollsr, stop = self.generate_single_roll(result, modulo_i, tenrollsr, mods, proba)
-                if stop:
+                if self.add_roll_item(result, rarities[i], picks[i]):
                     break
                 # end of a series of 10 rolls, check for gachapin/mukku/etc...
-                if modulo_i == 9:
-                    tenrollsr = False # unset SR flag if we did 10 rolls
+                if i % 10 == 9:
                     if ((self.mode == self.Mode.GACHAPIN or self.mode == self.Mode.MUKKU)
                             and result['detail'][Rarity.SSR] >= 1):
                         break # gachapin and mukku mode, we end here
@@ -1072,18 +1470,8 @@ class GachaSimulator():
     async def updateThumbnail(self : GachaSimulator) -> None:
         try:
             if self.best[0] != -1 and self.best[1] != "":
-                search : str = self.best[1][2:]
-                # extract element and proficiency for wiki search
-                element : str = self.ELEM_EMOTE[int(self.best[1][0]) - 1]
-                prof : str = (self.PROF_EMOTE[int(self.best[1][1])] if self.best[1][1] != 'S' else None)
-                # retrieve the element id from the wiki
-                rid : str|None = await self.bot.util.search_wiki_for_id(
-                    search,
-                    "summons" if self.best[1][1] == 'S' else "weapons",
-                    from_gacha=True,
-                    element=element,
-                    proficiency=prof
-                )
+                # retrieve the item id from the cache (the wiki isn't requested here)
+                rid : str|None = self.bot.gacha.getItemId(self.best[1])
                 if rid is None: # not found
                     self.thumbnail = None
                 elif rid.startswith('1'): # weapon
@@ -1112,8 +1500,9 @@ class GachaSimulator():
         complete : bool
         items : dict[str, int]|None
         scamindex : int
+        compiled : CompiledBanner|None
         # no error check, do it before calling the function
-        _unused_, data, rateups, ssrrate, complete, items, scamindex = self.scamdata
+        _unused_, data, rateups, ssrrate, complete, items, scamindex, compiled = self.scamdata
         if items is None:
             items = self.bot.gacha.SCAM_DUMMY
         scam_rate : int = sum(list(items.values()))
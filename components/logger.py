@@ -5,7 +5,8 @@ if TYPE_CHECKING:
     from ..bot import DiscordBot
 from datetime import datetime
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import queue
 
 # ----------------------------------------------------------------------
 # Logger Component
@@ -31,11 +32,23 @@ class Logger():
         DEBUG : 0xc7e046
     }
 
-    __slots__ = ("bot", "discord_queue", "__logger__")
+    # Discord shipping settings
+    FLUSH_INTERVAL : int = 2 # seconds between two flushes of the queue
+    MAX_QUEUE : int = 50 # maximum number of different messages waiting in the queue
+    MAX_EMBEDS : int = 5 # maximum number of embeds sent per flush
+    EMBED_LIMIT : int = 4000 # maximum length of an embed description
+    ENTRY_LIMIT : int = 1800 # maximum length of a single message in an embed
+
+    __slots__ = ("bot", "discord_queue", "dropped", "listeners", "__logger__")
 
     def __init__(self : Logger, bot : DiscordBot) -> None:
         self.bot : DiscordBot = bot
-        self.discord_queue : list[list[datetime|str|int]] = []
+        # messages waiting to be sent to discord, per message string: [time, message, occurences, level]
+        self.discord_queue : dict[str, list[datetime|str|int]] = {}
+        # number of messages dropped because the queue was full
+        self.dropped : int = 0
+        # threads writing the log files
+        self.listeners : list[QueueListener] = []
         debug : bool = bot.debug_mode or bot.test_mode # check if the bot isn't in normal mode
         logging.basicConfig(level=logging.INFO)
         self.__logger__ : logging.Logger|None = None # logging object
@@ -45,24 +58,9 @@ class Logger():
             discord_logger : logging.Logger = logging.getLogger('disnake')
             discord_logger.setLevel(logging.WARNING)
             if not debug: # plus rotary files in normal mode
-                self.__logger__.addHandler(
-                    RotatingFileHandler(
-                        filename="rosetta.log",
-                        encoding='utf-8',
-                        mode='w',
-                        maxBytes=51200,
-                        backupCount=1
-                    )
-                )
-                discord_logger.addHandler(
-                    RotatingFileHandler(
-                        filename="disnake.log",
-                        encoding='utf-8',
-                        mode='w',
-                        maxBytes=51200,
-                        backupCount=1
-                    )
-                )
+                # the files are written by a listener thread, the loggers only queue the records
+                self.addFileHandler(self.__logger__, "rosetta.log")
+                self.addFileHandler(discord_logger, "disnake.log")
             # we disable these logs
             for log_name in ('oauth2client', 'oauth2client.transport', 'oauth2client.client', 'oauth2client.crypt'):
                 l : logging.Logger = logging.getLogger(log_name)
@@ -74,6 +72,44 @@ class Logger():
     def startTasks(self : Logger) -> None:
         self.bot.runTask('logger:process', self.process)
 
+    """addFileHandler()
+    Make a logger write to a rotary file, through a queue.
+    The file is written by a QueueListener thread, so logging doesn't wait on the disk.
+
+    Parameters
+    ----------
+    logger: The logger
+    filename: String, the file path
+    """
+    def addFileHandler(self : Logger, logger : logging.Logger, filename : str) -> None:
+        records : queue.SimpleQueue = queue.SimpleQueue()
+        listener : QueueListener = QueueListener(
+            records,
+            RotatingFileHandler(
+                filename=filename,
+                encoding='utf-8',
+                mode='w',
+                maxBytes=51200,
+                backupCount=1
+            )
+        )
+        listener.start()
+        self.listeners.append(listener)
+        logger.addHandler(QueueHandler(records))
+
+    """stop()
+    Write the remaining records to the log files and stop the listener threads.
+    Called on exit.
+    """
+    def stop(self : Logger) -> None:
+        listener : QueueListener
+        for listener in self.listeners:
+            try:
+                listener.stop()
+            except:
+                pass
+        self.listeners = []
+
     """color()
     Return an embed color according to the given level
 
@@ -89,30 +125,66 @@ class Logger():
         return self.COLORS.get(level, 0x000000)
 
     """process()
-    Read through the stack and send the errors to the debug channel
+    Read through the queue and send the messages to the debug channel.
+    Messages are packed in as few embeds as possible, up to MAX_EMBEDS per flush.
     """
     async def process(self : Logger) -> None:
         while True:
             try:
-                await asyncio.sleep(2)
-                if len(self.discord_queue) > 0: # if messages are waiting in the queue
-                    # for each message
+                await asyncio.sleep(self.FLUSH_INTERVAL)
+                if len(self.discord_queue) > 0 or self.dropped > 0: # if messages are waiting in the queue
+                    entries : list[list[datetime|str|int]] = list(self.discord_queue.values())
+                    dropped : int = self.dropped
+                    self.discord_queue = {} # and clear
+                    self.dropped = 0
+                    # pack the messages
+                    embeds : list[list] = [] # description parts, highest level and timestamp of each embed
+                    size : int = 0
                     msg : list[datetime|str|int]
-                    for msg in self.discord_queue:
-                        if len(msg[1]) > 4000: # if too long, truncate
-                            msg[1] = msg[1][:4000] + "...\n*Too long, check rosetta.log for details*"
-                        # send the message to the debug channel
+                    for msg in entries:
+                        text : str = msg[1]
+                        if len(text) > self.ENTRY_LIMIT: # if too long, truncate
+                            text = text[:self.ENTRY_LIMIT] + "...\n*Too long, check rosetta.log for details*"
+                        text = "### {}{}\n{}\n".format(
+                            msg[0].strftime("%H:%M:%S"),
+                            (f" (x{msg[2]})" if msg[2] > 1 else ""),
+                            text
+                        )
+                        if len(embeds) == 0 or size + len(text) > self.EMBED_LIMIT: # start a new embed
+                            if len(embeds) >= self.MAX_EMBEDS:
+                                dropped += 1
+                                continue
+                            embeds.append([[], msg[3], msg[0]])
+                            size = 0
+                        embeds[-1][0].append(text)
+                        embeds[-1][1] = max(embeds[-1][1], msg[3])
+                        size += len(text)
+                    # send the embeds to the debug channel
+                    i : int
+                    embed : list
+                    for i, embed in enumerate(embeds):
+                        await self.bot.send(
+                            'debug',
+                            embed=self.bot.embed(
+                                title="Rosetta Log",
+                                description="".join(embed[0]),
+                                footer=(
+                                    f"{dropped} message(s) dropped, check rosetta.log for details"
+                                    if dropped > 0 and i == len(embeds) - 1 else ''
+                                ),
+                                timestamp=embed[2],
+                                color=self.color(embed[1])
+                            )
+                        )
+                    if len(embeds) == 0 and dropped > 0:
                         await self.bot.send(
                             'debug',
                             embed=self.bot.embed(
                                 title="Rosetta Log",
-                                description="### " + msg[1],
-                                footer=(f"Occured {msg[2]} times" if msg[2] > 1 else ''),
-                                timestamp=msg[0],
-                                color=self.color(msg[3])
+                                description=f"{dropped} message(s) dropped, check rosetta.log for details",
+                                color=self.color(self.WARNING)
                             )
                         )
-                    self.discord_queue = [] # and clear
             except asyncio.CancelledError:
                 self.bot.logger.push("[TASK] 'bot:log' Task Cancelled")
                 await asyncio.sleep(30)
@@ -122,7 +194,8 @@ class Logger():
 
     """push()
     Push a message to the log stack.
-    If the message is identical to the previous one, it increases its occurence stack instead
+    If the message is already in the queue, it increases its occurence counter instead.
+    If the queue is full, the message is only written to the log file and counted as dropped.
 
     Parameters
     ----------
@@ -133,11 +206,12 @@ class Logger():
     def push(self : Logger, msg : str, send_to_discord : bool = True, level : int = logging.INFO) -> None:
         now : datetime = self.bot.util.UTC()
         if send_to_discord: # if this flag is on
-            # if the last message in the log is the same
-            if len(self.discord_queue) > 0 and self.discord_queue[-1][1] == msg:
-                self.discord_queue[-1][2] += 1 # we simply increase its occurence counter
+            if msg in self.discord_queue: # if the message is already waiting
+                self.discord_queue[msg][2] += 1 # we simply increase its occurence counter
+            elif len(self.discord_queue) >= self.MAX_QUEUE: # the queue is full
+                self.dropped += 1
             else: # else we add it to the queue
-                self.discord_queue.append([now, msg, 1, level])
+                self.discord_queue[msg] = [now, msg, 1, level]
         # push the message to the logger
         try:
             self.__logger__.log(level, now.strftime("%Y-%m-%d %H:%M:%S | ") + msg)
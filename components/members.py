@@ -0,0 +1,203 @@
+from __future__ import annotations
+import disnake
+import time
+from typing import Iterable, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..bot import DiscordBot
+
+# ----------------------------------------------------------------------
+# Members Component
+# ----------------------------------------------------------------------
+# Index of the guild membership of the users
+# Used by the clean up routines, to not fetch each user in each guild
+# ----------------------------------------------------------------------
+
+
+class Members():
+    QUERY_LIMIT : int = 100 # maximum number of members per gateway query
+    # The member events require the members intent, so the guild entries are also refreshed periodically
+    TTL : int = 86400 # in seconds
+
+    __slots__ = ("bot", "guilds", "users")
+
+    def __init__(self : Members, bot : DiscordBot) -> None:
+        self.bot : DiscordBot = bot
+        # per guild id, the time of the entry creation and the checked user ids (True if member of the guild)
+        self.guilds : dict[int, tuple[float, dict[int, bool]]] = {}
+        # per user id, the ids of the guilds it's a member of
+        self.users : dict[int, set[int]] = {}
+
+    def init(self : Members) -> None:
+        pass
+
+    """entry()
+    Return the index entry of a guild, reset it if it's too old
+
+    Parameters
+    ----------
+    gid: Integer, guild id
+
+    Returns
+    --------
+    dict: The checked user ids (True if member of the guild)
+    """
+    def entry(self : Members, gid : int) -> dict[int, bool]:
+        if gid in self.guilds and time.monotonic() - self.guilds[gid][0] >= self.TTL:
+            self.forget(gid)
+        if gid not in self.guilds:
+            self.guilds[gid] = (time.monotonic(), {})
+        return self.guilds[gid][1]
+
+    """set()
+    Set the membership of an user in a guild
+
+    Parameters
+    ----------
+    gid: Integer, guild id
+    uid: Integer, user id
+    member: Boolean, True if the user is a member of the guild
+    """
+    def set(self : Members, gid : int, uid : int, member : bool) -> None:
+        self.entry(gid)[uid] = member
+        if member:
+            if uid not in self.users:
+                self.users[uid] = set()
+            self.users[uid].add(gid)
+        elif uid in self.users:
+            self.users[uid].discard(gid)
+            if len(self.users[uid]) == 0:
+                self.users.pop(uid)
+
+    """forget()
+    Remove a guild from the index
+
+    Parameters
+    ----------
+    gid: Integer, guild id
+    """
+    def forget(self : Members, gid : int) -> None:
+        if gid in self.guilds:
+            uid : int
+            member : bool
+            for uid, member in self.guilds.pop(gid)[1].items():
+                if member and uid in self.users:
+                    self.users[uid].discard(gid)
+                    if len(self.users[uid]) == 0:
+                        self.users.pop(uid)
+
+    """fetch()
+    Retrieve the members of a guild among a list of users, and update the index.
+    The member cache is used first, the others are requested in chunks.
+
+    Parameters
+    ----------
+    guild: disnake.Guild
+    uids: Iterable of user ids (in string or integer format)
+
+    Returns
+    --------
+    dict: User ids (in integer format) and their disnake.Member, for those in the guild
+    """
+    async def fetch(self : Members, guild : disnake.Guild, uids : Iterable[str|int]) -> dict[int, disnake.Member]:
+        members : dict[int, disnake.Member] = {}
+        missing : list[int] = []
+        uid : str|int
+        for uid in uids:
+            uid = int(uid)
+            m : disnake.Member|None = guild.get_member(uid)
+            if m is not None:
+                members[uid] = m
+                self.set(guild.id, uid, True)
+            elif guild.chunked: # the member cache is complete, the user isn't in the guild
+                self.set(guild.id, uid, False)
+            else:
+                missing.append(uid)
+        i : int
+        for i in range(0, len(missing), self.QUERY_LIMIT):
+            m : disnake.Member
+            for m in await guild.get_or_fetch_members(missing[i:i + self.QUERY_LIMIT]):
+                members[m.id] = m
+            for uid in missing[i:i + self.QUERY_LIMIT]:
+                self.set(guild.id, uid, uid in members)
+        return members
+
+    """update()
+    Check the membership of a list of users in every guild.
+    Only the users not already in the index, and not already known to be in a guild, are requested.
+
+    Parameters
+    ----------
+    uids: Iterable of user ids (in string or integer format)
+
+    Raises
+    ------
+    Exception: A request failed, the index isn't complete for these users
+    """
+    async def update(self : Members, uids : Iterable[str|int]) -> None:
+        ids : list[int] = [int(uid) for uid in uids]
+        gid : int
+        for gid in list(self.guilds.keys()): # remove the guilds the bot left
+            if not self.hasGuild(gid):
+                self.forget(gid)
+        g : disnake.Guild
+        for g in self.bot.guilds:
+            known : dict[int, bool] = self.entry(g.id)
+            missing : list[int] = [uid for uid in ids if uid not in known and uid not in self.users]
+            if len(missing) > 0:
+                await self.fetch(g, missing)
+
+    """isMember()
+    Check if an user is a member of a guild, according to the index.
+    Call update() first to make sure the index is complete (only for the any guild check).
+
+    Parameters
+    ----------
+    uid: User id (in string or integer format)
+    gid: Guild id (in string or integer format). If None, check if the user is a member of any guild.
+
+    Returns
+    --------
+    bool: True if the user is a member
+    """
+    def isMember(self : Members, uid : str|int, gid : str|int|None = None) -> bool:
+        guilds : set[int]|None = self.users.get(int(uid), None)
+        if guilds is None:
+            return False
+        return gid is None or int(gid) in guilds
+
+    """hasGuild()
+    Check if the bot is in a guild
+
+    Parameters
+    ----------
+    gid: Guild id (in string or integer format)
+
+    Returns
+    --------
+    bool: True if the bot is in the guild
+    """
+    def hasGuild(self : Members, gid : str|int) -> bool:
+        return self.bot.get_guild(int(gid)) is not None
+
+    """on_member_join()
+    Event. Requires the members intent.
+
+    Parameters
+    ----------
+    member: disnake.Member
+    """
+    def on_member_join(self : Members, member : disnake.Member) -> None:
+        if member.guild.id in self.guilds:
+            self.set(member.guild.id, member.id, True)
+
+    """on_member_remove()
+    Event. Requires the members intent.
+
+    Parameters
+    ----------
+    gid: Integer, guild id
+    uid: Integer, user id
+    """
+    def on_member_remove(self : Members, gid : int, uid : int) -> None:
+        if gid in self.guilds:
+            self.set(gid, uid, False)
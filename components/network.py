@@ -9,7 +9,14 @@ if TYPE_CHECKING:
 from enum import IntEnum
 from contextlib import asynccontextmanager
 import aiohttp
+import asyncio
 import re
+import os
+import json
+import time
+import lzma
+import base64
+from urllib.parse import urlencode
 from datetime import datetime, timedelta
 from deep_translator import GoogleTranslator
 
@@ -20,6 +27,140 @@ from deep_translator import GoogleTranslator
 # ----------------------------------------------------------------------
 
 
+# Response of a network exchange, with the body already read
+class NetworkResponse():
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self : NetworkResponse, status : int, headers : dict[str, str], body : bytes) -> None:
+        self.status : int = status
+        self.headers : dict[str, str] = headers # keys are lowercase
+        self.body : bytes = body
+
+    """json()
+    Decode the body as JSON
+
+    Returns
+    ----------
+    unknown: JSON object
+    """
+    def json(self : NetworkResponse) -> JSON:
+        return json.loads(self.body)
+
+
+# Fixture archive used to record and replay network exchanges, for offline testing and benchmarking
+class NetworkFixture():
+    class Mode(IntEnum):
+        RECORD : int = 0
+        REPLAY : int = 1
+
+    # Request parameters changing on every call, ignored in exchange keys
+    VOLATILE_PARAMS : set[str] = {"_", "t", "uid"}
+    # Response headers containing credentials, not recorded
+    SENSITIVE_HEADERS : set[str] = {"set-cookie", "authorization", "proxy-authorization", "www-authenticate"}
+
+    __slots__ = ("mode", "path", "latency", "exchanges", "cursors", "modified")
+
+    def __init__(self : NetworkFixture, mode : int, path : str, latency : float = 0) -> None:
+        self.mode : int = mode
+        self.path : str = path
+        self.latency : float = latency # simulated latency in seconds, used in replay mode
+        self.exchanges : dict[str, list[list[int|dict|str]]] = {} # key: list of [status, headers, base64 body]
+        self.cursors : dict[str, int] = {} # replay position of each key
+        self.modified : bool = False
+        if mode == self.Mode.REPLAY or os.path.isfile(path):
+            self.load()
+
+    """load()
+    Load the fixture archive (LZMA compressed JSON)
+    """
+    def load(self : NetworkFixture) -> None:
+        with lzma.open(self.path, mode="rt", encoding="utf-8") as f:
+            self.exchanges = json.load(f)
+        self.cursors = {}
+
+    """save()
+    Write the fixture archive, if it has been modified
+    """
+    def save(self : NetworkFixture) -> None:
+        if not self.modified:
+            return
+        with lzma.open(self.path + ".tmp", mode="wt", encoding="utf-8") as f:
+            json.dump(self.exchanges, f, separators=(',', ':'))
+        os.replace(self.path + ".tmp", self.path)
+        self.modified = False
+
+    """key()
+    Build the key identifying a request
+
+    Parameters
+    ----------
+    rtype: Integer, request method
+    url: String, request url
+    params: Dict, request parameters
+    payload: Dict, request payload
+
+    Returns
+    ----------
+    str: The key
+    """
+    def key(self : NetworkFixture, rtype : int, url : str, params : dict|None, payload : dict|None) -> str:
+        k : str = str(int(rtype)) + " " + url
+        if params:
+            k += "?" + urlencode(sorted(
+                (str(x), str(y)) for x, y in params.items()
+                if x not in self.VOLATILE_PARAMS
+            ))
+        if payload is not None:
+            k += " " + json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return k
+
+    """record()
+    Add an exchange to the archive.
+    The headers containing credentials are stripped.
+
+    Parameters
+    ----------
+    key: String, the request key
+    response: NetworkResponse, the response received
+    """
+    def record(self : NetworkFixture, key : str, response : NetworkResponse) -> None:
+        if key not in self.exchanges:
+            self.exchanges[key] = []
+        self.exchanges[key].append([
+            response.status,
+            {k : v for k, v in response.headers.items() if k not in self.SENSITIVE_HEADERS},
+            base64.b64encode(response.body).decode("ascii")
+        ])
+        self.modified = True
+
+    """replay()
+    Coroutine returning the next recorded response for a request.
+    Responses of a same key are replayed in the order they have been recorded.
+    The last one is repeated once the recording is exhausted.
+
+    Parameters
+    ----------
+    key: String, the request key
+
+    Raises
+    ----------
+    Exception: If the request hasn't been recorded
+
+    Returns
+    ----------
+    NetworkResponse: The recorded response
+    """
+    async def replay(self : NetworkFixture, key : str) -> NetworkResponse:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        if key not in self.exchanges:
+            raise Exception(f"No recorded exchange for `{key}`")
+        i : int = self.cursors.get(key, 0)
+        entry : list[int|dict|str] = self.exchanges[key][min(i, len(self.exchanges[key]) - 1)]
+        self.cursors[key] = i + 1
+        return NetworkResponse(entry[0], entry[1], base64.b64decode(entry[2]))
+
+
 class Network():
     VERSION_REGEX : list[re.Pattern] = [ # possible regex to detect the GBF game version
         re.compile("\"version\": \"(\\d+)\""), # new one
@@ -45,9 +186,23 @@ class Network():
         "Chrome/144.0.0.0 Safari/537.36"
     )
 
+    # Wiki response cache
+    WIKI_CACHE_FILE : str = "wiki_cache.json"
+    WIKI_CACHE_LIMIT : int = 300 # maximum number of cached responses
+    WIKI_CACHE_INTERVAL : int = 600 # time, in seconds, between each write of the modified cache
+    # Time to live, in seconds, of each query class
+    # Once expired, an entry is revalidated using its ETag/Last-Modified headers
+    WIKI_CACHE_TTL : dict[str, int] = {
+        "schedule":3600, # event_history cargo table, used by the daily maintenance
+        "grand":43200, # characters cargo table, for the grand list
+        "interval":43200, # wait interval pages
+        "search":604800, # item id lookups, those don't change
+        "gwdata":3600 # unite and fight data pages
+    }
+
     __slots__ = (
         "bot", "user_agent", "translator", "client", "client_req",
-        "gbf_client", "gbf_client_req", "gbf_account_failed"
+        "gbf_client", "gbf_client_req", "gbf_account_failed", "wiki_cache", "wiki_cache_dirty", "fixture"
     )
 
     def __init__(self : Network, bot : DiscordBot) -> None:
@@ -61,9 +216,212 @@ class Network():
         self.gbf_client : aiohttp.ClientSession|None = None
         self.gbf_client_req : dict[int, Callable] = {}
         self.gbf_account_failed : bool = False
+        self.wiki_cache : dict[str, dict[str, str|float|None]] = {}
+        self.wiki_cache_dirty : bool = False # True if the cache must be written to the disk
+        self.fixture : NetworkFixture|None = None
 
     def init(self : Network) -> None:
-        pass
+        self.load_wiki_cache()
+
+    def startTasks(self : Network) -> None:
+        self.bot.runTask('net:wiki_cache', self.wiki_cache_task)
+
+    """load_wiki_cache()
+    Load the wiki response cache from the disk, if it exists
+    """
+    def load_wiki_cache(self : Network) -> None:
+        try:
+            if os.path.isfile(self.WIKI_CACHE_FILE):
+                with open(self.WIKI_CACHE_FILE, mode="r", encoding="utf-8") as f:
+                    self.wiki_cache = json.load(f)
+                self.bot.logger.push(
+                    f"[NET] {len(self.wiki_cache)} wiki response(s) loaded from the cache",
+                    send_to_discord=False
+                )
+        except Exception as e:
+            self.wiki_cache = {}
+            self.bot.logger.pushError("[NET] Couldn't load the wiki cache:", e, send_to_discord=False)
+
+    """snapshot_wiki_cache()
+    Return a copy of the wiki response cache to write, if it has been modified.
+    The oldest entries are dropped if the cache is over its limit.
+    Must be called from the event loop thread.
+
+    Returns
+    ----------
+    dict: The copy, None if there is nothing to write
+    """
+    def snapshot_wiki_cache(self : Network) -> dict[str, dict[str, str|float|None]]|None:
+        if not self.wiki_cache_dirty:
+            return None
+        if len(self.wiki_cache) > self.WIKI_CACHE_LIMIT:
+            keys : list[str] = sorted(self.wiki_cache, key=lambda k : self.wiki_cache[k]['time'])
+            k : str
+            for k in keys[:len(keys) - self.WIKI_CACHE_LIMIT]:
+                self.wiki_cache.pop(k, None)
+        self.wiki_cache_dirty = False
+        return dict(self.wiki_cache)
+
+    """write_wiki_cache()
+    Write a copy of the wiki response cache to the disk.
+    Can run in a worker thread.
+
+    Parameters
+    ----------
+    data: Dict, copy from snapshot_wiki_cache()
+
+    Returns
+    ----------
+    bool: True on success, False on failure
+    """
+    def write_wiki_cache(self : Network, data : dict[str, dict[str, str|float|None]]) -> bool:
+        try:
+            # write to a temporary file first, to not corrupt the cache on failure
+            with open(self.WIKI_CACHE_FILE + ".tmp", mode="w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(self.WIKI_CACHE_FILE + ".tmp", self.WIKI_CACHE_FILE)
+            return True
+        except Exception as e:
+            self.bot.logger.pushError("[NET] Couldn't save the wiki cache:", e, send_to_discord=False)
+            return False
+
+    """save_wiki_cache()
+    Write the wiki response cache to the disk, if it has been modified, synchronously.
+    Used when exiting, wiki_cache_task() writes it otherwise.
+    """
+    def save_wiki_cache(self : Network) -> None:
+        data : dict[str, dict[str, str|float|None]]|None = self.snapshot_wiki_cache()
+        if data is not None:
+            self.write_wiki_cache(data)
+
+    """wiki_cache_task()
+    Bot Task writing the modified wiki response cache periodically
+    """
+    async def wiki_cache_task(self : Network) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.WIKI_CACHE_INTERVAL)
+                data : dict[str, dict[str, str|float|None]]|None = self.snapshot_wiki_cache()
+                if data is not None and not await asyncio.to_thread(self.write_wiki_cache, data):
+                    self.wiki_cache_dirty = True # try again later
+            except asyncio.CancelledError:
+                self.save_wiki_cache()
+                self.bot.logger.push("[TASK] 'net:wiki_cache' Task Cancelled")
+                return
+            except Exception as e:
+                self.bot.logger.pushError("[TASK] 'net:wiki_cache' Task Error:", e)
+
+    """clear_wiki_cache()
+    Empty the wiki response cache
+
+    Parameters
+    ----------
+    cache: String (Optional), only remove entries of this query class
+
+    Returns
+    ----------
+    int: Number of removed entries
+    """
+    def clear_wiki_cache(self : Network, cache : str|None = None) -> int:
+        keys : list[str] = [
+            k for k, v in self.wiki_cache.items()
+            if cache is None or v['class'] == cache
+        ]
+        k : str
+        for k in keys:
+            self.wiki_cache.pop(k, None)
+        if len(keys) > 0:
+            self.wiki_cache_dirty = True
+        return len(keys)
+
+    """save_fixture()
+    Write the fixture archive to the disk, if one is set and has been modified.
+    Used when exiting.
+    """
+    def save_fixture(self : Network) -> None:
+        if self.fixture is not None:
+            try:
+                self.fixture.save()
+            except Exception as e:
+                self.bot.logger.pushError("[NET] Couldn't save the network fixture:", e, send_to_discord=False)
+
+    """set_fixture()
+    Record or replay the network exchanges using a fixture archive.
+    Must be called before the clients are initialized.
+
+    Parameters
+    ----------
+    mode: Integer, NetworkFixture.Mode value
+    path: String, path to the archive file
+    latency: Float, simulated latency in seconds, for the replay mode
+    """
+    def set_fixture(self : Network, mode : int, path : str, latency : float = 0) -> None:
+        self.fixture = NetworkFixture(mode, path, latency)
+        self.bot.logger.push(
+            "[NET] Network exchanges will be {} `{}`".format(
+                "recorded to" if mode == NetworkFixture.Mode.RECORD else "replayed from",
+                path
+            ),
+            send_to_discord=False
+        )
+
+    """fetch()
+    Coroutine doing the actual network exchange, used by the request functions.
+    The body is fully read before returning.
+    If a fixture is set, the exchange is recorded or replayed.
+
+    Parameters
+    ----------
+    methods: Dict, client request methods to use
+    rtype: Integer, request method. Always POST if a payload is set.
+    url: String, url to request
+    params: Dict, request parameters
+    headers: Dict, request headers
+    payload: Dict, POST request payload
+    allow_redirects: Bool, set to True to follow redirects
+    **options: Additional parameters passed to aiohttp
+
+    Returns
+    ----------
+    NetworkResponse: The response
+    """
+    async def fetch(
+        self : Network,
+        methods : dict[int, Callable],
+        rtype : int,
+        url : str,
+        *,
+        params : dict|None = None,
+        headers : dict = {},
+        payload : dict|None = None,
+        allow_redirects : bool = False,
+        **options
+    ) -> NetworkResponse:
+        key : str|None = None
+        if self.fixture is not None:
+            key = self.fixture.key(rtype, url, params, payload)
+            if self.fixture.mode == NetworkFixture.Mode.REPLAY:
+                return await self.fixture.replay(key)
+        if payload is not None:
+            options['json'] = payload
+        response : aiohttp.HTTPResponse = await (methods.get(rtype, self.unknown_req))(
+            url,
+            params=params,
+            headers=headers,
+            allow_redirects=allow_redirects,
+            **options
+        )
+        async with response:
+            # copy the headers. Only the first value of duplicate headers is kept, like aiohttp does
+            rheaders : dict[str, str] = {}
+            k : str
+            v : str
+            for k, v in response.headers.items():
+                rheaders.setdefault(k.lower(), v)
+            result : NetworkResponse = NetworkResponse(response.status, rheaders, await response.read())
+        if key is not None:
+            self.fixture.record(key, result)
+        return result
 
     """update_user_agent()
     Automatically update the default Chrome user agent used by Rosetta
@@ -71,20 +429,21 @@ class Network():
     async def update_user_agent(self : Network) -> None:
         try:
             # access this list of user agents
-            response : aiohttp.HTTPResponse = await self.client.get(
+            response : NetworkResponse = await self.fetch(
+                self.client_req,
+                self.Method.GET,
                 "https://jnrbsn.github.io/user-agents/user-agents.json"
             )
-            async with response:
-                if 200 <= response.status < 400:
-                    ua : str
-                    for ua in await response.json(): # look for the latest chrome one...
-                        if "Windows" in ua and "Chrome" in ua:
-                            self.user_agent = ua + ' Rosetta/' + self.bot.VERSION # and update our user agent
-                            self.bot.logger.push(
-                                f"[NET] Default user-agent set to `{self.user_agent}`",
-                                send_to_discord=False
-                            )
-                            return
+            if 200 <= response.status < 400:
+                ua : str
+                for ua in response.json(): # look for the latest chrome one...
+                    if "Windows" in ua and "Chrome" in ua:
+                        self.user_agent = ua + ' Rosetta/' + self.bot.VERSION # and update our user agent
+                        self.bot.logger.push(
+                            f"[NET] Default user-agent set to `{self.user_agent}`",
+                            send_to_discord=False
+                        )
+                        return
             raise Exception("Missing data")
         except Exception as e:
             self.bot.logger.pushError(
@@ -124,6 +483,7 @@ class Network():
         finally: # close the clients properly
             await self.client.close()
             await self.gbf_client.close()
+            self.save_fixture()
 
     """unknown_req
     Do nothing. Used for error handling
@@ -177,42 +537,35 @@ class Network():
             # Add user agent
             if add_user_agent and 'User-Agent' not in headers:
                 headers['User-Agent'] = self.user_agent
-            response : aiohttp.HTTPResponse
-            if payload is None: # call request method with given parameters
-                response = await (self.client_req.get(rtype, self.unknown_req))(
-                    url,
-                    params=params,
-                    headers=headers,
-                    allow_redirects=allow_redirects,
-                    ssl=ssl
-                )
-            else: # the request is always POST if we have a payload
+            if payload is not None: # the request is always POST if we have a payload
                 rtype = self.Method.POST
-                response = await self.client.post(
-                    url,
-                    params=params,
-                    headers=headers,
-                    json=payload,
-                    allow_redirects=allow_redirects,
-                    ssl=ssl
-                )
-            async with response:
-                # raise Exception if our HTTP code isn't in the 200-399 range
-                if response.status >= 400 or response.status < 200:
-                    raise Exception()
-                ct : str = response.headers.get('content-type', '')
-                is_json : bool = 'application/json' in ct
-                # raise error if we expected a json and it's not
-                if expect_JSON and not is_json:
-                    raise Exception(f"Expected `application/json`, got `{ct}`")
-                if rtype == self.Method.HEAD: # HEAD request, we simply return True to signify it's successful
-                    return True
-                elif is_json: # JSON, we return it as a JSON object
-                    return await response.json()
-                elif response.status == 204:
-                    return True
-                else: # else, binary
-                    return await response.read()
+            # call request method with given parameters
+            response : NetworkResponse = await self.fetch(
+                self.client_req,
+                rtype,
+                url,
+                params=params,
+                headers=headers,
+                payload=payload,
+                allow_redirects=allow_redirects,
+                ssl=ssl
+            )
+            # raise Exception if our HTTP code isn't in the 200-399 range
+            if response.status >= 400 or response.status < 200:
+                raise Exception()
+            ct : str = response.headers.get('content-type', '')
+            is_json : bool = 'application/json' in ct
+            # raise error if we expected a json and it's not
+            if expect_JSON and not is_json:
+                raise Exception(f"Expected `application/json`, got `{ct}`")
+            if rtype == self.Method.HEAD: # HEAD request, we simply return True to signify it's successful
+                return True
+            elif is_json: # JSON, we return it as a JSON object
+                return response.json()
+            elif response.status == 204:
+                return True
+            else: # else, binary
+                return response.body
         except Exception as e:
             if str(e) != "":
                 self.bot.logger.pushError(f"[NET] request `{url}` Error:", e) # log unexpected errors
@@ -308,15 +661,7 @@ class Network():
             params["t"] = str(ts + 300) # second timestamp is always a bit further.
             # Note for above: No idea if a random number would be better
             params["uid"] = str(acc['id'])
-            response : aiohttp.HTTPResponse
-            if payload is None: # call request method with given parameters
-                response = await (self.gbf_client_req.get(rtype, self.unknown_req))(
-                    url,
-                    params=params,
-                    headers=headers,
-                    allow_redirects=allow_redirects
-                )
-            else: # if we have a payload, it's always a POST request
+            if payload is not None: # if we have a payload, it's always a POST request
                 rtype = self.Method.POST
                 # auto set 'user_id' in the payload according to its value
                 if 'user_id' in payload:
@@ -324,56 +669,58 @@ class Network():
                         case "ID": payload['user_id'] = acc['id']
                         case "SID": payload['user_id'] = str(acc['id'])
                         case "IID": payload['user_id'] = int(acc['id'])
-                # do the request
-                response = await self.gbf_client.post(
-                    url,
-                    params=params,
-                    headers=headers,
-                    json=payload,
-                    allow_redirects=allow_redirects
-                )
-            # response handling
-            async with response:
-                # error if our HTTP code isn't in the 200-399 range
-                if response.status >= 400 or response.status < 200:
-                    # if _updated_ isn't raised, it MIGHT be due to an invalid version (in case an update happened)
-                    if not _updated_:
-                        x : int|str|None = await self.gbf_version() # in that case, we check for an update
-                        if x is not None and not isinstance(x, str) and x >= 2:
-                            # x = 2: our version number in memory wasn't set
-                            # x = 3: an update occured
-                            if x == 3:
-                                _updated_ = True # raise updated flag because an update occured
-                            # we try this request again
-                            return await self.requestGBF(
-                                path,
-                                rtype,
-                                params,
-                                payload,
-                                allow_redirects,
-                                expect_JSON,
-                                _updated_
-                            )
-                    # else, raise exception
-                    raise Exception()
-                # check content type
-                ct : str = response.headers.get('content-type', '')
-                is_json : bool = 'application/json' in ct
-                if expect_JSON and not is_json: # we expected a json but we didn't receive one
-                    self.set_account_state(self.AccountStatus.DOWN) # the account is likely down
-                    return None
-                # retrieve cookies
-                if 'set-cookie' in response.headers:
-                    self.set_account_cookie(response.headers['set-cookie']) # and update our copy
-                # result
-                if rtype == self.Method.HEAD: # HEAD request returns True to signify success
-                    return True
-                elif is_json: # JSON, we return the json object
-                    return await response.json()
-                elif response.status == 204:
-                    return True
-                else: # else the binary
-                    return await response.read()
+            # do the request
+            response : NetworkResponse = await self.fetch(
+                self.gbf_client_req,
+                rtype,
+                url,
+                params=params,
+                headers=headers,
+                payload=payload,
+                allow_redirects=allow_redirects
+            )
+            # error if our HTTP code isn't in the 200-399 range
+            if response.status >= 400 or response.status < 200:
+                # if _updated_ isn't raised, it MIGHT be due to an invalid version (in case an update happened)
+                if not _updated_:
+                    x : int|str|None = await self.gbf_version() # in that case, we check for an update
+                    if x is not None and not isinstance(x, str) and x >= 2:
+                        # x = 2: our version number in memory wasn't set
+                        # x = 3: an update occured
+                        if x == 3:
+                            _updated_ = True # raise updated flag because an update occured
+                        # we try this request again
+                        return await self.requestGBF(
+                            path,
+                            rtype=rtype,
+                            params=params,
+                            payload=payload,
+                            allow_redirects=allow_redirects,
+                            expect_JSON=expect_JSON,
+                            _updated_=_updated_
+                        )
+                # else, raise exception
+                raise Exception()
+            # check content type
+            ct : str = response.headers.get('content-type', '')
+            is_json : bool = 'application/json' in ct
+            if expect_JSON and not is_json: # we expected a json but we didn't receive one
+                self.set_account_state(self.AccountStatus.DOWN) # the account is likely down
+                return None
+            # retrieve cookies (not when replaying, older archives might contain them)
+            if 'set-cookie' in response.headers and (
+                self.fixture is None or self.fixture.mode != NetworkFixture.Mode.REPLAY
+            ):
+                self.set_account_cookie(response.headers['set-cookie']) # and update our copy
+            # result
+            if rtype == self.Method.HEAD: # HEAD request returns True to signify success
+                return True
+            elif is_json: # JSON, we return the json object
+                return response.json()
+            elif response.status == 204:
+                return True
+            else: # else the binary
+                return response.body
         except Exception as e:
             if str(e) != "":
                 self.bot.logger.pushError(
@@ -386,12 +733,16 @@ class Network():
     """requestWiki()
     Coroutine to request the gbf.wiki.
     Only support GET requests.
+    JSON responses can be cached on the disk by setting a query class (see WIKI_CACHE_TTL).
+    A fresh entry is returned without any request.
+    An expired one is revalidated with the ETag/Last-Modified headers sent by the wiki.
 
     Parameters
     ----------
     path: Url path.
     params: Dict. Request parameters.
     allow_redirects: Bool, set to True to follow redirects.
+    cache: String (Optional), query class of the request, to enable the cache.
 
     Returns
     ----------
@@ -401,7 +752,8 @@ class Network():
         self : Network,
         path : str,
         params : dict = {},
-        allow_redirects : bool = False
+        allow_redirects : bool = False,
+        cache : str|None = None
     ) -> RequestResult:
         try:
             # build the URL
@@ -410,34 +762,68 @@ class Network():
                 url = "https://gbf.wiki/" + path
             else:
                 url = "https://gbf.wiki" + path
+            headers : dict[str, str] = {
+                'Connection':'keep-alive',
+                'User-Agent':self.user_agent,
+                "Accept":"text/html,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+                "Accept-Encoding":"gzip, deflate",
+                "Accept-Language":"en-US,en;q=0.9",
+                'Host':'gbf.wiki',
+                'Origin':'https://gbf.wiki',
+                "Referer":"https://gbf.wiki/"
+            }
+            # check the cache
+            key : str|None = None
+            entry : dict[str, str|float|None]|None = None
+            if cache in self.WIKI_CACHE_TTL:
+                key = url + "?" + urlencode(sorted(params.items()))
+                entry = self.wiki_cache.get(key, None)
+                if entry is not None:
+                    if time.time() - entry['time'] < self.WIKI_CACHE_TTL[cache]:
+                        return json.loads(entry['data']) # still fresh
+                    # expired, revalidate
+                    if entry['etag'] is not None:
+                        headers['If-None-Match'] = entry['etag']
+                    if entry['modified'] is not None:
+                        headers['If-Modified-Since'] = entry['modified']
             # make the GET request with given parameters
-            response : aiohttp.HTTPResponse = await self.client.get(
+            response : NetworkResponse = await self.fetch(
+                self.client_req,
+                self.Method.GET,
                 url,
-                headers={
-                    'Connection':'keep-alive',
-                    'User-Agent':self.user_agent,
-                    "Accept":"text/html,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-                    "Accept-Encoding":"gzip, deflate",
-                    "Accept-Language":"en-US,en;q=0.9",
-                    'Host':'gbf.wiki',
-                    'Origin':'https://gbf.wiki',
-                    "Referer":"https://gbf.wiki/"
-                },
+                headers=headers,
                 params=params,
                 timeout=8,
                 allow_redirects=allow_redirects
             )
-            async with response:
-                if response.status == 403:
-                    # if you get this error, contact the wiki admins to get your user-agent whitelisted
-                    raise Exception("HTTP Error 403 - Possibly Cloudflare related")
-                elif response.status >= 400 or response.status < 200: # valid error codes
-                    raise Exception("HTTP Error " + str(response.status))
-                # result
-                if response.headers.get('content-type', '').startswith('application/json'): # JSON content
-                    return await response.json()
-                else: # binary content
-                    return await response.read()
+            if response.status == 304 and entry is not None: # not modified
+                # Note: not worth a write, the new time will be saved with the next modification
+                entry['time'] = time.time()
+                return json.loads(entry['data'])
+            elif response.status == 403:
+                # if you get this error, contact the wiki admins to get your user-agent whitelisted
+                raise Exception("HTTP Error 403 - Possibly Cloudflare related")
+            elif response.status >= 400 or response.status < 200: # valid error codes
+                raise Exception("HTTP Error " + str(response.status))
+            # result
+            if response.headers.get('content-type', '').startswith('application/json'): # JSON content
+                if key is None:
+                    return response.json()
+                raw : str = response.body.decode('utf-8')
+                data : JSON = json.loads(raw)
+                # store in the cache, except empty cargo results (the page might be added to the wiki soon)
+                if data != [] and not (isinstance(data, dict) and data.get('cargoquery', None) == []):
+                    self.wiki_cache[key] = {
+                        "class":cache,
+                        "time":time.time(),
+                        "etag":response.headers.get('etag', None),
+                        "modified":response.headers.get('last-modified', None),
+                        "data":raw
+                    }
+                    self.wiki_cache_dirty = True
+                return data
+            else: # binary content
+                return response.body
         except Exception as e:
             self.bot.logger.pushError(f"[NET] requestWiki `{path}` Error:", e)
             return None
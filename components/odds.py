@@ -0,0 +1,231 @@
+from __future__ import annotations
+from typing import Sequence
+from math import comb
+
+# ----------------------------------------------------------------------
+# Odds Module
+# ----------------------------------------------------------------------
+# Exact outcome distributions of a number of gacha rolls.
+# Distributions are lists of probabilities per count, truncated:
+# the last element is the probability of this count OR MORE.
+# Not a bot component: it doesn't depend on the bot and can be used by the tools.
+# ----------------------------------------------------------------------
+
+LIMIT : int = 30 # default number of counts tracked by the distributions
+
+"""convolve()
+Combine the distributions of two independent counts
+
+Parameters
+----------
+a: List, first distribution
+b: List, second distribution
+limit: Integer, size of the resulting distribution
+
+Returns
+--------
+list: Distribution of the sum of both counts
+"""
+def convolve(a : Sequence[float], b : Sequence[float], limit : int) -> list[float]:
+    result : list[float] = [0.0] * limit
+    i : int
+    j : int
+    pa : float
+    pb : float
+    for i, pa in enumerate(a):
+        if pa == 0.0:
+            continue
+        for j, pb in enumerate(b):
+            result[min(i + j, limit - 1)] += pa * pb
+    return result
+
+"""power()
+Combine the distributions of independent, identical counts, by squaring
+
+Parameters
+----------
+dist: List, distribution of one count
+times: Integer, number of counts
+limit: Integer, size of the resulting distribution
+
+Returns
+--------
+list: Distribution of the sum of the counts
+"""
+def power(dist : Sequence[float], times : int, limit : int) -> list[float]:
+    result : list[float] = [1.0] + [0.0] * (limit - 1)
+    base : list[float] = convolve(dist, [1.0], limit)
+    while times > 0:
+        if times & 1:
+            result = convolve(result, base, limit)
+        times >>= 1
+        if times > 0:
+            base = convolve(base, base, limit)
+    return result
+
+"""binomial()
+Distribution of the number of hits over a number of rolls
+
+Parameters
+----------
+p: Float, probability of a hit per roll (0 to 1)
+n: Integer, number of rolls
+limit: Integer, size of the distribution
+
+Returns
+--------
+list: The distribution
+"""
+def binomial(p : float, n : int, limit : int = LIMIT) -> list[float]:
+    return power((1.0 - p, p), n, limit)
+
+"""ten_draw()
+Distribution of the number of hits in a ten-draw
+
+Parameters
+----------
+p: Float, probability of a hit per roll (0 to 1)
+guaranteed: Boolean, True if a ten-draw always contains one hit (i.e. the SR guarantee for SR or better)
+limit: Integer, size of the distribution
+
+Returns
+--------
+list: The distribution
+"""
+def ten_draw(p : float, guaranteed : bool, limit : int = LIMIT) -> list[float]:
+    dist : list[float] = binomial(p, 10, limit)
+    if guaranteed: # the 10th roll is forced if the 9 others missed
+        dist[min(1, limit - 1)] += dist[0]
+        dist[0] = 0.0
+    return dist
+
+"""hits()
+Distribution of the number of hits over a number of rolls, done by ten-draws when possible
+
+Parameters
+----------
+p: Float, probability of a hit per roll (0 to 1)
+n: Integer, number of rolls
+guaranteed: Boolean, True if a ten-draw always contains one hit
+limit: Integer, size of the distribution
+
+Returns
+--------
+list: The distribution
+"""
+def hits(p : float, n : int, guaranteed : bool = False, limit : int = LIMIT) -> list[float]:
+    if not guaranteed:
+        return binomial(p, n, limit)
+    return convolve(power(ten_draw(p, True, limit), n // 10, limit), binomial(p, n % 10, limit), limit)
+
+"""at_least()
+Convert a distribution to the probabilities of getting at least each count
+
+Parameters
+----------
+dist: List, the distribution
+
+Returns
+--------
+list: Probability of getting at least 0, 1, 2... hits
+"""
+def at_least(dist : Sequence[float]) -> list[float]:
+    result : list[float] = [0.0] * len(dist)
+    total : float = 0.0
+    i : int
+    for i in range(len(dist) - 1, -1, -1):
+        total += dist[i]
+        result[i] = min(1.0, total)
+    return result
+
+"""distinct()
+Distribution of the number of different targets obtained over a number of rolls.
+Exact, by inclusion-exclusion over how many targets of each rate are missed.
+
+Parameters
+----------
+targets: List of tuples, rate of a target (0 to 1) and number of targets with this rate
+n: Integer, number of rolls
+
+Returns
+--------
+list: Probability of getting exactly 0, 1, 2... different targets, up to all of them
+"""
+def distinct(targets : Sequence[tuple[float, int]], n : int) -> list[float]:
+    total : int = sum(count for rate, count in targets)
+    result : list[float] = [0.0] * (total + 1)
+    # enumerate how many targets of each rate are allowed, the others must be missed
+    allowed : list[tuple[int, float, int]] = [(0, 0.0, 1)] # allowed count, missed rate, number of combinations
+    rate : float
+    count : int
+    for rate, count in targets:
+        allowed = [
+            (a + k, m + (count - k) * rate, c * comb(count, k))
+            for a, m, c in allowed
+            for k in range(count + 1)
+        ]
+    a : int
+    m : float
+    c : int
+    for a, m, c in allowed:
+        q : float = c * max(0.0, 1.0 - m) ** n # probability to only get allowed targets, for all combinations
+        d : int
+        for d in range(a, total + 1): # obtained set of size d, containing the a allowed targets
+            result[d] += (-1) ** (d - a) * comb(total - a, d - a) * q
+    return [min(1.0, max(0.0, x)) for x in result]
+
+
+# Exact outcomes of a banner, memoized per roll count
+class Odds():
+    CACHE_SIZE : int = 50
+
+    __slots__ = ("ssr", "sr", "rateup", "targets", "cache")
+
+    """constructor
+
+    Parameters
+    ----------
+    ssr: Float, SSR rate (0 to 1)
+    sr: Float, SR rate (0 to 1)
+    targets: List of tuples, rate (0 to 1) of the rate up SSRs and number of SSRs with this rate
+    """
+    def __init__(self : Odds, ssr : float, sr : float, targets : Sequence[tuple[float, int]]) -> None:
+        self.ssr : float = ssr
+        self.sr : float = sr
+        self.targets : tuple[tuple[float, int], ...] = tuple(t for t in targets if t[1] > 0)
+        self.rateup : float = sum(rate * count for rate, count in self.targets)
+        self.cache : dict[int, dict] = {}
+
+    """compute()
+    Compute the outcomes of a number of rolls.
+    The result must not be modified.
+
+    Parameters
+    ----------
+    n: Integer, number of rolls
+
+    Returns
+    --------
+    dict: Containing:
+        - 'expected': Expected number of SSRs, SRs and rate up SSRs
+        - 'ssr': Probability of getting at least 0, 1, 2... SSRs
+        - 'srssr': Probability of getting at least 0, 1, 2... SRs or SSRs (with the ten-draw SR guarantee)
+        - 'rateup': Probability of getting at least 0, 1, 2... rate up SSRs (copies included)
+        - 'distinct': Probability of getting at least 0, 1, 2... different rate up SSRs, up to all of them
+    """
+    def compute(self : Odds, n : int) -> dict:
+        if n in self.cache:
+            return self.cache[n]
+        # SR guarantee: the 10th roll of a ten-draw is a SR when the 9 others and itself aren't SR or better
+        forced : float = (n // 10) * (1.0 - self.ssr - self.sr) ** 10
+        result : dict = {
+            'expected': (n * self.ssr, n * self.sr + forced, n * self.rateup),
+            'ssr': at_least(hits(self.ssr, n)),
+            'srssr': at_least(hits(self.ssr + self.sr, n, True)),
+            'rateup': at_least(hits(self.rateup, n)),
+            'distinct': at_least(distinct(self.targets, n))
+        }
+        if len(self.cache) >= self.CACHE_SIZE: # remove the oldest
+            self.cache.pop(next(iter(self.cache)))
+        self.cache[n] = result
+        return result
@@ -1,6 +1,8 @@
 from __future__ import annotations
 import disnake
 import asyncio
+from collections import OrderedDict
+import time
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from ..bot import DiscordBot
@@ -23,17 +25,124 @@ class Pinboard():
         'png:medium', 'png:large', 'png:orig'
     ]
     IMG_EXT_TUPLE : tuple[str, ...] = tuple(IMG_EXT)
+    CACHE_SIZE : int = 50 # maximum number of pinned message ids remembered per guild
+    CACHE_TTL : int = 86400 # time, in seconds, a pinned message id is remembered
+    MEMBER_QUERY_LIMIT : int = 100 # maximum number of members per gateway query
 
-    __slots__ = ("bot", "cache")
+    __slots__ = ("bot", "cache", "index", "index_source")
 
     def __init__(self : Pinboard, bot : DiscordBot) -> None:
         self.bot : DiscordBot = bot
         self.bot.reaction_hooks['pinboard'] = self.pin # hook pin function
-        self.cache : list[int] = [] # store pinned messages until reboot
+        # recently pinned message ids and the time they were pinned, per guild (least recently used first)
+        self.cache : dict[str, OrderedDict[int, float]] = {}
+        # tracked channel ids and their guild id (in string format)
+        self.index : dict[int, str] = {}
+        # pinboard data the index was built from
+        self.index_source : JSON|None = None
 
     def init(self : Pinboard) -> None:
         pass
 
+    """reindex()
+    Rebuild the tracked channel index.
+    Must be called when the tracked channels are modified.
+    """
+    def reindex(self : Pinboard) -> None:
+        self.index_source = self.bot.data.save['pinboard']
+        self.index = {
+            int(cid) : gid
+            for gid, settings in self.index_source.items()
+            for cid in settings['tracked']
+        }
+
+    """is_pinned()
+    Check if a message has been pinned recently
+
+    Parameters
+    ----------
+    gid: String, guild id
+    mid: Integer, message id
+
+    Returns
+    ----------
+    bool: True if it's in the cache
+    """
+    def is_pinned(self : Pinboard, gid : str, mid : int) -> bool:
+        entries : OrderedDict[int, float]|None = self.cache.get(gid, None)
+        if entries is None or mid not in entries:
+            return False
+        if time.monotonic() - entries[mid] > self.CACHE_TTL: # expired
+            entries.pop(mid)
+            return False
+        entries.move_to_end(mid)
+        return True
+
+    """add_pinned()
+    Add a message to the cache of recently pinned messages
+
+    Parameters
+    ----------
+    gid: String, guild id
+    mid: Integer, message id
+    """
+    def add_pinned(self : Pinboard, gid : str, mid : int) -> None:
+        if gid not in self.cache:
+            self.cache[gid] = OrderedDict()
+        entries : OrderedDict[int, float] = self.cache[gid]
+        now : float = time.monotonic()
+        entries[mid] = now
+        entries.move_to_end(mid)
+        # remove the least recently used and the expired entries
+        while len(entries) > self.CACHE_SIZE or now - next(iter(entries.values())) > self.CACHE_TTL:
+            entries.popitem(last=False)
+
+    """has_moderator()
+    Check if an user of a list is a moderator (i.e. has the Manage Messages permission)
+    Members missing from the cache are requested in batches.
+
+    Parameters
+    ----------
+    guild: disnake.Guild
+    users: List of disnake.User or disnake.Member
+
+    Returns
+    ----------
+    bool: True if one of them is a moderator
+    """
+    async def has_moderator(self : Pinboard, guild : disnake.Guild, users : list[disnake.User]) -> bool:
+        missing : list[int] = []
+        u : disnake.User
+        for u in users:
+            m : disnake.Member|None = u if isinstance(u, disnake.Member) else guild.get_member(u.id)
+            if m is None:
+                missing.append(u.id)
+            elif m.guild_permissions.manage_messages:
+                return True
+        i : int
+        for i in range(0, len(missing), self.MEMBER_QUERY_LIMIT):
+            m : disnake.Member
+            for m in await guild.get_or_fetch_members(missing[i:i + self.MEMBER_QUERY_LIMIT]):
+                if m.guild_permissions.manage_messages:
+                    return True
+        return False
+
+    """tracked()
+    Return the guild tracking a channel
+
+    Parameters
+    ----------
+    channel_id: Integer, channel id
+
+    Returns
+    ----------
+    str: Guild id (in string format), None if the channel isn't tracked
+    """
+    def tracked(self : Pinboard, channel_id : int) -> str|None:
+        if self.index_source is not self.bot.data.save['pinboard']: # the save data changed
+            self.reindex()
+        return self.index.get(channel_id, None)
+
     """pin_addmessage()
     Subroutine of pin() to add the message content to the embed
 
@@ -163,81 +272,60 @@ class Pinboard():
     """
     async def pin(self : Pinboard, payload : disnake.RawReactionActionEvent) -> bool:
         try:
-            idx : str|None = None # guild id
+            # check if the pinboard is enabled for that guild, and the emoji, before anything else
+            if payload.guild_id is None:
+                return False
+            idx : str = str(payload.guild_id) # guild id
+            settings : JSON|None = self.bot.data.save['pinboard'].get(idx, None)
+            if (settings is None
+                    or 'disabled' in settings
+                    or settings['output'] is None
+                    or str(payload.emoji) != settings['emoji']):
+                return False
             origin_channel : disnake.Channel|None = self.bot.get_channel(payload.channel_id)
             origin_channel_name : str = origin_channel.name
-            # do additional check to determine channel id and name
-            channel_id : int
-            if isinstance(origin_channel, disnake.Thread):
-                try:
-                    c : disnake.Channel = origin_channel.parent
-                    if not isinstance(c, disnake.ForumChannel):
-                        raise Exception()
-                    channel_id = c.id
-                    origin_channel_name = c.name
-                except:
-                    channel_id = payload.channel_id
-            else:
-                channel_id = payload.channel_id
-            # check if the pinboard is enabled for that guild and channel
-            s : str
-            for s in self.bot.data.save['pinboard']:
-                if channel_id in self.bot.data.save['pinboard'][s]['tracked']:
-                    if self.is_enabled(s) and self.bot.data.save['pinboard'][s]['output'] is not None:
-                        idx = s # note the guild id string
-                        break
-            # not found, return False
-            if idx is None:
+            # check if the channel is tracked
+            if self.tracked(payload.channel_id) != idx:
+                # for forum threads, check the parent channel instead
+                if (not isinstance(origin_channel, disnake.Thread)
+                        or not isinstance(origin_channel.parent, disnake.ForumChannel)
+                        or self.tracked(origin_channel.parent.id) != idx):
+                    return False
+                origin_channel_name = origin_channel.parent.name
+            # if the message has been cached, it has already been pinned recently, so we return False
+            if self.is_pinned(idx, payload.message_id):
                 return False
             # retrieve the message
             message : disnake.Message|None = await origin_channel.fetch_message(payload.message_id)
-            # if the message has been cached, it has already been pinned recently, so we return False
-            if message.id in self.cache:
-                return False
             # retrieve the message reactions
             reactions : list[disnake.Reaction] = message.reactions
             # get Rosetta user profile in this guild
             me : disnake.Member = message.guild.me
-            count : int = 0
             reaction : disnake.Reaction
             for reaction in reactions: # iterate over reactions and look for the one matching the emji setting
                 if str(reaction.emoji) == self.bot.data.save['pinboard'][idx]['emoji']:
+                    # threshold not reached and no mod bypass, we don't need to check the users
+                    if (reaction.count < self.bot.data.save['pinboard'][idx]['threshold']
+                            and not self.bot.data.save['pinboard'][idx]['mod_bypass']):
+                        return False
                     users : list[disnake.User] = await reaction.users().flatten() # get who reacted with that emoji
-                    count : int = len(users) # get the number of user which reacted
                     # plus other infos
                     guild : disnake.Guild = message.guild # the guild we're in
                     content : str = message.content # the message content
-                    # variables
-                    isMod : bool = False
-                    count : int = 0
                     # if the bot already reacted, the message has already been pinned, so we return False
                     if me in users:
                         return False
-                    # else, we check each user
-                    u : disnake.User
-                    for u in users:
-                        if self.bot.data.save['pinboard'][idx]['mod_bypass']: # if the mod bypass is enabled
-                            m : disnake.Member = await guild.get_or_fetch_member(u.id)
-                            # and that user is deemed to be a moderator
-                            if m.guild_permissions.manage_messages:
-                                isMod = True # raise isMod flag and stop the loop here
-                                break
-                            else: # else, increase the count
-                                count += 1
-                        else: # else, increase the count
-                            count += 1
-                    # if the mod check didn't pass OR the threshold hasn't been reached, we return False
-                    if not isMod and count < self.bot.data.save['pinboard'][idx]['threshold']:
+                    # if the threshold hasn't been reached, check if a moderator reacted (if the mod bypass is enabled)
+                    if (len(users) < self.bot.data.save['pinboard'][idx]['threshold']
+                            and not (self.bot.data.save['pinboard'][idx]['mod_bypass']
+                                     and await self.has_moderator(guild, users))):
                         return False
 
                     # check if the message has been cached (again, in case of concurency issues)
-                    if message.id in self.cache:
+                    if self.is_pinned(idx, message.id):
                         return False
                     # Add the message id to the cache
-                    self.cache.append(message.id)
-                    # Clean old cache entries if needed
-                    if len(self.cache) > 20:
-                        self.cache = self.cache.pop(0) # limited to 20 entries
+                    self.add_pinned(idx, message.id)
 
                     # Rosetta now react on this message with the setting emoji
                     await message.add_reaction(self.bot.data.save['pinboard'][idx]['emoji'])
@@ -247,7 +335,7 @@ class Pinboard():
                         # get the full user to get their full name
                         user : disnake.Member = await message.guild.get_or_fetch_member(message.author.id)
                         if user is None: # in case of issues, fallback to message.author
-                            message.author
+                            user = message.author
                         # prepare a dict we'll convert to a disnake.Embed
                         embed_dict : JSON = {}
                         embed_dict['color'] = self.COLOR
@@ -344,6 +432,7 @@ class Pinboard():
                     count += 1
         if count > 0:
             self.bot.data.pending = True
+            self.reindex()
 
     """is_enabled()
     Return True if the pinboard is enabled
@@ -375,6 +464,7 @@ class Pinboard():
         # Check pinboard state
         if server_id in self.bot.data.save['pinboard']:
             self.bot.data.save['pinboard'].pop(server_id)
+            self.reindex()
             msg = "The pinboard has been reset and is disabled"
         else:
             msg = "No pinboard data for this server"
@@ -460,6 +550,7 @@ class Pinboard():
         # Update values
         if 'tracked' in options:
             self.bot.data.save['pinboard'][server_id]['tracked'] = options['tracked']
+            self.reindex()
             msgs.append("Tracked Channels")
         if 'emoji' in options:
             self.bot.data.save['pinboard'][server_id]['emoji'] = options['emoji']
@@ -528,6 +619,7 @@ class Pinboard():
                     msg = "This type of channel **can't** be tracked"
             else:
                 msg = "This type of channel **can't** be tracked"
+        self.reindex()
         await self.render(inter, color, msg)
 
     """render()
@@ -579,9 +671,10 @@ class Pinboard():
                             'value': '',
                             'inline': True
                         })
-            if len(updated_tracked) != settings['tracked']:
+            if updated_tracked != settings['tracked']:
                 settings['tracked'] = updated_tracked
                 self.bot.data.pending = True
+                self.reindex()
             if fields[-1]['value'] == '':
                 if len(fields) > 1:
                     fields.pop()
@@ -289,7 +289,8 @@ class Ranking():
                 "&titles=User:Neofaucheur/Unite_and_Fight_Data/Data/UnF{}"
                 "&rvslots=main&rvprop=content&formatversion=2&format=json"
             ).format(gwid),
-            allow_redirects=True
+            allow_redirects=True,
+            cache="gwdata"
         )
         try:
             lines : list[str] = data['query']['pages'][0]['revisions'][0]['slots']['main']['content'].splitlines()
@@ -485,21 +486,28 @@ class Ranking():
                         # Now, check if the past gw database exists
                         if data[0] is not None:
                             # then create a backup
-                            self.bot.drive.mvFile(
+                            await asyncio.to_thread(
+                                self.bot.drive.mvFile,
                                 "GW_old.sql",
                                 self.bot.data.config['tokens']['files'],
                                 f"GW{data[0].gw}_backup.sql"
                             )
                             await asyncio.sleep(5)
                         # Move current gw to past gw
-                        self.bot.drive.mvFile("GW.sql", self.bot.data.config['tokens']['files'], "GW_old.sql")
+                        await asyncio.to_thread(
+                            self.bot.drive.mvFile,
+                            "GW.sql",
+                            self.bot.data.config['tokens']['files'],
+                            "GW_old.sql"
+                        )
                         await self.bot.sql.remove_list(self.DB_FILES) # Clean databases in memory
                         self.bot.file.mv("GW.sql", "GW_old.sql")
                 # Upload our new database
                 err : int
                 for err in range(5): # try to upload 5 times in case of issues
                     await asyncio.sleep(5)
-                    if self.bot.drive.overwriteFile(
+                    if await asyncio.to_thread(
+                        self.bot.drive.overwriteFile,
                         "temp.sql",
                         "application/sql",
                         "GW.sql",
@@ -1037,7 +1045,11 @@ class Ranking():
                     j : int
                     for j in range(5): # trying 5 times in case of errors
                         try:
-                            if self.bot.drive.dlFile(fs, self.bot.data.config['tokens']['files']) is True:
+                            if await asyncio.to_thread(
+                                self.bot.drive.dlFile,
+                                fs,
+                                self.bot.data.config['tokens']['files']
+                            ) is True:
                                 await self.bot.sql.add(fs) # add downloaded file to sql component
                                 self.dbstate[i] = True # set state to True
                                 break
@@ -0,0 +1,96 @@
+from __future__ import annotations
+from typing import Container, Sequence
+from bisect import bisect_left
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# ----------------------------------------------------------------------
+# Sampler Module
+# ----------------------------------------------------------------------
+# Item selection for the gacha simulator.
+# Not a bot component: it doesn't depend on the bot and can be used by the tools.
+# ----------------------------------------------------------------------
+
+
+# Cumulative rate table of a gacha rarity, searched with a bisection
+class Sampler():
+    __slots__ = ("cumulative", "items", "total", "array")
+
+    """constructor
+
+    Parameters
+    --------
+    buckets: Dict, rates (as strings) and their item list, i.e. a rarity 'list' of the gacha data
+    rateups: Container, the rate up rates (as strings)
+    """
+    def __init__(self : Sampler, buckets : dict[str, list[str]], rateups : Container[str]) -> None:
+        # cumulated rate up to each item, in the gacha data order
+        self.cumulative : list[float] = []
+        # items and whether their rate is a rate up
+        self.items : list[tuple[str, bool]] = []
+        total : float = 0.0
+        rate : str
+        items : list[str]
+        for rate, items in buckets.items():
+            floatrate : float = float(rate)
+            rateup : bool = rate in rateups
+            item : str
+            for item in items:
+                total += floatrate
+                # rounded to not depend on the float errors of the sum when the dice is exactly on a boundary
+                self.cumulative.append(round(total, 6))
+                self.items.append((item, rateup))
+        self.total : float = total
+        # numpy version of self.cumulative, if available
+        self.array : numpy.ndarray|None = numpy.array(self.cumulative) if numpy is not None else None
+
+    """pick()
+    Select the item matching a dice value.
+    It's the first item whose cumulated rate is greater or equal to the dice.
+    The last item is returned if the dice is above the total.
+
+    Parameters
+    --------
+    dice: Float, value between 0 and self.total
+
+    Raises
+    ------
+    IndexError: The sampler is empty
+
+    Returns
+    --------
+    tuple: The item and whether its rate is a rate up
+    """
+    def pick(self : Sampler, dice : float) -> tuple[str, bool]:
+        return self.items[min(bisect_left(self.cumulative, dice), len(self.items) - 1)]
+
+    """pick_many()
+    Select the items matching a sequence of dice values, see pick().
+    Vectorized if numpy is available.
+
+    Parameters
+    --------
+    dices: Sequence (or numpy array) of floats
+
+    Raises
+    ------
+    IndexError: The sampler is empty
+
+    Returns
+    --------
+    list: Tuples of the item and whether its rate is a rate up
+    """
+    def pick_many(self : Sampler, dices : Sequence[float]) -> list[tuple[str, bool]]:
+        if len(dices) == 0:
+            return []
+        last : int = len(self.items) - 1
+        if self.array is not None:
+            i : int
+            return [
+                self.items[i]
+                for i in numpy.minimum(numpy.searchsorted(self.array, dices, side='left'), last).tolist()
+            ]
+        dice : float
+        return [self.items[min(bisect_left(self.cumulative, dice), last)] for dice in dices]
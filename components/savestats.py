@@ -0,0 +1,201 @@
+from __future__ import annotations
+from typing import Any, Iterable
+from collections import Counter
+from components import codec
+import json
+
+# ----------------------------------------------------------------------
+# Save Stats Module
+# ----------------------------------------------------------------------
+# Size and change analytics of the save data.
+# Used to find which sections are worth sharding or compacting.
+# Not a bot component: it doesn't depend on the bot and can be used by the tools.
+# ----------------------------------------------------------------------
+
+"""measure()
+Return the serialized size of a value
+
+Parameters
+----------
+value: JSON value (datetimes must already be serialized)
+
+Returns
+--------
+int: Size in bytes
+"""
+def measure(value : Any) -> int:
+    return len(json.dumps(value, separators=(',', ':')).encode("utf-8"))
+
+"""sections()
+Measure each top-level section, and its compressed size
+
+Parameters
+----------
+data: Dict, the save data
+c: Codec to compress with
+
+Returns
+--------
+list: Tuples of section name, size and compressed size, largest first
+"""
+def sections(data : dict, c : codec.Codec) -> list[tuple[str, int, int]]:
+    result : list[tuple[str, int, int]] = []
+    section : str
+    value : Any
+    for section, value in data.items():
+        ser : str = json.dumps(value, separators=(',', ':'))
+        result.append((section, len(ser.encode("utf-8")), len(codec.compress(c, ser))))
+    result.sort(key=lambda x: x[1], reverse=True)
+    return result
+
+"""paths()
+Measure every nested path of the save data, up to a given depth
+
+Parameters
+----------
+data: Dict, the save data
+depth: Integer, maximum depth (1 for the sections only)
+
+Returns
+--------
+dict: Paths (slash separated) and their size
+"""
+def paths(data : dict, depth : int) -> dict[str, int]:
+    result : dict[str, int] = {}
+    stack : list[tuple[str, Any, int]] = [(str(k), v, 1) for k, v in data.items()]
+    while len(stack) > 0:
+        path : str
+        value : Any
+        level : int
+        path, value, level = stack.pop()
+        result[path] = measure(value)
+        if level < depth:
+            match value:
+                case dict():
+                    stack.extend((path + "/" + str(k), v, level + 1) for k, v in value.items())
+                case list():
+                    stack.extend((path + "/" + str(i), v, level + 1) for i, v in enumerate(value))
+    return result
+
+"""largest()
+Return the largest entries, i.e. the nested paths below the sections
+
+Parameters
+----------
+sizes: Dict, paths and their size, from paths()
+limit: Integer, number of entries to return
+
+Returns
+--------
+list: Tuples of path and size, largest first
+"""
+def largest(sizes : dict[str, int], limit : int) -> list[tuple[str, int]]:
+    return sorted(
+        ((k, v) for k, v in sizes.items() if "/" in k),
+        key=lambda x: x[1],
+        reverse=True
+    )[:limit]
+
+"""churn()
+Count the changes per section and per key, from journal entries (see Data.addJournalEntry())
+
+Parameters
+----------
+entries: Iterable of journal entries (JSON strings). Invalid entries are ignored.
+
+Returns
+--------
+Counter: Change count per section and per section/key path
+"""
+def churn(entries : Iterable[str]) -> Counter:
+    counter : Counter = Counter()
+    line : str
+    for line in entries:
+        try:
+            entry : dict = json.loads(line)
+            counter[entry['s']] += 1
+            if 'k' in entry:
+                counter[entry['s'] + "/" + entry['k']] += 1
+        except Exception:
+            pass
+    return counter
+
+"""analyze()
+Measure serialized save data. Meant to run in a worker thread.
+
+Parameters
+----------
+serialized: String, the serialized save data
+c: Codec to compress with
+depth: Integer, maximum path depth
+limit: Integer, number of largest entries to return
+
+Returns
+--------
+tuple:
+    int: Total size
+    list: Section sizes, from sections()
+    list: Largest entries, from largest()
+"""
+def analyze(
+    serialized : str,
+    c : codec.Codec,
+    depth : int,
+    limit : int
+) -> tuple[int, list[tuple[str, int, int]], list[tuple[str, int]]]:
+    data : dict = json.loads(serialized)
+    return len(serialized.encode("utf-8")), sections(data, c), largest(paths(data, depth), limit)
+
+"""report()
+Build a text report of the save data
+
+Parameters
+----------
+data: Dict, the save data
+changes: Counter (Optional), change counts from churn()
+c: Codec (Optional), codec to compress with. Default is codec.DEFAULT.
+depth: Integer (Optional), maximum path depth
+limit: Integer (Optional), number of entries per list
+
+Returns
+--------
+str: The report
+"""
+def report(
+    data : dict,
+    changes : Counter|None = None,
+    c : codec.Codec|None = None,
+    depth : int = 3,
+    limit : int = 20
+) -> str:
+    if c is None:
+        c = codec.CODECS[codec.DEFAULT]
+    if changes is None:
+        changes = Counter()
+    lines : list[str] = []
+    total : int = measure(data)
+    lines.append(f"Total: {total} bytes")
+    lines.append("")
+    lines.append(f'{"section":<20}{"size":>10}{"%":>7}{c.NAME:>10}{"ratio":>8}{"changes":>9}')
+    name : str
+    size : int
+    csize : int
+    for name, size, csize in sections(data, c):
+        lines.append(
+            f'{name:<20}{size:>10}{100 * size / max(1, total):>6.1f}%{csize:>10}'
+            f'{csize / max(1, size):>8.3f}{changes.get(name, 0):>9}'
+        )
+    lines.append("")
+    lines.append(f"Largest entries (depth <= {depth}):")
+    sizes : dict[str, int] = paths(data, depth)
+    path : str
+    for path, size in largest(sizes, limit):
+        lines.append(f'{size:>10}  {path}')
+    hot : list[tuple[str, int]] = [(k, v) for k, v in changes.most_common() if "/" in k][:limit]
+    if len(hot) > 0:
+        lines.append("")
+        lines.append("Most changed keys:")
+        count : int
+        for path, count in hot:
+            lines.append(f'{count:>10}  {path}')
+    return "\n".join(lines)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+from typing import Any, Callable
+from datetime import datetime
+import json
+import time
+
+# ----------------------------------------------------------------------
+# Schema Module
+# ----------------------------------------------------------------------
+# Typed decoding of the save data.
+# A schema describes which paths of a JSON document hold datetimes,
+# so only those are converted, instead of trying every string of the document.
+# Not a bot component: it doesn't depend on the bot and can be used by the tools.
+# ----------------------------------------------------------------------
+
+# Schema nodes:
+# - DATETIME: the value is a datetime string
+# - ANY: free-form value, every string is tried (like Util.json_deserial_dict)
+# - dict: sub-schemas per key (str keys for objects, int indexes for arrays).
+#   WILDCARD applies a sub-schema to every key or element.
+# Values without a schema node are left untouched.
+DATETIME : str = "datetime"
+ANY : str = "any"
+WILDCARD : str = "*"
+FORMAT : str = "%Y-%m-%dT%H:%M:%S" # format of Util.json_serial()
+
+"""to_datetime()
+Convert a datetime string
+
+Parameters
+----------
+value: Value to convert
+
+Returns
+--------
+unknown: The datetime, or the value itself if it's not a datetime string
+"""
+def to_datetime(value : Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value, FORMAT)
+        except ValueError:
+            pass
+    return value
+
+"""sniff()
+Convert every datetime string of a free-form value, in place
+
+Parameters
+----------
+value: Value to convert
+
+Returns
+--------
+unknown: The converted value
+"""
+def sniff(value : Any) -> Any:
+    match value:
+        case dict():
+            k : str
+            v : Any
+            for k, v in value.items():
+                value[k] = sniff(v)
+        case list():
+            i : int
+            for i in range(len(value)):
+                value[i] = sniff(value[i])
+        case str():
+            return to_datetime(value)
+    return value
+
+"""decode()
+Convert the datetimes of a value according to a schema, in place
+
+Parameters
+----------
+value: Value to convert (usually from json.load)
+schema: The schema node of this value
+
+Returns
+--------
+unknown: The converted value
+"""
+def decode(value : Any, schema : str|dict|None) -> Any:
+    if schema is None:
+        return value
+    elif schema == DATETIME:
+        return to_datetime(value)
+    elif schema == ANY:
+        return sniff(value)
+    sub : str|dict
+    match value:
+        case dict():
+            if WILDCARD in schema:
+                sub = schema[WILDCARD]
+                k : str
+                v : Any
+                for k, v in value.items():
+                    value[k] = decode(v, sub)
+            else:
+                key : str|int
+                for key, sub in schema.items():
+                    if key in value:
+                        value[key] = decode(value[key], sub)
+        case list():
+            i : int
+            if WILDCARD in schema:
+                sub = schema[WILDCARD]
+                for i in range(len(value)):
+                    value[i] = decode(value[i], sub)
+            else:
+                for i, sub in schema.items():
+                    if isinstance(i, int) and -len(value) <= i < len(value):
+                        value[i] = decode(value[i], sub)
+    return value
+
+"""child()
+Return the schema node of a key
+
+Parameters
+----------
+schema: The schema node of the parent value
+key: The key or index
+
+Returns
+--------
+unknown: The schema node of the key, None if it has none
+"""
+def child(schema : str|dict|None, key : str|int) -> str|dict|None:
+    if isinstance(schema, dict):
+        return schema.get(key, schema.get(WILDCARD, None))
+    elif schema == ANY:
+        return ANY
+    return None
+
+"""diff()
+Compare two decoded values
+
+Parameters
+----------
+a: First value
+b: Second value
+path: String, path of the values (used for recursion)
+
+Returns
+--------
+list: Paths of the differences
+"""
+def diff(a : Any, b : Any, path : str = "") -> list[str]:
+    if type(a) is not type(b):
+        return [path]
+    match a:
+        case dict():
+            result : list[str] = []
+            k : str
+            for k in a.keys() | b.keys():
+                if k not in a or k not in b:
+                    result.append(f"{path}/{k}")
+                else:
+                    result.extend(diff(a[k], b[k], f"{path}/{k}"))
+            return result
+        case list():
+            if len(a) != len(b):
+                return [path]
+            result : list[str] = []
+            i : int
+            for i in range(len(a)):
+                result.extend(diff(a[i], b[i], f"{path}/{i}"))
+            return result
+        case _:
+            return [] if a == b else [path]
+
+"""benchmark()
+Compare the schema decoder with an object_pairs_hook on the same data.
+
+Parameters
+----------
+data: String, serialized JSON (usually the save data)
+schema: The schema of the data
+hook: The object_pairs_hook to compare with (usually Util.json_deserial_dict)
+repeat: Integer, number of runs
+
+Returns
+--------
+tuple: Best time of the hook, best time of the schema decoder (in seconds) and the paths of the differences
+"""
+def benchmark(
+    data : str,
+    schema : dict,
+    hook : Callable,
+    repeat : int = 3
+) -> tuple[float, float, list[str]]:
+    times : list[float] = [float('inf'), float('inf')]
+    a : Any = None
+    b : Any = None
+    t : float
+    for _ in range(repeat):
+        t = time.perf_counter()
+        a = json.loads(data, object_pairs_hook=hook)
+        times[0] = min(times[0], time.perf_counter() - t)
+        t = time.perf_counter()
+        b = decode(json.loads(data), schema)
+        times[1] = min(times[1], time.perf_counter() - t)
+    return times[0], times[1], diff(a, b)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+import sqlite3
+import threading
+import os
+
+# ----------------------------------------------------------------------
+# Store Module
+# ----------------------------------------------------------------------
+# SQLite storage for the large per-user sections of the save data.
+# Rows are serialized JSON values, one per section key, so only the modified keys are written.
+# Not a bot component: it doesn't depend on the bot and can be used by the tools.
+# ----------------------------------------------------------------------
+
+
+class Store():
+    __slots__ = ("path", "db", "lock")
+
+    def __init__(self : Store, path : str) -> None:
+        self.path : str = path
+        self.db : sqlite3.Connection|None = None
+        # the store is written from worker threads
+        self.lock : threading.Lock = threading.Lock()
+
+    """open()
+    Open the database, create it if needed
+    """
+    def open(self : Store) -> None:
+        with self.lock:
+            if self.db is not None:
+                return
+            self.db = sqlite3.connect(self.path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS rows ("
+                "section TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "PRIMARY KEY (section, key)) WITHOUT ROWID"
+            )
+            self.db.commit()
+
+    """close()
+    Close the database
+    """
+    def close(self : Store) -> None:
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+    """load()
+    Read the rows of a section
+
+    Parameters
+    ----------
+    section: String, save section
+
+    Returns
+    --------
+    dict: Keys and their serialized value
+    """
+    def load(self : Store, section : str) -> dict[str, str]:
+        with self.lock:
+            return dict(self.db.execute("SELECT key, value FROM rows WHERE section = ?", (section,)))
+
+    """write()
+    Apply changes in a single transaction
+
+    Parameters
+    ----------
+    changes: Dict, per section, keys and their serialized value (None to delete the key)
+    resets: Set, sections to empty before applying the changes
+    """
+    def write(self : Store, changes : dict[str, dict[str, str|None]], resets : set[str]) -> None:
+        with self.lock:
+            with self.db: # transaction, rollback on error
+                section : str
+                for section in resets:
+                    self.db.execute("DELETE FROM rows WHERE section = ?", (section,))
+                rows : dict[str, str|None]
+                for section, rows in changes.items():
+                    self.db.executemany(
+                        "INSERT INTO rows (section, key, value) VALUES (?, ?, ?) "
+                        "ON CONFLICT (section, key) DO UPDATE SET value = excluded.value",
+                        ((section, k, v) for k, v in rows.items() if v is not None)
+                    )
+                    self.db.executemany(
+                        "DELETE FROM rows WHERE section = ? AND key = ?",
+                        ((section, k) for k, v in rows.items() if v is None)
+                    )
+
+    """compact()
+    Write a compacted copy of the database
+
+    Parameters
+    ----------
+    destination: String, path of the copy. Overwritten if it exists.
+    """
+    def compact(self : Store, destination : str) -> None:
+        with self.lock:
+            if os.path.isfile(destination):
+                os.remove(destination)
+            self.db.execute("VACUUM INTO ?", (destination,))
@@ -339,6 +339,7 @@ class Util():
             "Save": ("**Pending**" if self.bot.data.pending else "Ok"),
             "GBF Update": ("**Pending**" if self.bot.data.save['gbfupdate'] else "Ok"),
             "Task Count": str(len(self.bot.tasks)),
+            "Pending Cleanups": str(self.bot.channel.pending_cleanups()),
             "Server Count": str(len(self.bot.guilds)),
             "Cogs Loaded": (
                 f"{len(self.bot.cogs)}/{self.bot.cogn}"
@@ -687,7 +688,8 @@ class Util():
                     "format":"json",
                     "limit":"10"
                 },
-                allow_redirects=True
+                allow_redirects=True,
+                cache="search"
             )
             # return result id
             return str(data[0]['id'])
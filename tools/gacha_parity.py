@@ -0,0 +1,84 @@
+import os
+import sys
+import json
+import math
+import random
+import argparse
+# the sampler is shared with the bot
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from components.sampler import Sampler
+
+# reference implementation: the linear walk previously used by GachaSimulator.retrieve_single_roll_item
+def linear_pick(buckets, rateups, dice):
+    item = None
+    rateup = False
+    for rate in buckets:
+        floatrate = float(rate)
+        for item in buckets[rate]:
+            rateup = rate in rateups
+            if dice <= floatrate:
+                return item, rateup
+            dice -= floatrate
+    return item, rateup
+
+# chi-square survival function, Wilson-Hilferty approximation
+def chi2_pvalue(stat, dof):
+    if dof <= 0:
+        return 1.0
+    z = ((stat / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def load_banners(fn):
+    with open(fn, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    gacha = data['gbfdata']['gacha'] if 'gbfdata' in data else data['gacha']
+    for i, banner in enumerate(gacha['banners']):
+        rateups = set()
+        for k, v in banner['rateup'].items():
+            if k != "zodiac":
+                rateups.update(v)
+        yield i, banner["list"], rateups
+
+def check(buckets, rateups, exact, samples):
+    sampler = Sampler(buckets, rateups)
+    # exact check: both implementations must select the same item for the same dice
+    # (a continuous dice is used, the linear walk can disagree on exact boundaries because of float errors)
+    mismatches = 0
+    for _ in range(exact):
+        dice = random.uniform(0, sampler.total)
+        if sampler.pick(dice) != linear_pick(buckets, rateups, dice):
+            mismatches += 1
+    # statistical check: observed item frequencies against the advertised rates
+    counts = {}
+    for _ in range(samples):
+        item = sampler.pick(random.random() * sampler.total)
+        counts[item] = counts.get(item, 0) + 1
+    expected = {}
+    for rate, items in buckets.items():
+        for item in items:
+            key = (item, rate in rateups)
+            expected[key] = expected.get(key, 0) + float(rate) / sampler.total * samples
+    stat = sum((counts.get(k, 0) - e) ** 2 / e for k, e in expected.items() if e > 0)
+    return sampler, mismatches, stat, chi2_pvalue(stat, len(expected) - 1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Check the gacha sampler against the linear item walk and the advertised rates')
+    parser.add_argument('file', nargs='+', help='save.json (or gbfdata.json shard) containing the gacha data')
+    parser.add_argument('-e', '--exact', type=int, default=100000, help='number of dice compared with the linear walk, per rarity')
+    parser.add_argument('-s', '--samples', type=int, default=1000000, help='number of samples for the chi-square test, per rarity')
+    parser.add_argument('--seed', type=int, default=None, help='random seed')
+    args = parser.parse_args()
+    random.seed(args.seed)
+    failed = False
+    for index, rarities, rateups in load_banners(' '.join(args.file)):
+        for rarity, r in enumerate(rarities):
+            if len(r['list']) == 0:
+                continue
+            sampler, mismatches, stat, pvalue = check(r['list'], rateups, args.exact, args.samples)
+            ok = mismatches == 0 and pvalue >= 0.001
+            failed = failed or not ok
+            print(
+                f'banner {index} rarity {rarity}: {len(sampler.items)} items, total {sampler.total:.3f}%, '
+                f'{mismatches} mismatch(es), chi2 {stat:.1f} (p={pvalue:.3f}) {"OK" if ok else "FAIL"}'
+            )
+    sys.exit(1 if failed else 0)
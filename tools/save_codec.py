@@ -0,0 +1,57 @@
+import os
+import sys
+import argparse
+# the codecs are shared with the bot
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from components import codec
+
+def run(fn, name):
+    c = codec.CODECS.get(name, None)
+    if c is None:
+        print(f'Unknown or unavailable codec "{name}", available: {", ".join(codec.CODECS.keys())}')
+        return
+    ext = fn.split('.')[-1]
+    try:
+        if ext == 'json':
+            if c.EXTENSION == 'json':
+                print('The file is already uncompressed')
+                return
+            print(f'Compressing "{fn}" with {c.NAME}')
+            codec.compress_file(c, fn, ".".join(fn.split(".")[:-1]) + "." + c.EXTENSION)
+            print('Done')
+        elif codec.from_filename(fn) is not None:
+            print(f'Decompressing "{fn}"')
+            codec.decompress_file(fn, ".".join(fn.split(".")[:-1]) + ".json")
+            print('Done')
+        else:
+            print(f'Unknown file type "{ext}"')
+    except Exception as e:
+        print(f'Error processing file "{fn}": {e}')
+
+def benchmark(fn):
+    try:
+        ext = fn.split('.')[-1]
+        if ext == 'json':
+            with open(fn, "r", encoding="utf-8") as f:
+                data = f.read()
+        else:
+            with open(fn, "rb") as f:
+                data = codec.decompress(codec.from_filename(fn), f.read())
+    except Exception as e:
+        print(f'Error opening file "{fn}": {e}')
+        return
+    print(f'Benchmarking "{fn}" ({len(data.encode("utf-8"))} bytes uncompressed)')
+    print(f'{"codec":<8}{"size":>12}{"ratio":>8}{"compress":>12}{"decompress":>12}')
+    for name, size, ratio, ct, dt in codec.benchmark(data):
+        print(f'{name:<8}{size:>12}{ratio:>8.3f}{ct:>11.3f}s{dt:>11.3f}s')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compress/decompress a save file, or benchmark the available codecs on it')
+    parser.add_argument('file', nargs='+', help='.json file to compress, or compressed file to decompress')
+    parser.add_argument('-c', '--codec', default=codec.DEFAULT, help=f'codec to compress with ({", ".join(codec.CODECS.keys())})')
+    parser.add_argument('-b', '--benchmark', action='store_true', help='measure the ratio and speed of each codec on the file')
+    args = parser.parse_args()
+    if args.benchmark:
+        benchmark(' '.join(args.file))
+    else:
+        run(' '.join(args.file), args.codec)
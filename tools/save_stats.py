@@ -0,0 +1,54 @@
+import os
+import sys
+import json
+import argparse
+# the analytics are shared with the bot
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from components import codec
+from components import savestats
+from components.store import Store
+
+def load(fn):
+    if os.path.isdir(fn): # sharded save folder
+        with open(os.path.join(fn, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        data = {k: manifest[k] for k in ('version', 'journal')}
+        for section in manifest['sections']:
+            with open(os.path.join(fn, section + ".json"), "r", encoding="utf-8") as f:
+                data.update(json.load(f))
+        if len(manifest.get('store', [])) > 0: # sqlite store
+            store = Store(os.path.join(fn, "store.db"))
+            store.open()
+            for section in manifest['store']:
+                data[section] = {k: json.loads(v) for k, v in store.load(section).items()}
+            store.close()
+        return data
+    elif fn.split('.')[-1] == 'json':
+        with open(fn, "r", encoding="utf-8") as f:
+            return json.load(f)
+    else:
+        with open(fn, "rb") as f:
+            return json.loads(codec.decompress(codec.from_filename(fn), f.read()))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Report the size, compression ratio and change frequency of the save data')
+    parser.add_argument('file', nargs='+', help='save.json, a compressed save file or the save folder')
+    parser.add_argument('-j', '--journal', help='save.journal file, to count the changes per section and key')
+    parser.add_argument('-c', '--codec', default=codec.DEFAULT, help=f'codec to measure the compression with ({", ".join(codec.CODECS.keys())})')
+    parser.add_argument('-d', '--depth', type=int, default=3, help='maximum depth of the measured paths')
+    parser.add_argument('-n', '--limit', type=int, default=20, help='number of entries per list')
+    args = parser.parse_args()
+    fn = ' '.join(args.file)
+    if args.codec not in codec.CODECS:
+        print(f'Unknown or unavailable codec "{args.codec}", available: {", ".join(codec.CODECS.keys())}')
+        sys.exit(1)
+    try:
+        data = load(fn)
+    except Exception as e:
+        print(f'Error opening "{fn}": {e}')
+        sys.exit(1)
+    changes = None
+    if args.journal is not None:
+        with open(args.journal, "r", encoding="utf-8") as f:
+            changes = savestats.churn(f)
+    print(savestats.report(data, changes, codec.CODECS[args.codec], args.depth, args.limit))